@@ -0,0 +1,82 @@
+"""Benchmark targeted FnGuide table extraction against the ``pd.read_html`` path.
+
+Usage::
+
+    python scripts/bench_extract.py                     # synthesized from data_raw CSVs
+    python scripts/bench_extract.py --pages recorded/   # recorded SVD_Finance *.html pages
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from io import StringIO
+from pathlib import Path
+
+import pandas as pd
+
+from changwon_credit.fixtures import load_recorded_tables, render_finance_page, synthesize_tables
+from changwon_credit.loader import (
+    BALANCE_METRICS,
+    CASHFLOW_METRICS,
+    INCOME_METRICS,
+    extract_statement_tables,
+)
+
+METRIC_ROWS = {**INCOME_METRICS, **BALANCE_METRICS, **CASHFLOW_METRICS}
+
+
+def _legacy(html: str) -> dict:
+    dfs = pd.read_html(StringIO(html))
+    return {"income": dfs[0], "balance": dfs[2], "cashflow": dfs[4]}
+
+
+def _targeted(html: str) -> dict:
+    return extract_statement_tables(html)
+
+
+def _targeted_metrics_only(html: str) -> dict:
+    return extract_statement_tables(html, rows=METRIC_ROWS, column_pattern=r"^\d{4}/\d{2}$")
+
+
+def _load_pages(args: argparse.Namespace) -> list[str]:
+    if args.pages:
+        return [path.read_text(encoding="utf-8") for path in sorted(args.pages.glob("*.html"))]
+    template = load_recorded_tables(args.raw_dir, args.company)
+    return [render_finance_page(synthesize_tables(template, seed)) for seed in range(args.count)]
+
+
+def _time(fn, pages: list[str], repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for html in pages:
+            fn(html)
+        runs.append((time.perf_counter() - started) / len(pages))
+    return runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=Path, help="Directory of recorded SVD_Finance *.html pages.")
+    parser.add_argument("--raw-dir", type=Path, default=Path("data_raw"))
+    parser.add_argument("--company", default="034020")
+    parser.add_argument("--count", type=int, default=50, help="Synthesized pages when --pages is absent.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = _load_pages(args)
+    print(f"{len(pages)} pages, mean size {statistics.mean(len(p) for p in pages) / 1024:.1f} KiB")
+    baseline = None
+    for label, fn in (
+        ("pd.read_html (all tables)", _legacy),
+        ("targeted (annual tables)", _targeted),
+        ("targeted (metric rows only)", _targeted_metrics_only),
+    ):
+        per_page = min(_time(fn, pages, args.repeat))
+        baseline = baseline or per_page
+        print(f"{label:<30} {per_page * 1e3:8.2f} ms/page  x{baseline / per_page:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
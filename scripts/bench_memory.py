@@ -0,0 +1,64 @@
+"""Compare the memory footprint of wide default dtypes with the schema's compact dtypes.
+
+Usage::
+
+    python scripts/bench_memory.py --companies 5000 --years 10
+"""
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from changwon_credit.analytics import compute_credit_metrics
+from changwon_credit.db import enforce_dtypes, load_schema
+from changwon_credit.loader import STATEMENT_METRICS
+
+
+def _panel(companies: int, years: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    metrics = [metric for metric_map in STATEMENT_METRICS.values() for metric in metric_map.values()]
+    codes = np.array([f"{100000 + index:06d}" for index in range(companies)], dtype=object)
+    frame = pd.DataFrame(
+        {
+            "company_code": pd.Series(np.repeat(codes, years), dtype=object),
+            "year": np.tile(np.arange(2025 - years, 2025, dtype=np.int64), companies),
+        }
+    )
+    values = rng.uniform(1.0, 1000.0, size=(len(frame), len(metrics)))
+    return pd.concat([frame, pd.DataFrame(values, columns=metrics)], axis=1)
+
+
+def _mb(frame: pd.DataFrame) -> float:
+    return frame.memory_usage(deep=True).sum() / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    schema = load_schema()
+    wide = _panel(args.companies, args.years)
+    metrics = compute_credit_metrics(wide).astype({"company_code": object})
+    compact = enforce_dtypes(wide, schema["credit_profile"])
+    compact_metrics = enforce_dtypes(compute_credit_metrics(compact), schema["analytics_credit"])
+    float32_metrics = enforce_dtypes(compact_metrics, schema["analytics_credit"], float32_ratios=True)
+
+    rows = len(wide)
+    print(f"{args.companies} companies x {args.years} years = {rows} company-years")
+    print(f"{'frame':<28} {'MB':>8} {'bytes/row':>10}")
+    for label, frame in (
+        ("statements (object/int64)", wide),
+        ("statements (schema dtypes)", compact),
+        ("metrics (object/int64)", metrics),
+        ("metrics (schema dtypes)", compact_metrics),
+        ("metrics (+float32 ratios)", float32_metrics),
+    ):
+        print(f"{label:<28} {_mb(frame):8.2f} {frame.memory_usage(deep=True).sum() / rows:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
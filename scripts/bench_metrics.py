@@ -0,0 +1,86 @@
+"""Benchmark ``compute_credit_metrics`` on multi-company panels and check per-company growth.
+
+The ``kernel ms`` column times :func:`changwon_credit.kernel.metric_kernel` alone on
+the already sorted input array, i.e. the floor for a warm recomputation.
+
+Usage::
+
+    python scripts/bench_metrics.py --companies 100 1000 10000 --years 10
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from changwon_credit.analytics import GROWTH_SOURCES, compute_credit_metrics, metric_inputs
+from changwon_credit.kernel import metric_kernel
+from changwon_credit.loader import STATEMENT_METRICS
+
+
+def _panel(companies: int, years: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    metrics = [metric for metric_map in STATEMENT_METRICS.values() for metric in metric_map.values()]
+    frame = pd.DataFrame(
+        {
+            "company_code": np.repeat([f"{100000 + index:06d}" for index in range(companies)], years),
+            "year": np.tile(np.arange(2025 - years, 2025), companies),
+        }
+    )
+    values = rng.uniform(1.0, 1000.0, size=(len(frame), len(metrics)))
+    panel = pd.concat([frame, pd.DataFrame(values, columns=metrics)], axis=1)
+    # FnGuide 적재 순서처럼 연도별로 회사가 섞인 입력을 만든다.
+    return panel.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def _growth_errors(panel: pd.DataFrame, metrics: pd.DataFrame, sample: int) -> float:
+    worst = 0.0
+    for code in panel["company_code"].drop_duplicates().iloc[:sample]:
+        own = panel[panel["company_code"] == code].sort_values("year")
+        got = metrics[metrics["company_code"] == code]
+        for column, source in GROWTH_SOURCES.items():
+            expected = own[source].pct_change().to_numpy()
+            diff = np.abs(got[column].to_numpy() - expected)
+            if np.isnan(expected[0]) != np.isnan(got[column].to_numpy()[0]):
+                return float("inf")
+            worst = max(worst, float(np.nanmax(diff)))
+    return worst
+
+
+def _best(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--years", type=int, default=10, help="Fiscal years per company.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per size.")
+    parser.add_argument("--check", type=int, default=50, help="Companies checked against a per-company loop.")
+    args = parser.parse_args()
+
+    print(f"{'companies':>9} {'rows':>8} {'seconds':>8} {'us/row':>7} {'kernel ms':>10} {'growth err':>11}")
+    for size in args.companies:
+        panel = _panel(size, args.years)
+        best = _best(lambda: compute_credit_metrics(panel), args.repeat)
+        metrics = compute_credit_metrics(panel)
+        ordered = panel.sort_values(["company_code", "year"], ignore_index=True)
+        values = metric_inputs(ordered)
+        groups = pd.factorize(ordered["company_code"])[0]
+        kernel = _best(lambda: metric_kernel(values, groups), args.repeat)
+        error = _growth_errors(panel, metrics, args.check)
+        print(
+            f"{size:>9} {len(panel):>8} {best:8.3f} {best / len(panel) * 1e6:7.2f}"
+            f" {kernel * 1e3:10.2f} {error:11.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
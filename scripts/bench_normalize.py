@@ -0,0 +1,64 @@
+"""Benchmark per-company ``_tidy_statement`` against batch ``normalize_statements``.
+
+Usage::
+
+    python scripts/bench_normalize.py --sizes 1 10 100 1000 5000 --legacy-max 1000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from changwon_credit.etl import merge_statements, pivot_statements
+from changwon_credit.fixtures import load_recorded_tables, synthesize_tables
+from changwon_credit.loader import STATEMENT_METRICS, _tidy_statement, normalize_statements
+from changwon_credit.models import FinancialStatements
+
+
+def _legacy(raw_by_company: dict, years: int) -> None:
+    for company_code, tables in raw_by_company.items():
+        tidy = [
+            _tidy_statement(tables[name], metric_map, years)
+            for name, metric_map in STATEMENT_METRICS.items()
+        ]
+        merge_statements(FinancialStatements(*tidy), company_code)
+
+
+def _vectorized(raw_by_company: dict, years: int) -> None:
+    pivot_statements(normalize_statements(raw_by_company, years))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 5000])
+    parser.add_argument("--legacy-max", type=int, default=1000, help="Skip the slow path above this size.")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--raw-dir", type=Path, default=Path("data_raw"))
+    parser.add_argument("--company", default="034020")
+    args = parser.parse_args()
+
+    template = load_recorded_tables(args.raw_dir, args.company)
+    universe = {
+        f"{100000 + seed:06d}": synthesize_tables(template, seed) for seed in range(max(args.sizes))
+    }
+    codes = list(universe)
+
+    print(f"{'companies':>9} {'legacy s':>10} {'vector s':>10} {'speedup':>8} {'us/company':>11}")
+    for size in args.sizes:
+        subset = {code: universe[code] for code in codes[:size]}
+        started = time.perf_counter()
+        _vectorized(subset, args.years)
+        vector = time.perf_counter() - started
+        legacy = None
+        if size <= args.legacy_max:
+            started = time.perf_counter()
+            _legacy(subset, args.years)
+            legacy = time.perf_counter() - started
+        legacy_text = f"{legacy:10.3f}" if legacy is not None else f"{'-':>10}"
+        speedup = f"{legacy / vector:7.1f}x" if legacy is not None else f"{'-':>8}"
+        print(f"{size:>9} {legacy_text} {vector:10.3f} {speedup} {vector / size * 1e6:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Load-test the fetch + ETL path against the local FnGuide stand-in server.
+
+Usage::
+
+    python scripts/bench_pipeline.py --companies 1000 --workers 32 --latency-ms 40
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from changwon_credit.analytics import compute_credit_metrics
+from changwon_credit.etl import merge_statements
+from changwon_credit.loader import fetch_many
+from changwon_credit.resilience import RequestBudget, Resilience, RetryPolicy
+from changwon_credit.standin import FnGuideStandIn, StandInSettings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rate-limit", type=float, default=None, help="Client requests/second.")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rps", type=float, default=None)
+    parser.add_argument("--retries", type=int, default=4, help="Attempts per request.")
+    parser.add_argument("--budget-rps", type=float, default=None, help="Adaptive request budget start rate.")
+    args = parser.parse_args()
+
+    settings = StandInSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rps=args.throttle_rps,
+    )
+    codes = [f"{100000 + index:06d}" for index in range(args.companies)]
+    guard = Resilience(
+        retry=RetryPolicy(max_attempts=args.retries, backoff_base=0.1, backoff_max=5.0),
+        budget=RequestBudget(args.budget_rps) if args.budget_rps else None,
+    )
+    with FnGuideStandIn(settings) as standin:
+        standin.prewarm(codes)
+        started = time.perf_counter()
+        results = list(
+            fetch_many(
+                codes,
+                args.years,
+                max_workers=args.workers,
+                rate_limit=args.rate_limit,
+                base_url=standin.url,
+                resilience=guard,
+            )
+        )
+        fetch_wall = time.perf_counter() - started
+        stats = standin.stats
+
+    ok = [result for result in results if result.ok]
+    latencies = np.array([result.elapsed for result in results]) * 1e3
+    compute_started = time.perf_counter()
+    for result in ok:
+        compute_credit_metrics(merge_statements(result.statements, result.company_code))
+    compute_wall = time.perf_counter() - compute_started
+
+    print(f"companies={len(codes)} ok={len(ok)} failed={len(results) - len(ok)}")
+    print(
+        f"server: requests={stats.requests} served={stats.served} "
+        f"errors={stats.errors} throttled={stats.throttled}"
+    )
+    if guard.budget is not None:
+        budget = guard.budget
+        print(
+            f"budget: final={budget.rate:.1f} req/s requests={budget.requests} "
+            f"retries={budget.retries} throttled={budget.throttled}"
+        )
+    print(f"fetch+parse: {fetch_wall:.2f}s wall, {len(results) / fetch_wall:.1f} companies/s")
+    print(
+        "latency ms: "
+        + " ".join(f"p{q}={np.percentile(latencies, q):.1f}" for q in (50, 90, 95, 99))
+        + f" max={latencies.max():.1f}"
+    )
+    print(f"merge+metrics: {compute_wall:.2f}s, {len(ok) / max(compute_wall, 1e-9):.1f} companies/s")
+
+
+if __name__ == "__main__":
+    main()
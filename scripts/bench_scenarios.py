@@ -0,0 +1,62 @@
+"""Benchmark the broadcast scenario grid over many obligors.
+
+Every obligor is evaluated on a revenue × rate × capex grid with
+``--points`` values per axis, and the share of points below a DSCR of 1.0
+is reduced per obligor without materializing the full grid.
+
+Usage::
+
+    python scripts/bench_scenarios.py --obligors 100 1000 --points 200
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from changwon_credit.analytics import compute_credit_metrics
+from changwon_credit.kernel import INPUT_COLUMNS
+from changwon_credit.scenarios import scenario_grid
+
+
+def _metrics(obligors: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {
+            "company_code": np.repeat([f"{100000 + index:06d}" for index in range(obligors)], 2),
+            "year": np.tile([2023, 2024], obligors),
+        }
+    )
+    for name in INPUT_COLUMNS:
+        frame[name] = rng.uniform(1.0, 1000.0, len(frame))
+    return compute_credit_metrics(frame)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--obligors", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--points", type=int, default=200, help="Grid points per shock axis.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per size.")
+    args = parser.parse_args()
+
+    revenue = np.linspace(-0.5, 0.5, args.points)
+    rate = np.linspace(0.0, 0.05, args.points)
+    capex = np.linspace(-0.5, 0.5, args.points)
+    print(f"{'obligors':>8} {'grid points':>14} {'seconds':>8} {'points/s':>10} {'mean share':>11}")
+    for size in args.obligors:
+        metrics = _metrics(size)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            grid = scenario_grid(metrics, revenue_shocks=revenue, rate_shocks=rate, capex_shocks=capex)
+            share = grid.share_below("dscr", 1.0)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        points = int(np.prod(grid.shape))
+        print(f"{size:>8} {points:>14,} {best:8.3f} {points / best:10.2e} {share.mean():11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark the Monte Carlo stress engine across a synthetic portfolio.
+
+Usage::
+
+    python scripts/bench_stress.py --obligors 10 100 --paths 100000 --workers 1 4
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from changwon_credit.analytics import compute_credit_metrics
+from changwon_credit.kernel import INPUT_COLUMNS
+from changwon_credit.stress import simulate_stress
+
+
+def _metrics(obligors: int, years: int = 5, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {
+            "company_code": np.repeat([f"{100000 + index:06d}" for index in range(obligors)], years),
+            "year": np.tile(np.arange(2025 - years, 2025), obligors),
+        }
+    )
+    for name in INPUT_COLUMNS:
+        frame[name] = rng.uniform(50.0, 1000.0, len(frame))
+    return compute_credit_metrics(frame)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--obligors", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--paths", type=int, default=100_000, help="Paths per obligor.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="Process counts to compare.")
+    args = parser.parse_args()
+
+    print(f"{'obligors':>8} {'workers':>7} {'total paths':>13} {'seconds':>8} {'paths/s':>9} {'peak MB':>8}")
+    for size in args.obligors:
+        metrics = _metrics(size)
+        for workers in args.workers:
+            tracemalloc.start()
+            started = time.perf_counter()
+            simulate_stress(metrics, paths=args.paths, workers=workers)
+            elapsed = time.perf_counter() - started
+            # 작업 프로세스의 메모리는 잡히지 않으므로 workers=1일 때가 한 작업자의 상한이다.
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            total = size * args.paths
+            print(f"{size:>8} {workers:>7} {total:>13,} {elapsed:8.2f} {total / elapsed:9.2e} {peak:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark full TTM metric recomputation against computing only the newest quarter.
+
+Usage::
+
+    python scripts/bench_ttm.py --companies 100 1000 5000 --quarters 40
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from changwon_credit.loader import STATEMENT_METRICS
+from changwon_credit.quarterly import build_ttm, compute_ttm_metrics, extend_ttm_metrics
+
+
+def _panel(companies: int, quarters: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    metrics = [metric for metric_map in STATEMENT_METRICS.values() for metric in metric_map.values()]
+    periods = np.arange(quarters)
+    frame = pd.DataFrame(
+        {
+            "company_code": np.repeat([f"{100000 + index:06d}" for index in range(companies)], quarters),
+            "year": np.tile(2015 + periods // 4, companies),
+            "quarter": np.tile(periods % 4 + 1, companies),
+        }
+    )
+    values = rng.uniform(1.0, 1000.0, size=(len(frame), len(metrics)))
+    return pd.concat([frame, pd.DataFrame(values, columns=metrics)], axis=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--quarters", type=int, default=40, help="Quarters of history per company.")
+    args = parser.parse_args()
+
+    print(f"{'companies':>9} {'rows':>8} {'ttm s':>8} {'full s':>8} {'update s':>9} {'speedup':>8}")
+    for size in args.companies:
+        panel = _panel(size, args.quarters)
+        last = panel["year"] * 4 + panel["quarter"] == (panel["year"] * 4 + panel["quarter"]).max()
+        previous = compute_ttm_metrics(panel[~last])
+
+        started = time.perf_counter()
+        build_ttm(panel)
+        ttm = time.perf_counter() - started
+        started = time.perf_counter()
+        compute_ttm_metrics(panel)
+        full = time.perf_counter() - started
+        started = time.perf_counter()
+        extend_ttm_metrics(panel, previous)
+        update = time.perf_counter() - started
+        print(
+            f"{size:>9} {len(panel):>8} {ttm:8.3f} {full:8.3f} {update:9.3f} {full / update:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
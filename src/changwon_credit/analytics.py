@@ -1,89 +1,147 @@
 from __future__ import annotations
 
 import math
-from typing import List
+from typing import List, Mapping
 
 import numpy as np
 import pandas as pd
 
+from .kernel import (
+    INPUT_COLUMNS,
+    OPTIONAL_COLUMNS,
+    OUTPUT_COLUMNS,
+    metric_kernel,
+)
 from .models import CreditStory
+from .scenarios import GRID_MEASURES, scenario_grid
+
+
+GROWTH_SOURCES = {
+    "revenue_growth": "revenue",
+    "operating_income_growth": "operating_income",
+    "net_income_growth": "net_income",
+    "asset_growth": "total_assets",
+}
+# 다음 연도 지표의 시차 계산(성장률·원금상환)에 필요한 직전 연도 재무제표 값.
+STATE_COLUMNS = ("revenue", "operating_income", "net_income", "total_assets", "total_liabilities")
+
+
+def compute_credit_metrics(
+    df: pd.DataFrame,
+    *,
+    periods_per_year: int = 1,
+    retained_base: Mapping[str, float] | None = None,
+) -> pd.DataFrame:
+    """Derive the full NH 여신 정량 팩(현금·레버리지·PD/LGD proxy) from the merged statements.
+
+    The frame may hold any number of companies: it is sorted once by
+    ``company_code`` and period, and every lag (cumulative earnings, the
+    principal proxy, growth rates) is taken within each company, so one
+    obligor's history never leaks into another's. Rows come back in that
+    order with the derived columns appended. The arithmetic itself is
+    :func:`~changwon_credit.kernel.metric_kernel` on a float array.
+
+    ``periods_per_year=4`` treats the frame as a quarterly TTM panel keyed by
+    ``year``/``quarter``: lags compare against the same quarter a year earlier.
+    ``retained_base`` carries each company's cumulative earnings from rows
+    computed earlier so only a trailing window has to be recomputed.
+    """
+
+    period_keys = ["year", "quarter"] if "quarter" in df.columns else ["year"]
+    codes = pd.factorize(df["company_code"], sort=True)[0]
+    key = _panel_key(codes, [df[name].to_numpy(dtype=np.int64) for name in period_keys])
+    if (key[1:] >= key[:-1]).all():
+        frame = df.reset_index(drop=True)  # 이미 회사·기간 순이면 재정렬 복사를 생략한다.
+    else:
+        order = np.argsort(key, kind="stable")
+        frame = df.take(order).reset_index(drop=True)
+        codes = codes[order]
+    base = None
+    if retained_base is not None:
+        base = frame["company_code"].astype(object).map(retained_base).to_numpy(dtype=float)
+    # 계산은 고정 열 순서의 2-D float 배열 위에서 kernel.metric_kernel이 한 번에 수행한다.
+    derived = pd.DataFrame(
+        metric_kernel(
+            metric_inputs(frame), codes, periods_per_year=periods_per_year, retained_base=base
+        ),
+        columns=list(OUTPUT_COLUMNS),
+        index=frame.index,
+        copy=False,
+    )
+    return pd.concat(
+        [frame.drop(columns=derived.columns.intersection(frame.columns)), derived], axis=1
+    )
 
 
-def compute_credit_metrics(df: pd.DataFrame) -> pd.DataFrame:
-    """Derive the full NH 여신 정량 팩(현금·레버리지·PD/LGD proxy) from the merged statements."""
+def metric_state(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Each company's running state at its latest computed year.
+
+    One row per company with ``year``, the cumulative
+    ``retained_earnings_proxy`` (last non-missing value, since missing
+    earnings add nothing) and the :data:`STATE_COLUMNS` statement values the
+    next year's lags read. ``metrics`` needs those statement columns, as
+    :func:`compute_credit_metrics` output has.
+    """
+
+    ordered = metrics.sort_values(["company_code", "year"], kind="stable")
+    grouped = ordered.groupby("company_code", sort=True)
+    state = grouped[["year", *STATE_COLUMNS]].nth(-1).set_index(grouped.size().index)
+    state["retained_earnings_proxy"] = grouped["retained_earnings_proxy"].last()
+    return state.reset_index()
+
+
+def extend_credit_metrics(frame: pd.DataFrame, state: pd.DataFrame) -> pd.DataFrame:
+    """Compute annual metrics only for the years after each company's ``state`` row.
+
+    ``frame`` holds merged statements (older years are ignored) and
+    ``state`` comes from :func:`metric_state` over the metrics computed so
+    far. Each company's state row is prepended as a seed so the growth and
+    principal lags see the prior year, and its cumulative earnings are
+    carried in, so the new rows equal a full recompute of the whole history.
+    Companies without state are computed from scratch.
+    """
+
+    frontier = state.set_index("company_code")["year"]
+    last = frame["company_code"].map(frontier).to_numpy(dtype=float)
+    fresh = frame[np.isnan(last) | (frame["year"].to_numpy() > last)]
+    if fresh.empty:
+        return compute_credit_metrics(fresh)
+    seeds = state[state["company_code"].isin(fresh["company_code"])]
+    # 시드 행의 순이익은 누적합에 다시 더해지므로 이월 누적이익에서 미리 뺀다.
+    carried = seeds["retained_earnings_proxy"].to_numpy(dtype=float)
+    base = np.where(np.isnan(carried), 0.0, carried) - seeds["net_income"].fillna(0.0).to_numpy(dtype=float)
+    window = pd.concat(
+        [fresh.assign(_seed=False), seeds.drop(columns="retained_earnings_proxy").assign(_seed=True)],
+        ignore_index=True,
+    )
+    computed = compute_credit_metrics(window, retained_base=dict(zip(seeds["company_code"], base)))
+    return computed[~computed.pop("_seed").astype(bool)].reset_index(drop=True)
 
-    metrics = df.copy()
 
-    # EBITDA와 FCF는 이자/상환 능력의 기초 체력이다.
-    metrics["ebitda"] = (
-        metrics["operating_income"]
-        + metrics.get("non_cash_expense", 0).fillna(0)
-        - metrics.get("non_cash_income", 0).fillna(0)
-    )
-    metrics["free_cash_flow"] = metrics["operating_cash_flow"] - metrics["investment_outflows"]
-
-    # 기본 재무 안전성 지표 (Basel Pillar 2 공시 항목과 유사)
-    metrics["debt_to_equity"] = _safe_div(metrics["total_liabilities"], metrics["equity"])
-    metrics["current_ratio"] = _safe_div(metrics["current_assets"], metrics["current_liabilities"])
-    metrics["interest_coverage"] = _safe_div(metrics["ebitda"], metrics["interest_expense"])
-
-    # 수익성/현금 마진. IFRS 손익만으로는 여신 설명이 어려워 OCF/FCF 마진을 병행한다.
-    metrics["op_margin"] = _safe_div(metrics["operating_income"], metrics["revenue"])
-    metrics["ebitda_margin"] = _safe_div(metrics["ebitda"], metrics["revenue"])
-    metrics["net_margin"] = _safe_div(metrics["net_income"], metrics["revenue"])
-    metrics["fcf_margin"] = _safe_div(metrics["free_cash_flow"], metrics["revenue"])
-    metrics["ocf_margin"] = _safe_div(metrics["operating_cash_flow"], metrics["revenue"])
-
-    # 투자자본 기반 수익성 (ROIC)과 운전자본 추출
-    metrics["working_capital"] = metrics["current_assets"] - metrics["current_liabilities"]
-    metrics["invested_capital"] = metrics["total_assets"] - metrics["current_liabilities"]
-    metrics["roic"] = _safe_div(metrics["operating_income"], metrics["invested_capital"])
-
-    # 누적 이익은 Altman Z 계산을 위해 필요하므로 회사별 시계열 누적으로 생성한다.
-    metrics = metrics.sort_values(["company_code", "year"]).reset_index(drop=True)
-    metrics["retained_earnings_proxy"] = metrics.groupby("company_code")["net_income"].cumsum()
-    metrics["altman_z_score"] = _altman_z(metrics)
-
-    # 부채 대비 현금창출력: NH IRB 심사 시 FCF/부채와 OCF/부채를 함께 본다.
-    metrics["fcf_to_debt"] = _safe_div(metrics["free_cash_flow"], metrics["total_liabilities"])
-    metrics["ocf_to_debt"] = _safe_div(metrics["operating_cash_flow"], metrics["total_liabilities"])
-
-    # 레버리지 stress용 추가 지표
-    metrics["debt_to_ebitda"] = _safe_div(metrics["total_liabilities"], metrics["ebitda"])
-    metrics["net_debt"] = metrics["total_liabilities"] - metrics.get("ending_cash", 0).fillna(0)
-    metrics["net_debt_to_ebitda"] = _safe_div(metrics["net_debt"], metrics["ebitda"])
-
-    # CAPEX 관련 비율 (투자 부담 vs OCF 커버리지 체크)
-    metrics["capex_ratio"] = _safe_div(metrics["investment_outflows"], metrics["revenue"])
-    metrics["ocf_to_capex"] = _safe_div(metrics["operating_cash_flow"], metrics["investment_outflows"])
-
-    # DSCR 계산을 위해 원리금 상환액을 근사(부채 감소분을 원금 상환으로 가정)한다.
-    principal_proxy = (
-        metrics.groupby("company_code")["total_liabilities"]
-        .diff()
-        .mul(-1)
-        .clip(lower=0)
-        .fillna(0)
-    )
-    metrics["debt_service"] = metrics["interest_expense"] + principal_proxy
-    metrics["dscr"] = _safe_div(metrics["operating_cash_flow"], metrics["debt_service"])
+def metric_inputs(frame: pd.DataFrame) -> np.ndarray:
+    """Statement columns of ``frame`` as the kernel's ``(rows, INPUT_COLUMNS)`` float array."""
 
-    # LGD/EAD proxy: 단기자산 비중이 낮을수록 담보 회수율 저하 → (1 – 유동자산/총자산)
-    metrics["lgd_proxy"] = (1 - _safe_div(metrics["current_assets"], metrics["total_assets"])).clip(
-        lower=0, upper=1
-    )
-    metrics["ead_proxy"] = metrics["total_liabilities"]
+    missing = [
+        name for name in INPUT_COLUMNS if name not in frame.columns and name not in OPTIONAL_COLUMNS
+    ]
+    if missing:
+        raise KeyError(f"Missing statement columns: {', '.join(missing)}")
+    values = np.zeros((len(INPUT_COLUMNS), len(frame)), dtype=np.float64)
+    for index, name in enumerate(INPUT_COLUMNS):
+        if name in frame.columns:
+            values[index] = frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+    return values.T
 
-    # Altman Z 기반 구간형 PD 추정 (chapter에서 언급된 “부도확률” 활용)
-    metrics["pd_estimate"] = _pd_from_altman(metrics["altman_z_score"])
 
-    # 성장성/자산 확장 추세 (IRB 모형 가중치용)
-    metrics = metrics.sort_values("year").reset_index(drop=True)
-    metrics["revenue_growth"] = metrics["revenue"].pct_change()
-    metrics["operating_income_growth"] = metrics["operating_income"].pct_change()
-    metrics["net_income_growth"] = metrics["net_income"].pct_change()
-    metrics["asset_growth"] = metrics["total_assets"].pct_change()
-    return metrics
+def _panel_key(codes: np.ndarray, periods: List[np.ndarray]) -> np.ndarray:
+    """One int64 sort key per row: company first, then each period column."""
+
+    key = codes.astype(np.int64)
+    for values in periods:
+        if len(values):
+            low = values.min()
+            key = key * (values.max() - low + 1) + (values - low)
+    return key
 
 
 def build_credit_story(metrics: pd.DataFrame, company_name: str) -> CreditStory:
@@ -171,42 +229,18 @@ def build_credit_story(metrics: pd.DataFrame, company_name: str) -> CreditStory:
 
 
 def build_scenarios(metrics: pd.DataFrame, shock: float = 0.1) -> pd.DataFrame:
-    """Return downside/base/upside coverage summary for the latest year."""
-
-    latest = metrics.sort_values("year").iloc[-1]
-    scenarios = []
-    definitions = [
-        ("보수", 1 - shock),
-        ("기준", 1.0),
-        ("낙관", 1 + shock),
-    ]
-    for label, factor in definitions:
-        # 매출·현금흐름을 가중치로 조정해 DSCR/PD 변화 민감도를 본다.
-        revenue = latest["revenue"] * factor
-        ebitda = latest["ebitda"] * factor
-        operating_income = latest["operating_income"] * factor
-        free_cash_flow = latest["free_cash_flow"] * factor
-        ocf = latest["operating_cash_flow"] * factor
-        interest_expense = latest["interest_expense"]
-        debt_service = latest["debt_service"]
-        coverage = _safe_div(pd.Series([ebitda]), pd.Series([interest_expense])).iloc[0]
-        dscr = _safe_div(pd.Series([ocf]), pd.Series([debt_service])).iloc[0]
-        fcf_margin = _safe_div(pd.Series([free_cash_flow]), pd.Series([revenue])).iloc[0]
-        pd_case = _pd_from_altman(pd.Series([latest["altman_z_score"] * factor])).iloc[0]
-        scenarios.append(
-            {
-                "scenario": label,
-                "revenue": revenue,
-                "operating_income": operating_income,
-                "ebitda": ebitda,
-                "free_cash_flow": free_cash_flow,
-                "interest_coverage": coverage,
-                "dscr": dscr,
-                "fcf_margin": fcf_margin,
-                "pd_estimate": pd_case,
-            }
-        )
-    return pd.DataFrame(scenarios)
+    """Return downside/base/upside coverage summary for the latest year.
+
+    The three cases are the ``(-shock, 0, +shock)`` revenue slice of
+    :func:`~changwon_credit.scenarios.scenario_grid`.
+    """
+
+    latest = metrics.sort_values("year").tail(1)
+    # 매출·현금흐름을 가중치로 조정해 DSCR/PD 변화 민감도를 본다.
+    grid = scenario_grid(latest, revenue_shocks=(-shock, 0.0, shock)).to_frame()
+    return pd.concat(
+        [pd.Series(["보수", "기준", "낙관"], name="scenario"), grid[list(GRID_MEASURES)]], axis=1
+    )
 
 
 def _cagr(start: float, end: float, periods: int) -> float:
@@ -227,38 +261,5 @@ def _fmt_num(value: float) -> str:
     return f"{value:.1f}"
 
 
-def _safe_div(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
-    denom = denominator.replace(0, pd.NA)
-    return numerator / denom
-
-
 def _is_valid(value: float | None) -> bool:
     return value is not None and not (isinstance(value, float) and math.isnan(value))
-
-
-def _pd_from_altman(z_scores: pd.Series) -> pd.Series:
-    transformed = z_scores.fillna(0)
-    safe = transformed >= 3.0
-    grey = (transformed >= 1.8) & (transformed < 3.0)
-    distress = transformed < 1.8
-
-    pd_values = np.empty(len(transformed), dtype=float)
-    pd_values[safe] = 0.01  # Altman Safe Zone → 투자등급 수준으로 가정
-    pd_values[grey] = 0.03 + (3.0 - transformed[grey]) * 0.02  # Grey Zone은 3~5% PD 구간
-    pd_values[distress] = 0.15 + (1.8 - transformed[distress]) * 0.05  # Distress Zone은 ≥15%로 보수 적용
-    return pd.Series(np.clip(pd_values, 0.01, 0.35), index=z_scores.index)
-
-
-def _altman_z(metrics: pd.DataFrame) -> pd.Series:
-    wc_over_assets = _safe_div(metrics["working_capital"], metrics["total_assets"])
-    re_over_assets = _safe_div(metrics["retained_earnings_proxy"], metrics["total_assets"])
-    ebit_over_assets = _safe_div(metrics["operating_income"], metrics["total_assets"])
-    equity_over_liab = _safe_div(metrics["equity"], metrics["total_liabilities"])
-    sales_over_assets = _safe_div(metrics["revenue"], metrics["total_assets"])
-    return (
-        0.717 * wc_over_assets
-        + 0.847 * re_over_assets
-        + 3.107 * ebit_over_assets
-        + 0.420 * equity_over_liab
-        + 0.998 * sales_over_assets
-    )
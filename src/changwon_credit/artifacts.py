@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import pandas as pd
+
+from .manifest import frame_hash
+
+LOGGER = logging.getLogger(__name__)
+
+ARTIFACT_MANIFEST_NAME = "artifact_manifest.json"
+
+
+@dataclass(slots=True)
+class ArtifactRecord:
+    inputs: str
+    outputs: List[str]
+    result: Any = None
+    digest: str | None = None
+
+
+class ArtifactManifest:
+    """Input hash, output files, result and result digest of every graph stage.
+
+    :class:`~changwon_credit.dag.StageGraph` skips a stage whose inputs hash
+    the same as last time and whose recorded outputs still exist, and passes
+    its recorded digest downstream instead of rerunning it.
+    """
+
+    def __init__(self, path: Path, entries: Dict[str, ArtifactRecord] | None = None) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, ArtifactRecord] = entries or {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "ArtifactManifest":
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        entries = {key: ArtifactRecord(**entry) for key, entry in raw.get("artifacts", {}).items()}
+        return cls(path, entries)
+
+    def is_current(self, key: str, inputs: str) -> bool:
+        record = self.entries.get(key)
+        return (
+            record is not None
+            and record.inputs == inputs
+            and all(Path(output).exists() for output in record.outputs)
+        )
+
+    def record(
+        self,
+        key: str,
+        inputs: str,
+        outputs: Sequence[Path],
+        result: Any = None,
+        digest: str | None = None,
+    ) -> None:
+        with self._lock:
+            self.entries[key] = ArtifactRecord(inputs, [str(path) for path in outputs], result, digest)
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"artifacts": {key: asdict(entry) for key, entry in sorted(self.entries.items())}}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+            tmp_path.write_text(
+                json.dumps(payload, ensure_ascii=False, indent=2, default=str), encoding="utf-8"
+            )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def hash_inputs(*inputs: Any) -> str:
+    """Combine frames, files, dataclasses and plain values into one content hash.
+
+    Paths hash their file contents (a missing file hashes as such), so
+    passing a template or a module's ``__file__`` invalidates the step when
+    that file is edited.
+    """
+
+    digest = hashlib.sha256()
+    for value in inputs:
+        if isinstance(value, pd.DataFrame):
+            part = frame_hash(value)
+        elif isinstance(value, Path):
+            part = hashlib.sha256(value.read_bytes()).hexdigest() if value.is_file() else f"missing:{value}"
+        elif is_dataclass(value) and not isinstance(value, type):
+            part = json.dumps(asdict(value), sort_keys=True, default=str, ensure_ascii=False)
+        else:
+            part = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+import pandas as pd
+
+from .analytics import compute_credit_metrics
+from .cache import ResponseCache
+from .db import write_tables
+from .etl import persist_metrics, pivot_statements
+from .loader import STATEMENT_METRICS, fetch_many, normalize_statements
+from .models import CreditConfig
+from .resilience import Resilience
+from .store import append_partitions, read_processed
+
+LOGGER = logging.getLogger(__name__)
+
+HISTORY_DIR = "history"
+STATE_NAME = "backfill_state.json"
+HISTORY_TABLE = "financials_history"
+METRIC_COLUMNS = [metric for metric_map in STATEMENT_METRICS.values() for metric in metric_map.values()]
+_METRIC_STATEMENT = {
+    metric: statement
+    for statement, metric_map in STATEMENT_METRICS.items()
+    for metric in metric_map.values()
+}
+_METRIC_LABEL = {
+    metric: label.removesuffix("계산에 참여한 계정 펼치기")
+    for metric_map in STATEMENT_METRICS.values()
+    for label, metric in metric_map.items()
+}
+
+
+@dataclass(slots=True)
+class BackfillState:
+    """Resume point of a backfill: finished companies, failures and chunk files."""
+
+    done: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    chunks: List[str] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> "BackfillState":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(asdict(self), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+@dataclass(slots=True)
+class BackfillSummary:
+    companies: int
+    loaded: int
+    skipped: int
+    failed: int
+    rows: int
+    elapsed: float
+
+
+def run_backfill(
+    config: CreditConfig,
+    company_codes: Sequence[str],
+    *,
+    chunk_size: int = 200,
+    max_workers: int = 16,
+    rate_limit: float | None = None,
+    restart: bool = False,
+    write_csv: bool = True,
+) -> BackfillSummary:
+    """Load every annual column FnGuide shows for many companies into the store.
+
+    Companies are fetched ``chunk_size`` at a time with :func:`fetch_many`,
+    normalized in one vectorized pass per chunk and written in bulk: one
+    Parquet part under ``<processed>/history/`` and one SQLite transaction
+    that upserts the chunk's rows into ``financials_history`` and
+    ``credit_profile``. The rows are also appended to the partitioned
+    ``credit_profile`` dataset, and the metrics of the chunk's companies are
+    recomputed over their full stored history in one panel pass and written
+    with one :func:`~changwon_credit.etl.persist_metrics` call, so the
+    backfilled years reach ``analytics_credit``, the warehouse loaders and
+    the DuckDB views. The state file is saved only after a chunk is fully written, so an
+    interrupted run resumes with the first unfinished chunk; ``restart``
+    starts over.
+    """
+
+    started = time.perf_counter()
+    history_dir = config.processed_dir / HISTORY_DIR
+    state_path = history_dir / STATE_NAME
+    state = BackfillState() if restart else BackfillState.load(state_path)
+    if restart:
+        for part in history_dir.glob("chunk-*.parquet"):
+            part.unlink()
+    _drop_orphan_chunks(history_dir, state)
+
+    done = set(state.done)
+    pending = list(dict.fromkeys(code for code in company_codes if code not in done))
+    cache = ResponseCache.from_config(config)
+    resilience = Resilience.from_config(config)
+    loaded = rows = 0
+    for chunk in _chunks(pending, chunk_size):
+        raw_by_company: Dict[str, Dict[str, pd.DataFrame]] = {}
+        for result in fetch_many(
+            chunk,
+            None,
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+            cache=cache,
+            base_url=config.fnguide_url,
+            resilience=resilience,
+        ):
+            if result.ok:
+                raw_by_company[result.company_code] = result.raw_tables
+                state.failed.pop(result.company_code, None)
+            else:
+                state.failed[result.company_code] = str(result.error)
+
+        long = normalize_statements(raw_by_company, years=None)
+        history = _history_frame(long)
+        part_name = f"chunk-{len(state.chunks):05d}.parquet"
+        history_dir.mkdir(parents=True, exist_ok=True)
+        history.to_parquet(history_dir / part_name, index=False)
+        _write_history_sql(history, config.sqlite_path, list(raw_by_company))
+        _publish_history(history, config)
+        if write_csv:
+            write_history_csv(long, config.raw_dir)
+
+        state.chunks.append(part_name)
+        state.done.extend(code for code in chunk if code in raw_by_company)
+        state.save(state_path)
+        loaded += len(raw_by_company)
+        rows += len(history)
+        LOGGER.info(
+            "Backfilled %d/%d companies (%d rows, %d failed so far)",
+            loaded,
+            len(pending),
+            rows,
+            len(state.failed),
+        )
+
+    return BackfillSummary(
+        companies=len(company_codes),
+        loaded=loaded,
+        skipped=len(company_codes) - len(pending),
+        failed=len(state.failed),
+        rows=rows,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def read_history(config: CreditConfig, company_codes: Sequence[str] | None = None) -> pd.DataFrame:
+    """Read backfilled statements, keeping the newest load of each company-year."""
+
+    history_dir = config.processed_dir / HISTORY_DIR
+    state = BackfillState.load(history_dir / STATE_NAME)
+    parts = [history_dir / name for name in state.chunks if (history_dir / name).exists()]
+    if not parts:
+        return pd.DataFrame(columns=["company_code", "year", *METRIC_COLUMNS])
+    filters = [("company_code", "in", list(company_codes))] if company_codes is not None else None
+    history = pd.concat(
+        [pd.read_parquet(part, filters=filters) for part in parts], ignore_index=True
+    )
+    history = history.drop_duplicates(["company_code", "year"], keep="last")
+    return history.sort_values(["company_code", "year"]).reset_index(drop=True)
+
+
+def write_history_csv(long: pd.DataFrame, raw_dir: Path) -> List[Path]:
+    """Write ``<code>_fs_<statement>_<first>_<last>.csv`` files in the guide's long layout."""
+
+    if long.empty:
+        return []
+    frame = pd.DataFrame(
+        {
+            "company_code": long["company_code"],
+            "statement": long["metric"].map(_METRIC_STATEMENT),
+            "fiscal_year": long["year"].astype(int),
+            "fiscal_type": "annual",
+            "account_code": long["metric"],
+            "account_name_kr": long["metric"].map(_METRIC_LABEL),
+            "account_name_en": long["metric"].str.replace("_", " ").str.title(),
+            "value_mil_krw": (long["value"] * 1000).round(3),  # KRW bn -> KRW mn
+        }
+    )
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for (code, statement), group in frame.groupby(["company_code", "statement"], sort=False):
+        first, last = group["fiscal_year"].min(), group["fiscal_year"].max()
+        path = raw_dir / f"{code}_fs_{statement}_{first}_{last}.csv"
+        group.drop(columns=["company_code", "statement"]).sort_values(
+            ["fiscal_year", "account_code"]
+        ).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def _history_frame(long: pd.DataFrame) -> pd.DataFrame:
+    if long.empty:
+        return pd.DataFrame(columns=["company_code", "year", *METRIC_COLUMNS])
+    wide = pivot_statements(long)
+    return wide.reindex(columns=["company_code", "year", *METRIC_COLUMNS])
+
+
+def _write_history_sql(history: pd.DataFrame, sqlite_path: Path, company_codes: List[str]) -> None:
+    if not company_codes:
+        return
+    write_tables(sqlite_path, {HISTORY_TABLE: history, "credit_profile": history})
+
+
+def _publish_history(history: pd.DataFrame, config: CreditConfig) -> None:
+    if history.empty:
+        return
+    append_partitions(config.processed_dir, "credit_profile", history)
+    # 과거 연도가 더해지면 누적이익·성장률이 바뀌므로 해당 회사 지표를 전체 이력으로 다시 계산한다.
+    codes = history["company_code"].unique().tolist()
+    stored = read_processed(config.processed_dir, "credit_profile", company_codes=codes)
+    # compute_credit_metrics는 회사별로 lag를 나누므로 청크 전체를 한 번에 계산·저장한다.
+    persist_metrics(compute_credit_metrics(stored), config)
+
+
+def _drop_orphan_chunks(history_dir: Path, state: BackfillState) -> None:
+    """Remove parts written by a chunk that was interrupted before its state save."""
+
+    recorded = set(state.chunks)
+    for part in history_dir.glob("chunk-*.parquet"):
+        if part.name not in recorded:
+            LOGGER.info("Removing unfinished backfill part %s", part.name)
+            part.unlink()
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), max(1, size)):
+        yield items[start : start + size]
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from importlib import resources
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Sequence
+
+import pandas as pd
+
+from . import analytics, report_md, report_typst, visuals
+from .analytics import build_credit_story, build_scenarios, compute_credit_metrics
+from .artifacts import ARTIFACT_MANIFEST_NAME, ArtifactManifest
+from .cache import ResponseCache
+from .dag import GraphRun, Node, StageGraph
+from .db import enforce_dtypes, load_schema
+from .etl import (
+    MANIFEST_NAME,
+    _write_raw_tables,
+    merge_statements,
+    persist_processed,
+    refresh_quarterly,
+    update_metrics,
+)
+from .loader import HostRateLimiter, build_session, fetch_raw_tables, tidy_statements
+from .manifest import FetchManifest, ManifestEntry, build_entry
+from .models import CreditConfig, CreditStory, FinancialStatements, config_for_company
+from .report_md import render_markdown
+from .report_typst import render_typst_report
+from .resilience import Resilience
+from .staged import Stage, StagedPipeline
+from .store import read_processed
+from .visuals import build_charts, figure_list
+
+STAGE_CACHE_DIR = ".stages"
+RENDER_STAGES = ("charts", "report", "typst")
+
+
+@dataclass(slots=True)
+class CompanyJob:
+    """State carried for one company through the batch stages."""
+
+    config: CreditConfig
+    raw_tables: Dict[str, pd.DataFrame] | None = None
+    entry: ManifestEntry | None = None
+    statements: FinancialStatements | None = None
+    merged: pd.DataFrame | None = None
+    metrics: pd.DataFrame | None = None
+    story: CreditStory | None = None
+    scenarios: pd.DataFrame | None = None
+
+
+@dataclass(slots=True)
+class RenderResult:
+    figures: List[dict]
+    report_path: Path
+    typst_path: Path | None = None
+    pdf_path: Path | None = None
+    rebuilt: List[str] = field(default_factory=list)
+
+
+def build_batch_pipeline(
+    config: CreditConfig,
+    *,
+    fetch_workers: int = 8,
+    compute_workers: int = 2,
+    render_workers: int = 2,
+    queue_size: int = 8,
+    rate_limit: float | None = None,
+    compute_processes: bool = False,
+    force: bool = False,
+) -> tuple[StagedPipeline, FetchManifest]:
+    """Wire fetch → transform → persist → render stages for many companies.
+
+    Fetch and render are I/O bound (HTTP, Kaleido, Typst subprocesses) and
+    get their own thread pools; transform (tidy, merge, metrics) is CPU bound
+    and can run in a process pool; persist stays single-threaded because it
+    owns the SQLite writer. All fetch workers share one retry policy, circuit
+    breaker and (with ``http.budget_rps``) adaptive request budget. Companies
+    whose fetch manifest is unchanged are dropped after the fetch stage
+    unless ``force`` is set.
+    """
+
+    session = build_session(pool_size=fetch_workers)
+    limiter = HostRateLimiter(rate_limit)
+    guard = Resilience.from_config(config)
+    cache = ResponseCache.from_config(config)
+    manifest = FetchManifest.load(config.processed_dir / MANIFEST_NAME)
+
+    def fetch(job: CompanyJob) -> CompanyJob | None:
+        job.raw_tables = fetch_raw_tables(
+            job.config.company_code,
+            session=session,
+            rate_limiter=limiter,
+            cache=cache,
+            base_url=job.config.fnguide_url,
+            quarterly=job.config.frequency == "quarterly",
+            resilience=guard,
+        )
+        job.entry = build_entry(job.raw_tables)
+        if not force and manifest.is_unchanged(job.config.company_code, job.entry):
+            return None
+        return job
+
+    def persist(job: CompanyJob) -> CompanyJob:
+        _write_raw_tables(job.raw_tables, job.config)
+        code = job.config.company_code
+        history = read_processed(job.config.processed_dir, "credit_profile", company_codes=[code])
+        persist_processed(job.statements, job.merged, job.config)
+        update_metrics(job.merged, job.config, history=history, force=force)
+        if job.config.frequency == "quarterly":
+            refresh_quarterly(job.raw_tables, job.config, force=force)
+        manifest.record(job.config.company_code, job.entry)
+        return job
+
+    pipeline = StagedPipeline(
+        [
+            Stage("fetch", fetch, workers=fetch_workers, queue_size=queue_size),
+            Stage(
+                "transform",
+                _transform,
+                workers=compute_workers,
+                queue_size=queue_size,
+                processes=compute_processes,
+            ),
+            Stage("persist", persist, workers=1, queue_size=queue_size),
+            Stage("render", _render, workers=render_workers, queue_size=queue_size),
+        ]
+    )
+    return pipeline, manifest
+
+
+def company_jobs(config: CreditConfig, company_codes: Sequence[str]) -> Iterator[CompanyJob]:
+    for code in company_codes:
+        yield CompanyJob(config_for_company(config, code))
+
+
+def _transform(job: CompanyJob) -> CompanyJob:
+    job.statements = tidy_statements(job.raw_tables, job.config.years)
+    job.merged = merge_statements(job.statements, job.config.company_code)
+    job.metrics = enforce_dtypes(
+        compute_credit_metrics(job.merged),
+        load_schema()["analytics_credit"],
+        float32_ratios=job.config.float32_ratios,
+    )
+    job.story = build_credit_story(job.metrics, job.config.company_name)
+    job.scenarios = build_scenarios(job.metrics)
+    return job
+
+
+def company_graph(config: CreditConfig) -> StageGraph:
+    """Stages from merged statements to the warehouse, charts and reports of one company.
+
+    ``warehouse`` extends the stored metrics through
+    :func:`~changwon_credit.etl.update_metrics` next to ``metrics``, and
+    ``story``, ``scenarios`` and ``figures`` run side by side once metrics
+    exist; the markdown memo only needs the figure list, so it
+    renders while Kaleido draws the charts, and the Typst PDF (which embeds
+    the chart images) follows the charts.
+    """
+
+    analytics_source = Path(analytics.__file__)
+    nodes = [
+        Node(
+            "metrics",
+            lambda config, merged: enforce_dtypes(
+                compute_credit_metrics(merged),
+                load_schema()["analytics_credit"],
+                float32_ratios=config.float32_ratios,
+            ),
+            inputs=("config", "merged"),
+            output=pd.DataFrame,
+            sources=(analytics_source,),
+        ),
+        Node(
+            "story",
+            lambda config, metrics: build_credit_story(metrics, config.company_name),
+            inputs=("config", "metrics"),
+            output=CreditStory,
+            sources=(analytics_source,),
+        ),
+        Node(
+            "scenarios",
+            build_scenarios,
+            inputs=("metrics",),
+            output=pd.DataFrame,
+            sources=(analytics_source,),
+        ),
+        Node(
+            "warehouse",
+            _update_warehouse,
+            inputs=("merged", "config"),
+            output=type(None),
+        ),
+        Node("figures", figure_list, output=list, sources=(Path(visuals.__file__),)),
+        Node(
+            "charts",
+            build_charts,
+            inputs=("metrics", "scenarios", "config"),
+            output=list,
+            sources=(Path(visuals.__file__),),
+            writes=lambda figures: [config.report_path.parent / figure["path"] for figure in figures],
+        ),
+        Node(
+            "report",
+            _write_markdown,
+            inputs=("config", "metrics", "story", "scenarios", "figures"),
+            output=type(None),
+            sources=(Path(report_md.__file__),),
+            writes=lambda _: [config.report_path],
+        ),
+    ]
+    if config.typst_enabled:
+        template = config.typst_template or Path(
+            str(resources.files("changwon_credit").joinpath("templates/credit_report.typ"))
+        )
+        nodes.append(
+            Node(
+                "typst",
+                _write_typst,
+                inputs=("config", "metrics", "story", "scenarios", "charts"),
+                output=list,
+                sources=(template, Path(report_typst.__file__)),
+                writes=lambda paths: [Path(path) for path in paths],
+            )
+        )
+    return StageGraph(nodes)
+
+
+def run_company_graph(
+    config: CreditConfig,
+    values: Mapping[str, Any],
+    *,
+    targets: Sequence[str] | None = None,
+    force: bool = False,
+) -> GraphRun:
+    """Run :func:`company_graph` with ``artifact_manifest.json`` next to the report."""
+
+    report_dir = config.report_path.parent
+    artifacts = ArtifactManifest.load(report_dir / ARTIFACT_MANIFEST_NAME)
+    try:
+        return company_graph(config).run(
+            {"config": config, **values},
+            manifest=artifacts,
+            cache_dir=report_dir / STAGE_CACHE_DIR,
+            key_prefix=f"{config.company_code}:",
+            targets=targets,
+            force=force,
+        )
+    finally:
+        artifacts.save()
+
+
+def render_company(
+    config: CreditConfig,
+    metrics: pd.DataFrame,
+    story: CreditStory,
+    scenarios: pd.DataFrame,
+    *,
+    force: bool = False,
+) -> RenderResult:
+    """Write charts, the markdown memo and the Typst report, skipping unchanged ones.
+
+    Runs the render stages of :func:`company_graph` with the given metrics,
+    story and scenarios, so a rerun on identical data never starts Kaleido
+    or Typst and a template edit reruns only the Typst step.
+    """
+
+    run = run_company_graph(
+        config,
+        {"metrics": metrics, "story": story, "scenarios": scenarios},
+        targets=report_targets(config),
+        force=force,
+    )
+    return render_result(config, run)
+
+
+def report_targets(config: CreditConfig) -> List[str]:
+    """Graph targets that produce the charts and reports, without ``warehouse``."""
+
+    return ["charts", "report", *(["typst"] if config.typst_enabled else [])]
+
+
+def render_result(config: CreditConfig, run: GraphRun) -> RenderResult:
+    figures = run.values.get("charts")
+    if figures is None:
+        figures = figure_list()
+    result = RenderResult(
+        figures=figures,
+        report_path=config.report_path,
+        rebuilt=[name for name in run.rebuilt if name in RENDER_STAGES],
+    )
+    paths = run.values.get("typst")
+    if paths:
+        result.typst_path = Path(paths[0])
+        result.pdf_path = Path(paths[1]) if len(paths) > 1 else None
+    return result
+
+
+def _write_markdown(
+    config: CreditConfig,
+    metrics: pd.DataFrame,
+    story: CreditStory,
+    scenarios: pd.DataFrame,
+    figures: List[dict],
+) -> None:
+    config.report_path.parent.mkdir(parents=True, exist_ok=True)
+    config.report_path.write_text(
+        render_markdown(config, metrics, story, scenarios, figures), encoding="utf-8"
+    )
+
+
+def _write_typst(
+    config: CreditConfig,
+    metrics: pd.DataFrame,
+    story: CreditStory,
+    scenarios: pd.DataFrame,
+    charts: List[dict],
+) -> List[str]:
+    typst_path, pdf_path = render_typst_report(
+        config,
+        metrics,
+        story,
+        scenarios,
+        charts,
+        template_path=config.typst_template,
+        output_dir=config.typst_output_dir,
+        compile_pdf=config.typst_compile_pdf,
+    )
+    return [str(path) for path in (typst_path, pdf_path) if path]
+
+
+def _update_warehouse(merged: pd.DataFrame, config: CreditConfig) -> None:
+    # analytics_credit는 항상 update_metrics로만 쓴다(새 연도만 추가, 정정 시 전체 재계산).
+    update_metrics(merged, config)
+
+
+def _render(job: CompanyJob) -> CompanyJob:
+    render_company(job.config, job.metrics, job.story, job.scenarios)
+    return job
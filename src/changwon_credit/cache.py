@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Tuple
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from .models import CreditConfig
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_MODES = ("default", "only", "off")
+# 한도를 넘기면 90%까지 비워서, 디렉터리 전체 스캔은 한도를 넘길 때만 가끔 일어나게 한다.
+EVICT_TO = 0.9
+
+
+class CacheMissError(LookupError):
+    """Raised in cache-only mode when a request has no cached response."""
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    key: str
+    text: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    content_hash: str
+
+
+class ResponseCache:
+    """On-disk FnGuide response cache with TTL, size cap and LRU eviction.
+
+    Each entry lives under ``<root>/<key>/`` where ``key`` hashes the request
+    parameters (gicode, pGB, CmpTp). The gzipped body sits next to a small
+    ``meta.json`` holding validators for conditional revalidation, and the
+    parsed tables are kept as Parquet keyed by the body's content hash so a
+    ``304 Not Modified`` skips both the download and the HTML parse. The meta
+    file's mtime doubles as the LRU access clock.
+
+    Entry sizes are tracked as they are written, so a put only measures its
+    own entry. The cache directory is scanned once up front and again only
+    when the tracked total exceeds ``max_bytes``; eviction then frees space
+    down to ``EVICT_TO`` of the cap.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ttl_seconds: float = 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        mode: str = "default",
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {CACHE_MODES}.")
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, int] | None = None
+        self._total = 0
+
+    @classmethod
+    def from_config(cls, config: CreditConfig) -> "ResponseCache | None":
+        if config.cache_mode == "off" or config.cache_dir is None:
+            return None
+        return cls(
+            config.cache_dir,
+            ttl_seconds=config.cache_ttl_hours * 3600,
+            max_bytes=int(config.cache_max_mb * 1024 * 1024),
+            mode=config.cache_mode,
+        )
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "only"
+
+    @staticmethod
+    def key(url: str, params: Mapping[str, str]) -> str:
+        """Entry key for ``url`` (scheme, host and path) with ``params``."""
+
+        # 같은 종목이라도 stand-in 서버와 실제 FnGuide 응답이 섞이지 않도록 엔드포인트를 키에 넣는다.
+        parts = urlsplit(url)
+        endpoint = f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path}"
+        canonical = "&".join(f"{name}={params[name]}" for name in sorted(params))
+        return hashlib.sha256(f"{endpoint}?{canonical}".encode("utf-8")).hexdigest()[:32]
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry_dir = self.root / key
+        meta_path = entry_dir / "meta.json"
+        body_path = entry_dir / "body.html.gz"
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            text = gzip.decompress(body_path.read_bytes()).decode("utf-8")
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Discarding unreadable cache entry %s: %s", key, exc)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        os.utime(meta_path)
+        return CachedResponse(
+            key=key,
+            text=text,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            fetched_at=float(meta["fetched_at"]),
+            content_hash=meta["content_hash"],
+        )
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.fetched_at < self.ttl_seconds
+
+    def conditional_headers(self, entry: CachedResponse | None) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def put(
+        self,
+        key: str,
+        text: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CachedResponse:
+        entry_dir = self.root / key
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        entry = CachedResponse(
+            key=key,
+            text=text,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+            content_hash=content_hash,
+        )
+        _atomic_write(entry_dir / "body.html.gz", gzip.compress(text.encode("utf-8")))
+        self._write_meta(entry)
+        self._evict(key)
+        return entry
+
+    def mark_revalidated(self, entry: CachedResponse) -> CachedResponse:
+        """Restart the TTL clock after the server answered ``304 Not Modified``."""
+
+        entry.fetched_at = time.time()
+        self._write_meta(entry)
+        return entry
+
+    def load_tables(self, entry: CachedResponse) -> Dict[str, pd.DataFrame] | None:
+        tables_dir = self.root / entry.key / "tables" / entry.content_hash
+        if not tables_dir.is_dir():
+            return None
+        tables = {path.stem: pd.read_parquet(path) for path in tables_dir.glob("*.parquet")}
+        return tables or None
+
+    def store_tables(self, entry: CachedResponse, tables: Mapping[str, pd.DataFrame]) -> None:
+        tables_root = self.root / entry.key / "tables"
+        shutil.rmtree(tables_root, ignore_errors=True)
+        tables_dir = tables_root / entry.content_hash
+        tables_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            for name, df in tables.items():
+                df.to_parquet(tables_dir / f"{name}.parquet", index=False)
+        except (TypeError, ValueError) as exc:
+            # Parsed-table caching is an optimization; fall back to re-parsing the body.
+            LOGGER.debug("Skipping parsed-table cache for %s: %s", entry.key, exc)
+            shutil.rmtree(tables_root, ignore_errors=True)
+        self._evict(entry.key)
+
+    def _write_meta(self, entry: CachedResponse) -> None:
+        meta = {
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+            "content_hash": entry.content_hash,
+        }
+        _atomic_write(self.root / entry.key / "meta.json", json.dumps(meta).encode("utf-8"))
+
+    def _evict(self, key: str) -> None:
+        with self._lock:
+            if self._sizes is None:
+                self._resync(self._scan())
+            else:
+                size = _entry_size(self.root / key)
+                self._total += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+            if self._total <= self.max_bytes:
+                return
+            # 다른 프로세스도 같은 캐시에 쓰므로 추정치가 한도를 넘겼을 때 디스크 기준으로 다시 센다.
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            kept = []
+            for mtime, size, entry_dir in sorted(entries):
+                if total <= self.max_bytes * EVICT_TO:
+                    kept.append((mtime, size, entry_dir))
+                    continue
+                LOGGER.info("Evicting cache entry %s", entry_dir.name)
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+            self._resync(kept)
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        if not self.root.is_dir():
+            return entries
+        for entry_dir in self.root.iterdir():
+            try:
+                mtime = (entry_dir / "meta.json").stat().st_mtime
+            except OSError:
+                # 쓰는 중이거나 다른 프로세스가 방금 지운 항목은 건너뛴다.
+                continue
+            entries.append((mtime, _entry_size(entry_dir), entry_dir))
+        return entries
+
+    def _resync(self, entries: List[Tuple[float, int, Path]]) -> None:
+        self._sizes = {entry_dir.name: size for _, size, entry_dir in entries}
+        self._total = sum(self._sizes.values())
+
+
+def _entry_size(entry_dir: Path) -> int:
+    total = 0
+    # os.walk는 사라진 하위 디렉터리를 조용히 건너뛴다.
+    for dirpath, _, filenames in os.walk(entry_dir):
+        for filename in filenames:
+            try:
+                total += os.stat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    # 스레드 ID는 프로세스마다 겹칠 수 있으므로 pid와 임의값으로 임시 파일을 구분한다.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
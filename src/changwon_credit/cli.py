@@ -1,58 +1,325 @@
 from __future__ import annotations
 
+import math
+import os
+import threading
+from dataclasses import replace
 from pathlib import Path
+from typing import List
 
 import typer
 from rich.console import Console
+from rich.table import Table
 
-from .analytics import build_credit_story, build_scenarios, compute_credit_metrics
-from .etl import run_pipeline
+from . import query as sql_layer
+from .analytics import compute_credit_metrics
+from .backfill import run_backfill
+from .batch import (
+    build_batch_pipeline,
+    company_jobs,
+    render_result,
+    report_targets,
+    run_company_graph,
+)
+from .etl import refresh_company
 from .models import CreditConfig, load_config
-from .report_md import render_markdown
-from .report_typst import render_typst_report
-from .visuals import build_charts
+from .staged import StageFailure, StagedPipeline
+from .store import compact as compact_store
+from .store import read_processed
+from .stress import STRESS_MEASURES, simulate_stress
+from .universe import run_universe
 
 console = Console()
 app = typer.Typer(help="Changwon corporate credit analysis CLI.", invoke_without_command=True)
 
 
 @app.callback(invoke_without_command=True)
-def main(config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c")) -> None:
+def main(
+    ctx: typer.Context,
+    config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c"),
+    cache_only: bool = typer.Option(
+        False, "--cache-only", help="Serve FnGuide pages from the local cache without network."
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Rebuild tables and reports even if FnGuide has no new data."
+    ),
+) -> None:
     """Fetch FnGuide data, build analytics tables, and create the markdown report."""
 
+    if ctx.invoked_subcommand is not None:
+        return
     cfg = load_config(config)
+    if cache_only:
+        cfg = replace(cfg, cache_mode="only")
     console.print(f"[bold]Fetching financials for {cfg.company_name} ({cfg.company_code})[/bold]")
-    merged = run_pipeline(cfg)
+    run = refresh_company(cfg, force=force)
+    merged = run.merged
 
-    console.print("Computing credit metrics...")
-    credit_df = compute_credit_metrics(merged)
-    story = build_credit_story(credit_df, cfg.company_name)
-    scenarios = build_scenarios(credit_df)
-    figures = build_charts(credit_df, scenarios, cfg)
-
-    report_text = render_markdown(cfg, credit_df, story, scenarios, figures)
-    cfg.report_path.parent.mkdir(parents=True, exist_ok=True)
-    cfg.report_path.write_text(report_text, encoding="utf-8")
+    console.print("Computing credit metrics and rendering reports...")
+    # refresh_company가 이미 update_metrics로 지표를 저장했으므로 warehouse 단계는 돌리지 않는다.
+    graph_run = run_company_graph(
+        cfg, {"merged": merged}, targets=report_targets(cfg), force=force
+    )
+    result = render_result(cfg, graph_run)
+    if not run.changed and not graph_run.rebuilt:
+        console.print(
+            f":information_source: No new fiscal period for {cfg.company_code}; "
+            f"existing report at {cfg.report_path} is current."
+        )
+        return
 
     console.print(f":white_check_mark: Pipeline complete. Report saved to {cfg.report_path}")
 
     if cfg.typst_enabled:
-        typst_path, pdf_path = render_typst_report(
-            cfg,
-            credit_df,
-            story,
-            scenarios,
-            figures,
-            template_path=cfg.typst_template,
-            output_dir=cfg.typst_output_dir,
-            compile_pdf=cfg.typst_compile_pdf,
-        )
-        console.print(f":sparkles: Typst source written to {typst_path}")
-        if pdf_path:
-            console.print(f":page_facing_up: Typst PDF generated at {pdf_path}")
+        console.print(f":sparkles: Typst source written to {result.typst_path}")
+        if result.pdf_path:
+            console.print(f":page_facing_up: Typst PDF generated at {result.pdf_path}")
         elif cfg.typst_compile_pdf:
             console.print(":warning: Typst CLI not found or failed; PDF not generated.")
         else:
             console.print(":information_source: Typst PDF generation disabled via config.")
     else:
         console.print(":information_source: Typst generation disabled via config.")
+
+
+@app.command()
+def batch(
+    codes: List[str] = typer.Argument(..., help="Company codes to refresh."),
+    config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c"),
+    fetch_workers: int = typer.Option(8, help="Concurrent FnGuide downloads."),
+    compute_workers: int = typer.Option(2, help="Workers for tidy/merge/metrics."),
+    render_workers: int = typer.Option(2, help="Workers for charts and reports."),
+    queue_size: int = typer.Option(8, help="Bound of each inter-stage queue."),
+    rate_limit: float = typer.Option(0.0, help="FnGuide requests per second (0 = unlimited)."),
+    budget_rps: float = typer.Option(
+        0.0, help="Start rate of the adaptive request budget (0 = off); cut by 30% on 429s."
+    ),
+    processes: bool = typer.Option(False, "--processes", help="Run the compute stage in processes."),
+    stats_interval: float = typer.Option(0.0, help="Print stage stats every N seconds (0 = off)."),
+    force: bool = typer.Option(False, "--force", help="Ignore the fetch manifest."),
+) -> None:
+    """Refresh many companies through overlapping fetch/compute/persist/render stages."""
+
+    cfg = load_config(config)
+    if budget_rps:
+        cfg = replace(cfg, request_budget_rps=budget_rps)
+    pipeline, manifest = build_batch_pipeline(
+        cfg,
+        fetch_workers=fetch_workers,
+        compute_workers=compute_workers,
+        render_workers=render_workers,
+        queue_size=queue_size,
+        rate_limit=rate_limit or None,
+        compute_processes=processes,
+        force=force,
+    )
+    stop = threading.Event()
+    if stats_interval > 0:
+        threading.Thread(
+            target=_report_stats, args=(pipeline, stats_interval, stop), daemon=True
+        ).start()
+
+    done = failed = 0
+    try:
+        for result in pipeline.run(company_jobs(cfg, codes)):
+            if isinstance(result, StageFailure):
+                failed += 1
+                code = getattr(getattr(result.item, "config", None), "company_code", "?")
+                console.print(f":x: {code} failed in {result.stage}: {result.error}")
+            else:
+                done += 1
+    finally:
+        stop.set()
+        manifest.save()
+        compact_store(cfg.processed_dir)
+
+    console.print(_stats_table(pipeline))
+    skipped = len(codes) - done - failed
+    console.print(f":white_check_mark: {done} refreshed, {skipped} unchanged, {failed} failed.")
+
+
+@app.command()
+def backfill(
+    codes: List[str] = typer.Argument(None, help="Company codes to backfill."),
+    config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c"),
+    codes_file: Path = typer.Option(None, help="File with one company code per line."),
+    chunk_size: int = typer.Option(200, help="Companies fetched and written per chunk."),
+    workers: int = typer.Option(16, help="Concurrent FnGuide downloads."),
+    rate_limit: float = typer.Option(0.0, help="FnGuide requests per second (0 = unlimited)."),
+    restart: bool = typer.Option(False, "--restart", help="Ignore the saved resume state."),
+    csv: bool = typer.Option(True, "--csv/--no-csv", help="Also write data_raw/*_fs_*.csv files."),
+) -> None:
+    """Load every available annual period for many companies into the history store."""
+
+    cfg = load_config(config)
+    universe = _company_codes(cfg, codes, codes_file)
+    summary = run_backfill(
+        cfg,
+        universe,
+        chunk_size=chunk_size,
+        max_workers=workers,
+        rate_limit=rate_limit or None,
+        restart=restart,
+        write_csv=csv,
+    )
+    console.print(
+        f":white_check_mark: {summary.loaded} loaded, {summary.skipped} already done, "
+        f"{summary.failed} failed, {summary.rows} company-years in {summary.elapsed:.1f}s."
+    )
+
+
+@app.command()
+def universe(
+    codes: List[str] = typer.Argument(None, help="Company codes to refresh."),
+    config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c"),
+    codes_file: Path = typer.Option(None, help="File with one company code per line."),
+    workers: int = typer.Option(0, help="Worker processes (0 = one per CPU core)."),
+    restart: bool = typer.Option(False, "--restart", help="Ignore the saved resume state."),
+    force: bool = typer.Option(False, "--force", help="Ignore the fetch manifest."),
+) -> None:
+    """Run the ETL for many companies in a process pool, resuming unfinished runs."""
+
+    cfg = load_config(config)
+    summary = run_universe(
+        cfg,
+        _company_codes(cfg, codes, codes_file),
+        workers=workers or None,
+        restart=restart,
+        force=force,
+    )
+    console.print(
+        f":white_check_mark: {summary.refreshed} refreshed, {summary.unchanged} unchanged, "
+        f"{summary.skipped} already done, {summary.failed} failed in {summary.elapsed:.1f}s."
+    )
+
+
+@app.command()
+def compact(
+    config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c"),
+) -> None:
+    """Fold appended Parquet parts into one file per company-year partition."""
+
+    cfg = load_config(config)
+    partitions = compact_store(cfg.processed_dir)
+    console.print(f":white_check_mark: Compacted {partitions} partitions under {cfg.processed_dir}.")
+
+
+@app.command("query")
+def query_command(
+    sql: str = typer.Argument(..., help="SQL over analytics_credit, credit_profile, fs_* views."),
+    config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c"),
+    output: Path = typer.Option(None, "--output", "-o", help="Write the result to .csv/.parquet."),
+    limit: int = typer.Option(50, help="Rows to print when no --output is given."),
+    sqlite: bool = typer.Option(False, "--sqlite", help="Also attach credit.db as `warehouse`."),
+) -> None:
+    """Run ad-hoc SQL over the processed store with embedded DuckDB."""
+
+    cfg = load_config(config)
+    if output is not None:
+        path = sql_layer.export_query(cfg, sql, output, attach_sqlite=sqlite)
+        console.print(f":white_check_mark: Query result written to {path}")
+        return
+    result = sql_layer.query_arrow(cfg, sql, attach_sqlite=sqlite)
+    table = Table(title=f"{result.num_rows} rows")
+    for name in result.column_names:
+        table.add_column(name)
+    for row in result.slice(0, limit).to_pylist():
+        table.add_row(*(_format_cell(value) for value in row.values()))
+    console.print(table)
+
+
+@app.command("stress")
+def stress_command(
+    codes: List[str] = typer.Argument(None, help="Company codes to stress."),
+    config: Path = typer.Option(Path("config/config.yaml"), "--config", "-c"),
+    codes_file: Path = typer.Option(None, help="File with one company code per line."),
+    paths: int = typer.Option(100_000, help="Monte Carlo paths per company."),
+    seed: int = typer.Option(0, help="Random seed; the same seed reproduces the run."),
+    workers: int = typer.Option(1, help="Worker processes (0 = one per CPU core)."),
+    output: Path = typer.Option(None, "--output", "-o", help="Write percentiles to .csv/.parquet."),
+) -> None:
+    """Monte Carlo DSCR, coverage and PD distributions from the stored statement history."""
+
+    cfg = load_config(config)
+    history = read_processed(
+        cfg.processed_dir, "credit_profile", company_codes=_company_codes(cfg, codes, codes_file)
+    )
+    if history.empty:
+        console.print(f"[red]No processed statements under {cfg.processed_dir}; run the ETL first.[/red]")
+        raise typer.Exit(1)
+    result = simulate_stress(
+        compute_credit_metrics(history), paths=paths, seed=seed, workers=workers or os.cpu_count() or 1
+    )
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        frame = result.percentiles.merge(result.breach_probability.reset_index(), on="company_code")
+        if output.suffix.lower() == ".parquet":
+            frame.to_parquet(output, index=False)
+        else:
+            frame.to_csv(output, index=False)
+        console.print(f":white_check_mark: Stress percentiles written to {output}")
+    table = Table(title=f"{result.paths:,} paths, seed {result.seed}")
+    for column in ("company", "DSCR p5", "DSCR p50", "ICR p5", "PD p50", "PD p95", "DSCR<1.5x"):
+        table.add_column(column, justify="left" if column == "company" else "right")
+    by_code = result.percentiles.set_index(["company_code", "measure"])
+    for code, breach in result.breach_probability.items():
+        dscr, coverage, pd_estimate = (by_code.loc[(code, name)] for name in STRESS_MEASURES)
+        table.add_row(
+            str(code),
+            _format_cell(dscr.get("p5")),
+            _format_cell(dscr.get("p50")),
+            _format_cell(coverage.get("p5")),
+            _format_pct(pd_estimate.get("p50")),
+            _format_pct(pd_estimate.get("p95")),
+            _format_pct(breach),
+        )
+    console.print(table)
+
+
+def _company_codes(cfg: CreditConfig, codes: List[str] | None, codes_file: Path | None) -> List[str]:
+    universe = list(codes or [])
+    if codes_file is not None:
+        universe += [
+            line.strip() for line in codes_file.read_text(encoding="utf-8").splitlines() if line.strip()
+        ]
+    return universe or [cfg.company_code]
+
+
+def _format_cell(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:,.4g}"
+    return "" if value is None else str(value)
+
+
+def _format_pct(value: float | None) -> str:
+    if value is None:
+        return ""
+    return "n/a" if math.isnan(value) else f"{value:.1%}"
+
+
+def _report_stats(pipeline: StagedPipeline, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        console.print(
+            "  ".join(
+                f"{stats.name}: q={stats.depth}/{stats.queue_size} done={stats.processed}"
+                for stats in pipeline.stats()
+            )
+        )
+
+
+def _stats_table(pipeline: StagedPipeline) -> Table:
+    table = Table(title="Stage statistics")
+    for column in ("stage", "workers", "done", "dropped", "failed", "max queue", "items/s", "busy"):
+        table.add_column(column, justify="right" if column != "stage" else "left")
+    for stats in pipeline.stats():
+        table.add_row(
+            stats.name,
+            str(stats.workers),
+            str(stats.processed),
+            str(stats.dropped),
+            str(stats.failed),
+            f"{stats.max_depth}/{stats.queue_size}",
+            f"{stats.throughput:.1f}",
+            f"{stats.utilization:.0%}",
+        )
+    return table
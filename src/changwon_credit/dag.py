@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+
+import pandas as pd
+
+from .artifacts import ArtifactManifest, hash_inputs
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Node:
+    """One stage of a :class:`StageGraph`.
+
+    ``func`` is called with the values named in ``inputs`` as keyword
+    arguments (other nodes or run seeds) and must return an ``output``
+    instance. ``sources`` are files the stage's behaviour depends on, such as
+    its module or a template; ``writes`` maps the result to the files the
+    stage produced.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    output: type = object
+    sources: Tuple[Path, ...] = ()
+    writes: Callable[[Any], Sequence[Path]] | None = None
+
+
+@dataclass(slots=True)
+class GraphRun:
+    values: Dict[str, Any]
+    rebuilt: List[str] = field(default_factory=list)
+
+
+class StageGraph:
+    """Declared DAG of stages with cached intermediate results.
+
+    A node's cache key hashes its sources and the content digests of its
+    inputs, and every run records the digest of the node's own result, so a
+    change reruns only the nodes downstream of it. A node that reruns but
+    produces the same result as before (e.g. after a cosmetic code edit)
+    stops the invalidation there. Frame results are cached as Parquet under
+    ``cache_dir`` and loaded only when a downstream node actually reruns.
+    Nodes whose inputs are ready run in parallel on a thread pool.
+    """
+
+    def __init__(self, nodes: Sequence[Node]) -> None:
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate stage {node.name!r}")
+            self.nodes[node.name] = node
+        self.order = self._toposort()
+
+    def leaves(self) -> List[str]:
+        consumed = {name for node in self.nodes.values() for name in node.inputs}
+        return [name for name in self.order if name not in consumed]
+
+    def run(
+        self,
+        seeds: Mapping[str, Any],
+        *,
+        manifest: ArtifactManifest,
+        cache_dir: Path,
+        key_prefix: str = "",
+        targets: Sequence[str] | None = None,
+        force: bool = False,
+        max_workers: int = 4,
+    ) -> GraphRun:
+        """Bring ``targets`` (default: the leaves) up to date and return their values.
+
+        ``seeds`` supply graph inputs and may also stand in for nodes, whose
+        upstream stages are then not run. The caller saves ``manifest``.
+        """
+
+        targets = list(targets or self.leaves())
+        needed = self._needed(targets, seeds)
+        missing = sorted(
+            {
+                name
+                for stage in needed
+                for name in self.nodes[stage].inputs
+                if name not in self.nodes and name not in seeds
+            }
+        )
+        if missing:
+            raise ValueError(f"Missing graph inputs: {', '.join(missing)}")
+
+        values: Dict[str, Any] = dict(seeds)
+        digests = {name: hash_inputs(value) for name, value in seeds.items()}
+        pending = [name for name in self.order if name in needed]
+        running: Dict[Future, Tuple[str, str]] = {}
+        rebuilt: List[str] = []
+
+        def load(name: str) -> Any:
+            if name not in values:
+                values[name] = self._cached_value(name, manifest, cache_dir, key_prefix)
+            return values[name]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                ready = [name for name in pending if all(i in digests for i in self.nodes[name].inputs)]
+                for name in ready:
+                    pending.remove(name)
+                    node = self.nodes[name]
+                    key = f"{key_prefix}{name}"
+                    inputs = hash_inputs(name, *node.sources, *(digests[i] for i in node.inputs))
+                    record = manifest.entries.get(key)
+                    if not force and record is not None and record.digest and manifest.is_current(key, inputs):
+                        LOGGER.debug("Skipping %s; inputs unchanged", key)
+                        digests[name] = record.digest
+                        continue
+                    kwargs = {i: load(i) for i in node.inputs}
+                    running[pool.submit(node.func, **kwargs)] = (name, inputs)
+                if ready and not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, inputs = running.pop(future)
+                    value = future.result()
+                    digests[name] = self._record(name, value, inputs, manifest, cache_dir, key_prefix)
+                    values[name] = value
+                    rebuilt.append(name)
+
+        return GraphRun(values={name: load(name) for name in targets}, rebuilt=rebuilt)
+
+    def _record(
+        self,
+        name: str,
+        value: Any,
+        inputs: str,
+        manifest: ArtifactManifest,
+        cache_dir: Path,
+        key_prefix: str,
+    ) -> str:
+        node = self.nodes[name]
+        if not isinstance(value, node.output):
+            raise TypeError(
+                f"Stage {name!r} returned {type(value).__name__}, expected {node.output.__name__}"
+            )
+        key = f"{key_prefix}{name}"
+        outputs = list(node.writes(value)) if node.writes else []
+        result = value
+        if isinstance(value, pd.DataFrame):
+            path = _frame_path(cache_dir, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            value.to_parquet(path, index=False)
+            outputs.append(path)
+            result = None
+        elif is_dataclass(value):
+            result = asdict(value)
+        # 산출 파일 내용까지 요약해 차트 PNG가 바뀌면 PDF처럼 그 파일을 쓰는 단계도 다시 돈다.
+        digest = hash_inputs(value, *(Path(path) for path in outputs))
+        manifest.record(key, inputs, outputs, result, digest)
+        return digest
+
+    def _cached_value(
+        self, name: str, manifest: ArtifactManifest, cache_dir: Path, key_prefix: str
+    ) -> Any:
+        node = self.nodes[name]
+        key = f"{key_prefix}{name}"
+        if issubclass(node.output, pd.DataFrame):
+            return pd.read_parquet(_frame_path(cache_dir, key))
+        result = manifest.entries[key].result
+        if is_dataclass(node.output):
+            return node.output(**result)
+        return result
+
+    def _needed(self, targets: Sequence[str], seeds: Mapping[str, Any]) -> set[str]:
+        needed: set[str] = set()
+        stack = [name for name in targets if name not in seeds]
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.nodes:
+                raise KeyError(f"Unknown stage {name!r}")
+            needed.add(name)
+            stack.extend(i for i in self.nodes[name].inputs if i in self.nodes and i not in seeds)
+        return needed
+
+    def _toposort(self) -> List[str]:
+        order: List[str] = []
+        visiting: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order or name not in self.nodes:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage graph has a cycle through {name!r}")
+            visiting.add(name)
+            for dependency in self.nodes[name].inputs:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+
+def _frame_path(cache_dir: Path, key: str) -> Path:
+    return Path(cache_dir) / f"{key.replace(':', '-')}.parquet"
@@ -13,8 +13,8 @@ from dash import Dash, Input, Output, dcc, html
 from .glossary import GLOSSARY
 from .models import CreditConfig, load_config
 from .visuals import _coverage_chart, _performance_chart, _risk_chart, _scenario_chart
-from .etl import run_pipeline
-from .analytics import compute_credit_metrics, build_scenarios
+from .analytics import build_scenarios
+from .warehouse import load_metrics
 
 
 def create_app(metrics: pd.DataFrame, scenarios: pd.DataFrame, config: CreditConfig) -> Dash:
@@ -127,6 +127,22 @@ def _parse_args() -> argparse.Namespace:
         default=int(os.environ.get("PORT_MAX", "8100")),
         help="If the preferred port is busy, keep trying sequential ports up to this value.",
     )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=Path("config/config.yaml"),
+        help="Config file (default: config/config.yaml).",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Fetch FnGuide and rerun the ETL before serving (default: read the local warehouse).",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory-map the processed Parquet files instead of reading them.",
+    )
     parser.add_argument(
         "--no-debug",
         action="store_true",
@@ -151,10 +167,8 @@ def _pick_available_port(host: str, start_port: int, max_port: int) -> int:
 
 def main() -> None:
     args = _parse_args()
-    config_path = Path("config/config.yaml")
-    cfg = load_config(config_path)
-    merged = run_pipeline(cfg)
-    metrics = compute_credit_metrics(merged)
+    cfg = load_config(args.config)
+    metrics = load_metrics(cfg, refresh=args.refresh, memory_map=args.mmap)
     scenarios = build_scenarios(metrics)
     app = create_app(metrics, scenarios, cfg)
     host = args.host
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+import yaml
+
+LOGGER = logging.getLogger(__name__)
+
+# 패키지 데이터로 함께 배포되므로 설치본에서도 작업 디렉터리와 무관하게 읽힌다.
+SCHEMA_RESOURCE = "schema/tables.schema.yaml"
+
+# WAL에서는 읽기와 쓰기가 서로를 막지 않는다. NORMAL 동기화는 WAL에서 커밋 단위 내구성을 유지한다.
+WRITER_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64_000,  # KiB 단위(음수) → 약 64MB 페이지 캐시
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 30_000,  # 유니버스 실행 시 여러 프로세스가 쓰기 잠금을 순서대로 기다린다
+}
+READER_PRAGMAS = {
+    "cache_size": -16_000,
+    "mmap_size": 256 * 1024 * 1024,
+    "busy_timeout": 5_000,
+}
+
+
+_DEFAULT_DTYPES = {"REAL": "float64", "INTEGER": "int64"}
+
+
+@dataclass(slots=True)
+class ColumnSpec:
+    name: str
+    type: str = "REAL"
+    unit: str | None = None
+    dtype: str | None = None
+
+    def pandas_dtype(self, float32_ratios: bool = False) -> str | None:
+        if float32_ratios and self.unit == "ratio":
+            return "float32"
+        return self.dtype or _DEFAULT_DTYPES.get(self.type)
+
+
+@dataclass(slots=True)
+class TableSpec:
+    """One table of the packaged ``schema/tables.schema.yaml``."""
+
+    name: str
+    columns: List[ColumnSpec]
+    primary_key: List[str]
+    indexes: List[List[str]] = field(default_factory=list)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column.name for column in self.columns]
+
+    def dtypes(self, float32_ratios: bool = False) -> Dict[str, str]:
+        """Declared pandas dtype per column (TEXT columns without ``dtype`` are left alone)."""
+
+        declared = {column.name: column.pandas_dtype(float32_ratios) for column in self.columns}
+        return {name: dtype for name, dtype in declared.items() if dtype is not None}
+
+    def ddl(self) -> List[str]:
+        """CREATE TABLE/INDEX statements, all ``IF NOT EXISTS``."""
+
+        columns = ",\n  ".join(f'"{column.name}" {column.type}' for column in self.columns)
+        key = ", ".join(f'"{name}"' for name in self.primary_key)
+        statements = [
+            f'CREATE TABLE IF NOT EXISTS "{self.name}" (\n  {columns},\n  PRIMARY KEY ({key})\n)'
+        ]
+        for index in self.index_columns():
+            quoted = ", ".join(f'"{name}"' for name in index)
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "idx_{self.name}_{"_".join(index)}" '
+                f'ON "{self.name}" ({quoted})'
+            )
+        return statements
+
+    def index_columns(self) -> List[List[str]]:
+        """Declared indexes plus ``(company_code, year)`` unless the key already leads with it."""
+
+        indexes = [list(index) for index in self.indexes]
+        wanted = ["company_code", "year"]
+        names = self.column_names
+        if all(name in names for name in wanted) and self.primary_key[:2] != wanted:
+            indexes.insert(0, wanted)
+        return indexes
+
+    def upsert_sql(self, columns: List[str]) -> str:
+        quoted = ", ".join(f'"{name}"' for name in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        key = ", ".join(f'"{name}"' for name in self.primary_key)
+        updates = [name for name in columns if name not in self.primary_key]
+        if not updates:
+            conflict = "DO NOTHING"
+        else:
+            conflict = "DO UPDATE SET " + ", ".join(f'"{name}" = excluded."{name}"' for name in updates)
+        return (
+            f'INSERT INTO "{self.name}" ({quoted}) VALUES ({placeholders}) '
+            f"ON CONFLICT ({key}) {conflict}"
+        )
+
+
+def load_schema(path: Path | None = None) -> Dict[str, TableSpec]:
+    """Parse ``path``, or the schema shipped with the package when omitted."""
+
+    if path is None:
+        return _load_schema(None)
+    return _load_schema(Path(path).resolve())
+
+
+@lru_cache(maxsize=4)
+def _load_schema(path: Path | None) -> Dict[str, TableSpec]:
+    if path is None:
+        text = resources.files("changwon_credit").joinpath(SCHEMA_RESOURCE).read_text(encoding="utf-8")
+    else:
+        text = path.read_text(encoding="utf-8")
+    raw = yaml.safe_load(text)
+    tables = {}
+    for name, spec in raw.get("tables", {}).items():
+        key = spec["primary_key"]
+        tables[name] = TableSpec(
+            name=name,
+            columns=[ColumnSpec(**column) for column in spec["columns"]],
+            primary_key=[key] if isinstance(key, str) else list(key),
+            indexes=[[index] if isinstance(index, str) else list(index) for index in spec.get("indexes", [])],
+        )
+    return tables
+
+
+def ensure_tables(conn: sqlite3.Connection, tables: List[TableSpec]) -> None:
+    """Create missing tables/indexes and migrate tables written by ``to_sql``.
+
+    Earlier releases replaced each table with ``DataFrame.to_sql``, which
+    leaves no primary key behind. Such a table is rebuilt under the declared
+    key, keeping the last row per key; declared columns missing from an
+    existing keyed table are added with ``ALTER TABLE``.
+    """
+
+    for spec in tables:
+        info = conn.execute(f'PRAGMA table_info("{spec.name}")').fetchall()
+        if info and not any(row[5] for row in info):
+            _rebuild_keyed(conn, spec, [row[1] for row in info])
+        elif info:
+            existing = {row[1] for row in info}
+            for column in spec.columns:
+                if column.name not in existing:
+                    conn.execute(f'ALTER TABLE "{spec.name}" ADD COLUMN "{column.name}" {column.type}')
+        for statement in spec.ddl():
+            conn.execute(statement)
+
+
+def enforce_dtypes(
+    frame: pd.DataFrame, spec: TableSpec, *, float32_ratios: bool = False
+) -> pd.DataFrame:
+    """Cast the columns of ``frame`` that ``spec`` declares to their compact dtypes."""
+
+    casts = {
+        name: dtype
+        for name, dtype in spec.dtypes(float32_ratios).items()
+        if name in frame.columns and str(frame[name].dtype) != dtype
+    }
+    return frame.astype(casts) if casts else frame
+
+
+def validate_dtypes(frame: pd.DataFrame, spec: TableSpec) -> None:
+    """Reject frames whose columns cannot be stored as ``spec`` declares.
+
+    Compact and wide dtypes are both accepted (float32 or float64, int16 or
+    int64); what fails is a kind mismatch – text in a REAL column, a numeric
+    company code that has lost its leading zeros, or a year outside the
+    declared integer range.
+    """
+
+    problems = []
+    for column in spec.columns:
+        if column.name not in frame.columns:
+            continue
+        series = frame[column.name]
+        if column.type == "REAL" and not pd.api.types.is_numeric_dtype(series):
+            problems.append(f"{column.name} is {series.dtype}, expected numeric")
+        elif column.type == "INTEGER" and not pd.api.types.is_integer_dtype(series):
+            problems.append(f"{column.name} is {series.dtype}, expected integer")
+        elif column.type == "TEXT" and pd.api.types.is_numeric_dtype(series):
+            problems.append(f"{column.name} is {series.dtype}, expected text")
+        elif column.type == "INTEGER" and column.dtype and not series.empty:
+            bounds = np.iinfo(column.dtype)
+            if series.min() < bounds.min or series.max() > bounds.max:
+                problems.append(f"{column.name} does not fit {column.dtype}")
+    if problems:
+        raise ValueError(f"{spec.name}: " + "; ".join(problems))
+
+
+def upsert_frame(conn: sqlite3.Connection, spec: TableSpec, frame: pd.DataFrame) -> int:
+    """``INSERT ... ON CONFLICT DO UPDATE`` every row of ``frame`` with one ``executemany``."""
+
+    validate_dtypes(frame, spec)
+    columns = [name for name in spec.column_names if name in frame.columns]
+    missing_key = [name for name in spec.primary_key if name not in columns]
+    if missing_key:
+        raise ValueError(f"{spec.name} rows lack primary key column(s) {missing_key}.")
+    extra = [name for name in frame.columns if name not in spec.column_names]
+    if extra:
+        LOGGER.debug("Ignoring columns not declared for %s: %s", spec.name, extra)
+    if frame.empty:
+        return 0
+    conn.executemany(spec.upsert_sql(columns), _rows(frame[columns]))
+    return len(frame)
+
+
+def write_tables(
+    sqlite_path: Path,
+    frames: Mapping[str, pd.DataFrame],
+    schema: Mapping[str, TableSpec] | None = None,
+) -> Dict[str, int]:
+    """Upsert several frames into their schema tables inside one transaction."""
+
+    schema = schema or load_schema()
+    unknown = [name for name in frames if name not in schema]
+    if unknown:
+        raise KeyError(f"Tables not declared in the schema: {unknown}")
+    conn = connect_writer(sqlite_path)
+    try:
+        with conn:
+            # Take the write lock up front so concurrent writers queue instead of failing on upgrade.
+            conn.execute("BEGIN IMMEDIATE")
+            ensure_tables(conn, [schema[name] for name in frames])
+            return {name: upsert_frame(conn, schema[name], frame) for name, frame in frames.items()}
+    finally:
+        conn.close()
+
+
+def connect_writer(sqlite_path: Path) -> sqlite3.Connection:
+    """Open the (single) writer connection with WAL journaling and tuned pragmas."""
+
+    sqlite_path = Path(sqlite_path)
+    sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(sqlite_path)
+    _apply_pragmas(conn, WRITER_PRAGMAS)
+    return conn
+
+
+class ReadPool:
+    """Small pool of read-only connections to ``credit.db`` for the dashboards.
+
+    Connections are opened lazily with ``mode=ro`` and handed out one
+    thread at a time. Because the writer uses WAL, readers keep seeing the
+    last committed snapshot while an ETL transaction is in flight instead of
+    waiting for it.
+    """
+
+    def __init__(self, sqlite_path: Path, size: int = 4) -> None:
+        self.sqlite_path = Path(sqlite_path)
+        self.size = size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def read_frame(self, sql: str, params: Sequence | Mapping | None = None) -> pd.DataFrame:
+        with self.connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _open(self) -> sqlite3.Connection:
+        if not self.sqlite_path.exists():
+            raise FileNotFoundError(f"SQLite warehouse not found: {self.sqlite_path}")
+        conn = sqlite3.connect(
+            f"{self.sqlite_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        _apply_pragmas(conn, READER_PRAGMAS)
+        return conn
+
+
+@lru_cache(maxsize=None)
+def shared_read_pool(sqlite_path: Path, size: int = 4) -> ReadPool:
+    """Process-wide :class:`ReadPool` per database, for long-lived UI processes."""
+
+    return ReadPool(Path(sqlite_path), size=size)
+
+
+def _apply_pragmas(conn: sqlite3.Connection, pragmas: Mapping[str, object]) -> None:
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def _rows(frame: pd.DataFrame) -> List[tuple]:
+    # Convert NumPy scalars and NaN to plain Python values sqlite3 can bind.
+    data = frame.astype(object).where(frame.notna(), None)
+    return [
+        tuple(value.item() if isinstance(value, np.generic) else value for value in row)
+        for row in data.itertuples(index=False, name=None)
+    ]
+
+
+def _rebuild_keyed(conn: sqlite3.Connection, spec: TableSpec, existing: List[str]) -> None:
+    LOGGER.info("Migrating %s to its declared primary key %s", spec.name, spec.primary_key)
+    legacy = f"{spec.name}__legacy"
+    conn.execute(f'ALTER TABLE "{spec.name}" RENAME TO "{legacy}"')
+    conn.execute(spec.ddl()[0])
+    shared = [name for name in spec.column_names if name in existing]
+    if all(name in shared for name in spec.primary_key):
+        quoted = ", ".join(f'"{name}"' for name in shared)
+        conn.execute(
+            f'INSERT OR REPLACE INTO "{spec.name}" ({quoted}) SELECT {quoted} FROM "{legacy}" ORDER BY rowid'
+        )
+    conn.execute(f'DROP TABLE "{legacy}"')
@@ -1,29 +1,184 @@
 from __future__ import annotations
 
-import sqlite3
+import logging
 from pathlib import Path
 from typing import Dict
 
+import numpy as np
 import pandas as pd
 
-from .loader import fetch_statements
-from .models import CreditConfig, FinancialStatements
+from .analytics import STATE_COLUMNS, compute_credit_metrics, extend_credit_metrics, metric_state
+from .cache import ResponseCache
+from .db import enforce_dtypes, load_schema, write_tables
+from .kernel import INPUT_COLUMNS
+from .loader import (
+    STATEMENT_METRICS,
+    fetch_raw_tables,
+    tidy_quarterly_statements,
+    tidy_statements,
+)
+from .manifest import FetchManifest, build_entry
+from .models import CreditConfig, FinancialStatements, PipelineRun
+from .quarterly import PERIOD_KEYS, compute_ttm_metrics
+from .resilience import Resilience
+from .snapshots import SnapshotStore
+from .store import append_partitions, read_processed
 
+LOGGER = logging.getLogger(__name__)
 
-def run_pipeline(config: CreditConfig) -> pd.DataFrame:
-    raw_tables, statements = fetch_statements(config.company_code, config.years)
+MANIFEST_NAME = "fetch_manifest.json"
+QUARTERLY_NAME = "fs_quarterly"
+TTM_METRICS_NAME = "credit_ttm"
+
+
+def run_pipeline(config: CreditConfig, *, force: bool = False) -> pd.DataFrame:
+    return refresh_company(config, force=force).merged
+
+
+def refresh_company(
+    config: CreditConfig,
+    *,
+    force: bool = False,
+    manifest: FetchManifest | None = None,
+    update_quarterly: bool = True,
+) -> PipelineRun:
+    """Fetch one company and rebuild its processed tables only when FnGuide changed.
+
+    The fetch manifest remembers each company's annual periods and statement
+    hashes; when both match and the processed store already holds the
+    company, the stored merged frame is returned with ``changed=False`` and
+    tidy/merge/persist are skipped. ``force`` rebuilds regardless. Otherwise
+    the statements are persisted and :func:`update_metrics` writes the
+    credit metrics of the new years. A caller passing its own ``manifest``
+    also owns saving it.
+
+    With ``config.frequency == "quarterly"`` the quarterly tabs are fetched
+    too and :func:`refresh_quarterly` updates the quarterly/TTM store, unless
+    ``update_quarterly`` is off (the raw tables are then returned for the
+    caller to fold in).
+    """
+
+    quarterly = config.frequency == "quarterly"
+    raw_tables = fetch_raw_tables(
+        config.company_code,
+        cache=ResponseCache.from_config(config),
+        base_url=config.fnguide_url,
+        quarterly=quarterly,
+        resilience=Resilience.from_config(config),
+    )
+    owns_manifest = manifest is None
+    if manifest is None:
+        manifest = FetchManifest.load(config.processed_dir / MANIFEST_NAME)
+    entry = build_entry(raw_tables)
+    if not force and manifest.is_unchanged(config.company_code, entry):
+        annual_periods = [period for period in entry.periods if not period.startswith("Q:")]
+        merged = _load_processed_merged(config, expected_years=min(config.years, len(annual_periods)))
+        if merged is not None:
+            LOGGER.info("No new fiscal period for %s; reusing processed tables", config.company_code)
+            return PipelineRun(merged=merged, changed=False)
+
+    statements = tidy_statements(raw_tables, config.years)
     _write_raw_tables(raw_tables, config)
     merged = merge_statements(statements, config.company_code)
+    # 정정 여부를 비교하려면 새 재무제표를 적재하기 전의 이력을 먼저 읽어 둔다.
+    history = read_processed(config.processed_dir, "credit_profile", company_codes=[config.company_code])
     persist_processed(statements, merged, config)
-    return merged
+    update_metrics(merged, config, history=history, force=force)
+    if quarterly and update_quarterly:
+        refresh_quarterly(raw_tables, config, force=force)
+    manifest.record(config.company_code, entry)
+    if owns_manifest:
+        manifest.save()
+    return PipelineRun(merged=merged, changed=True, raw_tables=raw_tables)
+
+
+def refresh_quarterly(
+    raw_tables: Dict[str, pd.DataFrame], config: CreditConfig, *, force: bool = False
+) -> pd.DataFrame:
+    """Fold freshly fetched quarters into the quarterly store and extend TTM metrics.
+
+    FnGuide only shows the latest handful of quarters, so the fetched
+    quarters are appended to the partitioned ``fs_quarterly`` dataset
+    (replacing restated ones, keyed by ``quarter``) and TTM metrics are
+    computed only for periods not yet in ``credit_ttm``. Both are upserted
+    into SQLite (``financials_quarterly``, ``analytics_credit_ttm``).
+    Returns the company's full TTM history.
+    """
+
+    code = config.company_code
+    statements = tidy_quarterly_statements(raw_tables, config.quarters)
+    fresh = merge_statements(statements, code)
+    stored = read_processed(config.processed_dir, QUARTERLY_NAME, company_codes=[code])
+    overlap = fresh.merge(stored, on=PERIOD_KEYS, how="inner", suffixes=("", "_stored"))
+    # 저장본에 없는 계정(스키마 확장 등)은 정정 여부를 판단할 수 없으므로 양쪽에 있는 열만 비교한다.
+    values = [
+        column for column in fresh.columns if column not in PERIOD_KEYS and column in stored.columns
+    ]
+    restated = not np.allclose(
+        overlap[values].to_numpy(dtype=float),
+        overlap[[f"{column}_stored" for column in values]].to_numpy(dtype=float),
+        equal_nan=True,
+    )
+
+    kept = stored.merge(fresh[PERIOD_KEYS], on=PERIOD_KEYS, how="left", indicator=True)
+    kept = kept[kept["_merge"] == "left_only"].drop(columns="_merge")
+    own = pd.concat([kept, fresh], ignore_index=True) if not kept.empty else fresh
+    own = own.sort_values(PERIOD_KEYS).reset_index(drop=True)
+
+    previous = read_processed(config.processed_dir, TTM_METRICS_NAME, company_codes=[code])
+    if force or restated:
+        # 과거 분기 수치가 정정되면 이후 TTM 4개 분기가 모두 바뀌므로 회사 이력을 다시 계산한다.
+        LOGGER.info("Recomputing the full TTM history for %s", code)
+        previous = None
+    ttm_metrics = compute_ttm_metrics(own, previous)
+    added = ttm_metrics
+    if previous is not None and not previous.empty:
+        added = ttm_metrics.merge(previous[PERIOD_KEYS], on=PERIOD_KEYS, how="left", indicator=True)
+        added = added[added["_merge"] == "left_only"].drop(columns="_merge")
+
+    append_partitions(config.processed_dir, QUARTERLY_NAME, fresh)
+    append_partitions(config.processed_dir, TTM_METRICS_NAME, added)
+    spec = load_schema()["analytics_credit_ttm"]
+    write_tables(
+        config.sqlite_path,
+        {
+            "financials_quarterly": fresh,
+            "analytics_credit_ttm": enforce_dtypes(
+                added.reindex(columns=spec.column_names), spec, float32_ratios=config.float32_ratios
+            ),
+        },
+    )
+    return ttm_metrics
 
 
 def merge_statements(statements: FinancialStatements, company_code: str) -> pd.DataFrame:
-    merged = statements.income.merge(statements.balance, on="year", how="outer")
-    merged = merged.merge(statements.cashflow, on="year", how="outer")
-    merged = merged.sort_values("year").reset_index(drop=True)
+    keys = ["year", "quarter"] if "quarter" in statements.income.columns else ["year"]
+    merged = statements.income.merge(statements.balance, on=keys, how="outer")
+    merged = merged.merge(statements.cashflow, on=keys, how="outer")
+    merged = merged.sort_values(keys).reset_index(drop=True)
     merged.insert(0, "company_code", company_code)
-    return merged
+    table = "financials_quarterly" if "quarter" in keys else "credit_profile"
+    return enforce_dtypes(merged, load_schema()[table])
+
+
+def pivot_statements(long: pd.DataFrame) -> pd.DataFrame:
+    """Widen :func:`~changwon_credit.loader.normalize_statements` output.
+
+    The result has one row per (company_code, year) and the same columns as
+    :func:`merge_statements`, so it feeds ``compute_credit_metrics`` directly.
+    """
+
+    wide = long.pivot(index=["company_code", "year"], columns="metric", values="value")
+    ordered = [
+        metric
+        for metric_map in STATEMENT_METRICS.values()
+        for metric in metric_map.values()
+        if metric in wide.columns
+    ]
+    wide = wide[ordered].reset_index()
+    wide.columns.name = None
+    wide = wide.sort_values(["company_code", "year"]).reset_index(drop=True)
+    return enforce_dtypes(wide, load_schema()["credit_profile"])
 
 
 def persist_processed(
@@ -32,44 +187,120 @@ def persist_processed(
     config.processed_dir.mkdir(parents=True, exist_ok=True)
     config.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
 
-    statements.income.to_parquet(config.processed_dir / "fs_income.parquet", index=False)
-    statements.balance.to_parquet(
-        config.processed_dir / "fs_balance.parquet", index=False
+    code = config.company_code
+    for name, frame in (
+        ("fs_income", statements.income.assign(company_code=code)),
+        ("fs_balance", statements.balance.assign(company_code=code)),
+        ("fs_cashflow", statements.cashflow.assign(company_code=code)),
+        ("credit_profile", analytics_df),
+    ):
+        append_partitions(config.processed_dir, name, frame)
+
+    # 회사별 행만 upsert하므로 다른 회사의 적재분은 그대로 남는다.
+    write_tables(
+        config.sqlite_path,
+        {
+            "companies": pd.DataFrame(
+                [
+                    {
+                        "company_code": code,
+                        "company_name": config.company_name,
+                        "industry": config.industry,
+                    }
+                ]
+            ),
+            "financials_income": statements.income.assign(company_code=code),
+            "financials_balance": statements.balance.assign(company_code=code),
+            "financials_cashflow": statements.cashflow.assign(company_code=code),
+            "credit_profile": analytics_df,
+        },
+    )
+
+
+def persist_metrics(metrics: pd.DataFrame, config: CreditConfig) -> None:
+    """Store credit metrics as the ``analytics_credit`` dataset and SQLite table.
+
+    Pipelines go through :func:`update_metrics`, which decides which rows to write.
+    """
+
+    spec = load_schema()["analytics_credit"]
+    frame = enforce_dtypes(
+        metrics.reindex(columns=spec.column_names), spec, float32_ratios=config.float32_ratios
     )
-    statements.cashflow.to_parquet(
-        config.processed_dir / "fs_cashflow.parquet", index=False
+    append_partitions(config.processed_dir, "analytics_credit", frame)
+    write_tables(config.sqlite_path, {"analytics_credit": frame})
+
+
+def update_metrics(
+    merged: pd.DataFrame,
+    config: CreditConfig,
+    *,
+    history: pd.DataFrame | None = None,
+    force: bool = False,
+) -> pd.DataFrame:
+    """Compute and persist annual metrics only for the years ``merged`` appends.
+
+    The running state (cumulative earnings and the prior year's statement
+    values, see :func:`~changwon_credit.analytics.metric_state`) is rebuilt
+    from the stored ``analytics_credit`` and ``credit_profile`` rows of the
+    company, and only the new rows are computed and written. ``history`` is
+    the stored ``credit_profile`` as it was before ``merged`` was persisted
+    (read here when omitted). When a stored year was restated, there is no
+    stored state, or ``force`` is set, the full history is recomputed and
+    rewritten. Returns the rows written.
+    """
+
+    code = config.company_code
+    # 일부 계정이 없는 FnGuide 페이지도 적재는 계속되도록 빠진 재무제표 열은 NaN 지표로 남긴다.
+    merged = merged.assign(**{name: np.nan for name in INPUT_COLUMNS if name not in merged.columns})
+    if history is None:
+        history = read_processed(config.processed_dir, "credit_profile", company_codes=[code])
+    stored = read_processed(
+        config.processed_dir,
+        "analytics_credit",
+        company_codes=[code],
+        columns=["company_code", "year", "retained_earnings_proxy"],
     )
-    analytics_df.to_parquet(
-        config.processed_dir / "credit_profile.parquet", index=False
+    overlap = merged.merge(history, on=["company_code", "year"], how="inner", suffixes=("", "_stored"))
+    values = [column for column in STATE_COLUMNS if column in history.columns]
+    restated = not np.allclose(
+        overlap[values].to_numpy(dtype=float),
+        overlap[[f"{column}_stored" for column in values]].to_numpy(dtype=float),
+        equal_nan=True,
     )
+    if force or restated or stored.empty or len(values) < len(STATE_COLUMNS):
+        # 과거 연도가 정정되면 이후 누적이익·성장률이 모두 바뀌므로 저장 이력 전체를 다시 계산한다.
+        LOGGER.info("Recomputing the full metric history for %s", code)
+        kept = history[~history["year"].isin(merged["year"])]
+        if not kept.empty:
+            merged = pd.concat([kept, merged], ignore_index=True)
+        metrics = compute_credit_metrics(merged)
+    else:
+        state = metric_state(stored.merge(history, on=["company_code", "year"], how="inner"))
+        metrics = extend_credit_metrics(merged, state)
+        LOGGER.info("Computed %d new metric years for %s", len(metrics), code)
+    if not metrics.empty:
+        persist_metrics(metrics, config)
+    return metrics
+
 
-    with sqlite3.connect(config.sqlite_path) as conn:
-        analytics_df.to_sql("analytics_credit", conn, if_exists="replace", index=False)
-        statements.income.assign(company_code=config.company_code).to_sql(
-            "financials_income", conn, if_exists="replace", index=False
-        )
-        statements.balance.assign(company_code=config.company_code).to_sql(
-            "financials_balance", conn, if_exists="replace", index=False
-        )
-        statements.cashflow.assign(company_code=config.company_code).to_sql(
-            "financials_cashflow", conn, if_exists="replace", index=False
-        )
-        pd.DataFrame(
-            [
-                {
-                    "company_code": config.company_code,
-                    "company_name": config.company_name,
-                    "industry": config.industry,
-                }
-            ]
-        ).to_sql("companies", conn, if_exists="replace", index=False)
+def _load_processed_merged(config: CreditConfig, expected_years: int) -> pd.DataFrame | None:
+    merged = read_processed(
+        config.processed_dir, "credit_profile", company_codes=[config.company_code]
+    )
+    if merged.empty:
+        return None
+    # 저장소는 지난 연도를 지우지 않으므로 FnGuide 창과 같은 최근 config.years개 연도만 비교한다.
+    latest = sorted(merged["year"].unique())[-config.years :]
+    if len(latest) != expected_years:
+        return None
+    return merged[merged["year"].isin(latest)].reset_index(drop=True)
 
 
 def _write_raw_tables(
     tables: Dict[str, pd.DataFrame],
     config: CreditConfig,
 ) -> None:
-    config.raw_dir.mkdir(parents=True, exist_ok=True)
-    for name, df in tables.items():
-        path = config.raw_dir / f"{config.company_code}_{name}.csv"
-        df.to_csv(path, index=False)
+    """Record this fetch in the raw snapshot store under ``<raw_dir>/snapshots``."""
+
+    SnapshotStore.for_raw_dir(config.raw_dir).write(config.company_code, tables)
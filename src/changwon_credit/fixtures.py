@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import html
+import re
+from pathlib import Path
+from typing import Dict, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .snapshots import SnapshotStore
+
+STATEMENT_DIVS = {
+    "income": ("divSonikY", "divSonikQ", "포괄손익계산서"),
+    "balance": ("divDaechaY", "divDaechaQ", "재무상태표"),
+    "cashflow": ("divCashY", "divCashQ", "현금흐름표"),
+}
+EXPAND_SUFFIX = "계산에 참여한 계정 펼치기"
+
+
+def load_recorded_tables(raw_dir: Path, company_code: str) -> Dict[str, pd.DataFrame]:
+    """Read one company's raw FnGuide tables: legacy CSVs, else the newest snapshot."""
+
+    paths = {name: Path(raw_dir) / f"{company_code}_{name}.csv" for name in STATEMENT_DIVS}
+    if all(path.exists() for path in paths.values()):
+        return {name: pd.read_csv(path) for name, path in paths.items()}
+    tables = SnapshotStore.for_raw_dir(raw_dir).read(company_code)
+    missing = [name for name in STATEMENT_DIVS if name not in tables]
+    if missing:
+        raise FileNotFoundError(f"No recorded {missing} tables for {company_code} under {raw_dir}")
+    return {name: tables[name] for name in STATEMENT_DIVS}
+
+
+def render_finance_page(
+    annual: Mapping[str, pd.DataFrame],
+    quarterly: Mapping[str, pd.DataFrame] | None = None,
+) -> str:
+    """Render tables into markup shaped like FnGuide's ``SVD_Finance`` page.
+
+    The page mirrors the parts the loader depends on: one ``div#...Y`` /
+    ``div#...Q`` pair per statement, expandable rows whose label carries the
+    hidden "계산에 참여한 계정 펼치기" button text, hidden detail rows styled
+    ``display:none`` and comma-formatted figures.
+    """
+
+    quarterly = quarterly or {name: _as_quarterly(df) for name, df in annual.items()}
+    sections = []
+    for name, (annual_id, quarter_id, caption) in STATEMENT_DIVS.items():
+        sections.append(_render_table(annual_id, caption, annual[name]))
+        sections.append(_render_table(quarter_id, caption, quarterly[name]))
+    body = "\n".join(sections)
+    return f"<html><head><meta charset='utf-8'></head><body>\n{body}\n</body></html>"
+
+
+def synthesize_tables(
+    template: Mapping[str, pd.DataFrame], seed: int
+) -> Dict[str, pd.DataFrame]:
+    """Scale a template company's figures to mint a plausible distinct company."""
+
+    rng = np.random.default_rng(seed)
+    scale = float(rng.uniform(0.05, 3.0))
+    tables = {}
+    for name, df in template.items():
+        numeric = df.columns[1:]
+        values = df[numeric].to_numpy(dtype=float, na_value=np.nan)
+        noise = rng.normal(1.0, 0.05, size=values.shape)
+        data = pd.DataFrame(np.round(values * scale * noise), columns=numeric)
+        data.insert(0, df.columns[0], df[df.columns[0]].to_numpy())
+        tables[name] = data
+    return tables
+
+
+def _render_table(div_id: str, caption: str, df: pd.DataFrame) -> str:
+    header = "".join(f'<th scope="col">{html.escape(str(col))}</th>' for col in df.columns)
+    rows = []
+    for index, record in enumerate(df.itertuples(index=False)):
+        label = str(record[0])
+        cells = "".join(f'<td class="r">{_fmt_cell(value)}</td>' for value in record[1:])
+        if label.endswith(EXPAND_SUFFIX):
+            base = html.escape(label[: -len(EXPAND_SUFFIX)])
+            grid = f"grid{div_id}_{index}"
+            row_header = (
+                f'<div><span class="txt_acd">{base}</span>'
+                f'<a id="{grid}" href="javascript:foldOpen(\'{grid}\');" class="btn_acdopen">'
+                f'<span class="blind">{EXPAND_SUFFIX}</span></a></div>'
+            )
+            rows.append(f'<tr class="rwf acd_dep_start_close"><th scope="row">{row_header}</th>{cells}</tr>')
+            rows.append(
+                f'<tr class="c_{grid} rwf acd_dep2_sub" style="display:none;">'
+                f'<th scope="row"><div>{base} 세부</div></th>{cells}</tr>'
+            )
+        else:
+            rows.append(f'<tr class="rwf"><th scope="row"><div>{html.escape(label)}</div></th>{cells}</tr>')
+    body = "\n".join(rows)
+    return (
+        f'<div class="um_table" id="{div_id}">'
+        f'<table class="us_table_ty1 h_fix zigbg_no"><caption class="cphidden">{caption}</caption>'
+        f"<thead><tr>{header}</tr></thead>\n<tbody>\n{body}\n</tbody></table></div>"
+    )
+
+
+def _fmt_cell(value: object) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "&nbsp;"
+    if isinstance(value, (int, float, np.number)):
+        number = float(value)
+        return f"{number:,.0f}" if number.is_integer() else f"{number:,.1f}"
+    return html.escape(str(value))
+
+
+def _as_quarterly(df: pd.DataFrame) -> pd.DataFrame:
+    """Relabel dated columns as consecutive quarters ending at the latest period."""
+
+    dated = [col for col in df.columns[1:] if re.match(r"^\d{4}/\d{2}$", str(col))]
+    if not dated:
+        return df.copy()
+    year, month = (int(part) for part in str(dated[-1]).split("/"))
+    labels = []
+    for _ in dated:
+        labels.append(f"{year}/{month:02d}")
+        month -= 3
+        if month <= 0:
+            month += 12
+            year -= 1
+    return df.rename(columns=dict(zip(dated, reversed(labels))))
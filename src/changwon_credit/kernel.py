@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import numpy as np
+
+# 입력/출력 열 순서는 고정이다. 열 이름 대신 정수 인덱스로 작업 버퍼의 행을 직접 가리킨다.
+INPUT_COLUMNS = (
+    "revenue",
+    "operating_income",
+    "net_income",
+    "interest_expense",
+    "total_assets",
+    "total_liabilities",
+    "equity",
+    "current_assets",
+    "current_liabilities",
+    "operating_cash_flow",
+    "investment_outflows",
+    "non_cash_expense",
+    "non_cash_income",
+    "ending_cash",
+)
+# Statement columns treated as zero when absent or missing.
+OPTIONAL_COLUMNS = ("non_cash_expense", "non_cash_income", "ending_cash")
+OUTPUT_COLUMNS = (
+    "ebitda",
+    "free_cash_flow",
+    "debt_to_equity",
+    "current_ratio",
+    "interest_coverage",
+    "op_margin",
+    "ebitda_margin",
+    "net_margin",
+    "fcf_margin",
+    "ocf_margin",
+    "working_capital",
+    "invested_capital",
+    "roic",
+    "retained_earnings_proxy",
+    "altman_z_score",
+    "fcf_to_debt",
+    "ocf_to_debt",
+    "debt_to_ebitda",
+    "net_debt",
+    "net_debt_to_ebitda",
+    "capex_ratio",
+    "ocf_to_capex",
+    "debt_service",
+    "dscr",
+    "lgd_proxy",
+    "ead_proxy",
+    "pd_estimate",
+    "revenue_growth",
+    "operating_income_growth",
+    "net_income_growth",
+    "asset_growth",
+)
+_SCRATCH = (
+    "wc_to_assets",
+    "re_to_assets",
+    "ebit_to_assets",
+    "equity_to_liabilities",
+    "sales_to_assets",
+    "current_to_assets",
+)
+CHUNK_ROWS = 8192
+_ROW = {name: index for index, name in enumerate((*INPUT_COLUMNS, *OUTPUT_COLUMNS, *_SCRATCH))}
+_OPTIONAL = slice(_ROW[OPTIONAL_COLUMNS[0]], _ROW[OPTIONAL_COLUMNS[-1]] + 1)
+_OUTPUTS = slice(_ROW[OUTPUT_COLUMNS[0]], _ROW[OUTPUT_COLUMNS[-1]] + 1)
+
+# (결과, 분자, 분모): 모든 비율을 한 번의 배열 나눗셈으로 계산한다.
+_RATIOS = (
+    ("debt_to_equity", "total_liabilities", "equity"),
+    ("current_ratio", "current_assets", "current_liabilities"),
+    ("interest_coverage", "ebitda", "interest_expense"),
+    ("op_margin", "operating_income", "revenue"),
+    ("ebitda_margin", "ebitda", "revenue"),
+    ("net_margin", "net_income", "revenue"),
+    ("fcf_margin", "free_cash_flow", "revenue"),
+    ("ocf_margin", "operating_cash_flow", "revenue"),
+    ("roic", "operating_income", "invested_capital"),
+    ("fcf_to_debt", "free_cash_flow", "total_liabilities"),
+    ("ocf_to_debt", "operating_cash_flow", "total_liabilities"),
+    ("debt_to_ebitda", "total_liabilities", "ebitda"),
+    ("net_debt_to_ebitda", "net_debt", "ebitda"),
+    ("capex_ratio", "investment_outflows", "revenue"),
+    ("ocf_to_capex", "operating_cash_flow", "investment_outflows"),
+    ("dscr", "operating_cash_flow", "debt_service"),
+    ("wc_to_assets", "working_capital", "total_assets"),
+    ("re_to_assets", "retained_earnings_proxy", "total_assets"),
+    ("ebit_to_assets", "operating_income", "total_assets"),
+    ("equity_to_liabilities", "equity", "total_liabilities"),
+    ("sales_to_assets", "revenue", "total_assets"),
+    ("current_to_assets", "current_assets", "total_assets"),
+)
+_RATIO_DST, _RATIO_NUM, _RATIO_DEN = (
+    np.array([_ROW[ratio[part]] for ratio in _RATIOS]) for part in range(3)
+)
+_ALTMAN_ROWS = np.array([_ROW[name] for name in _SCRATCH[:5]])
+ALTMAN_WEIGHTS = np.array([0.717, 0.847, 3.107, 0.420, 0.998])
+_GROWTH_DST = np.array(
+    [_ROW[name] for name in ("revenue_growth", "operating_income_growth", "net_income_growth", "asset_growth")]
+)
+_GROWTH_SRC = np.array([_ROW[name] for name in ("revenue", "operating_income", "net_income", "total_assets")])
+
+
+def metric_kernel(
+    values: np.ndarray,
+    groups: np.ndarray | None = None,
+    *,
+    periods_per_year: int = 1,
+    retained_base: np.ndarray | None = None,
+) -> np.ndarray:
+    """Compute every credit metric over a ``(rows, INPUT_COLUMNS)`` float array.
+
+    Rows must be sorted by company and period; ``groups`` holds a company id
+    per row (contiguous runs, default: one company). Lags only look back
+    within a company, ``periods_per_year`` rows apart. ``retained_base`` adds
+    carried cumulative earnings per row. Divisions by zero yield NaN.
+
+    Works column-major in one float64 buffer per block of about
+    ``CHUNK_ROWS`` rows (cut at company boundaries so lags stay inside a
+    block), so each metric is a contiguous, cache-resident row and all ratios
+    are one vectorized division. Returns a ``(rows, OUTPUT_COLUMNS)`` view
+    (Fortran-ordered).
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    rows = values.shape[0]
+    if groups is None:
+        groups = np.zeros(rows, dtype=np.int64)
+    base = None if retained_base is None else np.asarray(retained_base, dtype=np.float64)
+    out = np.empty((len(OUTPUT_COLUMNS), rows), dtype=np.float64)
+    bounds = [0, *(_block_bounds(groups, CHUNK_ROWS) if rows > CHUNK_ROWS else ()), rows]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        out[:, start:stop] = _block(
+            values[start:stop],
+            groups[start:stop],
+            periods_per_year,
+            None if base is None else base[start:stop],
+        )
+    return out.T
+
+
+def _block(
+    values: np.ndarray, groups: np.ndarray, periods_per_year: int, retained_base: np.ndarray | None
+) -> np.ndarray:
+    work = np.empty((len(_ROW), len(values)), dtype=np.float64)
+    work[: len(INPUT_COLUMNS)] = values.T
+    w = dict(zip(_ROW, work))
+
+    optional = work[_OPTIONAL]
+    np.copyto(optional, 0.0, where=np.isnan(optional))
+    np.subtract(w["operating_income"] + w["non_cash_expense"], w["non_cash_income"], out=w["ebitda"])
+    np.subtract(w["operating_cash_flow"], w["investment_outflows"], out=w["free_cash_flow"])
+    np.subtract(w["current_assets"], w["current_liabilities"], out=w["working_capital"])
+    np.subtract(w["total_assets"], w["current_liabilities"], out=w["invested_capital"])
+    np.subtract(w["total_liabilities"], w["ending_cash"], out=w["net_debt"])
+    w["ead_proxy"][:] = w["total_liabilities"]
+
+    # TTM 행은 4개 분기가 겹치므로 분기당 몫(1/periods_per_year)만 누적한다.
+    retained = w["retained_earnings_proxy"]
+    retained[:] = group_cumsum(w["net_income"], groups)
+    retained /= periods_per_year
+    if retained_base is not None:
+        retained += np.where(np.isnan(retained_base), 0.0, retained_base)
+
+    # 부채 감소분을 원금 상환으로 본다. 첫 기간(비교 대상 없음)은 상환액 0이다.
+    principal = -group_diff(w["total_liabilities"], groups, periods_per_year)
+    np.copyto(principal, 0.0, where=~(principal > 0))  # 증가·NaN은 상환 없음
+    np.add(w["interest_expense"], principal, out=w["debt_service"])
+
+    work[_RATIO_DST] = safe_div(work[_RATIO_NUM], work[_RATIO_DEN])
+    np.dot(ALTMAN_WEIGHTS, work[_ALTMAN_ROWS], out=w["altman_z_score"])
+    np.subtract(1.0, w["current_to_assets"], out=w["lgd_proxy"])
+    np.minimum(np.maximum(w["lgd_proxy"], 0.0), 1.0, out=w["lgd_proxy"])
+    pd_from_altman(w["altman_z_score"], out=w["pd_estimate"])
+
+    sources = work[_GROWTH_SRC]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        work[_GROWTH_DST] = sources / group_lag(sources, groups, periods_per_year) - 1.0
+    return work[_OUTPUTS]
+
+
+def _block_bounds(groups: np.ndarray, size: int) -> list[int]:
+    # 목표 위치 이후 첫 회사 경계에서 자르므로 한 회사는 항상 한 블록 안에 있다.
+    starts = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    index = np.searchsorted(starts, np.arange(size, len(groups), size))
+    return np.unique(starts[index[index < len(starts)]]).tolist()
+
+
+def safe_div(
+    numerator: np.ndarray | float, denominator: np.ndarray | float, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Broadcasting ``numerator / denominator`` with NaN wherever the denominator is 0."""
+
+    denominator = np.asarray(denominator, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.divide(numerator, denominator, out=out)
+    np.copyto(result, np.nan, where=denominator == 0)
+    return result
+
+
+def pd_from_altman(z_scores: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Piecewise Altman-zone PD (missing Z treated as 0), clipped to [1%, 35%]."""
+
+    z = np.asarray(z_scores, dtype=np.float64)
+    z = np.where(np.isnan(z), 0.0, z)
+    result = np.where(
+        z >= 3.0,
+        0.01,  # Safe Zone → 투자등급 수준으로 가정
+        np.where(
+            z >= 1.8,
+            0.03 + (3.0 - z) * 0.02,  # Grey Zone은 3~5% PD 구간
+            0.15 + (1.8 - z) * 0.05,  # Distress Zone은 ≥15%로 보수 적용
+        ),
+    )
+    return np.minimum(np.maximum(result, 0.01), 0.35, out=out)
+
+
+def group_lag(values: np.ndarray, groups: np.ndarray, periods: int = 1) -> np.ndarray:
+    """``values`` shifted ``periods`` positions along the last axis within each group."""
+
+    lagged = np.full(values.shape, np.nan)
+    if 0 < periods < values.shape[-1]:
+        same = groups[periods:] == groups[:-periods]
+        lagged[..., periods:] = np.where(same, values[..., :-periods], np.nan)
+    return lagged
+
+
+def group_diff(values: np.ndarray, groups: np.ndarray, periods: int = 1) -> np.ndarray:
+    return values - group_lag(values, groups, periods)
+
+
+def group_cumsum(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Running sum within each group; NaN rows stay NaN but do not break the sum."""
+
+    missing = np.isnan(values)
+    filled = np.where(missing, 0.0, values)
+    total = np.cumsum(filled)
+    breaks = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    if len(breaks):
+        # 각 회사 첫 행 직전까지의 누적합을 그 회사 구간 전체에서 뺀다.
+        starts = np.concatenate(([0], breaks))
+        offsets = total[starts] - filled[starts]
+        total -= np.repeat(offsets, np.diff(np.concatenate((starts, [len(values)]))))
+    total[missing] = np.nan
+    return total
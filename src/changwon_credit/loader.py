@@ -2,13 +2,22 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import StringIO
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+from urllib.parse import urlsplit
 
+import numpy as np
 import pandas as pd
 import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
 
-from .models import FinancialStatements, KRW_100M_TO_BN
+from .cache import CachedResponse, CacheMissError, ResponseCache
+from .models import FetchResult, FinancialStatements, KRW_100M_TO_BN
+from .resilience import Resilience, request_with_retries
 
 LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +28,20 @@ HTTP_HEADERS = {
     "Referer": "https://comp.fnguide.com/",
 }
 
+ANNUAL_TABLE_IDS = {
+    "income": "divSonikY",
+    "balance": "divDaechaY",
+    "cashflow": "divCashY",
+}
+QUARTERLY_TABLE_IDS = {
+    "income_q": "divSonikQ",
+    "balance_q": "divDaechaQ",
+    "cashflow_q": "divCashQ",
+}
+_QUARTER_RE = re.compile(r"^(\d{4})/(03|06|09|12)$")
+_WHITESPACE_RE = re.compile(r"[\r\n]+|\s{2,}")
+_FEED_CHUNK = 64 * 1024
+
 INCOME_METRICS = {
     "매출액": "revenue",
     "매출총이익": "gross_profit",
@@ -50,48 +73,479 @@ CASHFLOW_METRICS = {
     "기말현금및현금성자산": "ending_cash",
 }
 
+STATEMENT_METRICS = {
+    "income": INCOME_METRICS,
+    "balance": BALANCE_METRICS,
+    "cashflow": CASHFLOW_METRICS,
+}
+LONG_COLUMNS = ["company_code", "year", "metric", "value"]
+
+
+class HostRateLimiter:
+    """Space requests to the same host at least ``1 / rate`` seconds apart.
+
+    Slots are reserved under a lock and the sleep happens outside it, so
+    concurrent workers queue up behind each other instead of bursting.
+    """
+
+    def __init__(self, rate: float | None = None) -> None:
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        if not self._interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def build_session(pool_size: int = 8) -> requests.Session:
+    """Return a session whose connection pool can serve ``pool_size`` workers."""
+
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
 
 def fetch_statements(
-    company_code: str, years: int, session: requests.Session | None = None
+    company_code: str,
+    years: int,
+    session: requests.Session | None = None,
+    *,
+    rate_limiter: HostRateLimiter | None = None,
+    cache: ResponseCache | None = None,
+    base_url: str | None = None,
+    resilience: Resilience | None = None,
 ) -> Tuple[Dict[str, pd.DataFrame], FinancialStatements]:
-    """Download FnGuide tables and normalize them into tidy financial statements."""
+    """Download FnGuide tables and normalize them into tidy financial statements.
+
+    ``session`` is the transport: anything with a ``requests.Session``-style
+    ``get`` works, and ``base_url`` redirects the ``SVD_Finance`` endpoint
+    (e.g. to the local stand-in server in :mod:`changwon_credit.standin`).
+    ``resilience`` supplies retries, the circuit breaker and request budget.
+    """
+
+    raw_tables = fetch_raw_tables(
+        company_code,
+        session=session,
+        rate_limiter=rate_limiter,
+        cache=cache,
+        base_url=base_url,
+        resilience=resilience,
+    )
+    return raw_tables, tidy_statements(raw_tables, years)
+
+
+def fetch_raw_tables(
+    company_code: str,
+    *,
+    session: requests.Session | None = None,
+    rate_limiter: HostRateLimiter | None = None,
+    cache: ResponseCache | None = None,
+    base_url: str | None = None,
+    quarterly: bool = False,
+    resilience: Resilience | None = None,
+) -> Dict[str, pd.DataFrame]:
+    """Download the raw income/balance/cash-flow tables without normalizing them.
+
+    With ``quarterly=True`` the ``*_q`` tables from the same page's quarterly
+    tabs are returned alongside the annual ones.
+    """
+
+    return _download_tables(
+        company_code,
+        session=session,
+        rate_limiter=rate_limiter,
+        cache=cache,
+        base_url=base_url,
+        quarterly=quarterly,
+        resilience=resilience,
+    )
+
+
+def tidy_statements(raw_tables: Mapping[str, pd.DataFrame], years: int) -> FinancialStatements:
+    """Normalize one company's raw tables into tidy financial statements."""
 
-    raw_tables = _download_tables(company_code, session=session)
     income = _tidy_statement(raw_tables["income"], INCOME_METRICS, years)
     balance = _tidy_statement(raw_tables["balance"], BALANCE_METRICS, years)
     cashflow = _tidy_statement(raw_tables["cashflow"], CASHFLOW_METRICS, years)
+    return FinancialStatements(income=income, balance=balance, cashflow=cashflow)
+
+
+def tidy_quarterly_statements(
+    raw_tables: Mapping[str, pd.DataFrame], quarters: int
+) -> FinancialStatements:
+    """Normalize the ``*_q`` tables into statements keyed by ``year`` and ``quarter``.
+
+    Income and cash-flow figures are discrete three-month flows; balance
+    sheet figures are quarter-end positions.
+    """
+
+    income = _tidy_statement(raw_tables["income_q"], INCOME_METRICS, quarters, quarterly=True)
+    balance = _tidy_statement(raw_tables["balance_q"], BALANCE_METRICS, quarters, quarterly=True)
+    cashflow = _tidy_statement(
+        raw_tables["cashflow_q"], CASHFLOW_METRICS, quarters, quarterly=True
+    )
+    return FinancialStatements(income=income, balance=balance, cashflow=cashflow)
+
 
-    statements = FinancialStatements(income=income, balance=balance, cashflow=cashflow)
-    return raw_tables, statements
+def fetch_many(
+    company_codes: Sequence[str],
+    years: int | None,
+    *,
+    max_workers: int = 8,
+    rate_limit: float | None = None,
+    session: requests.Session | None = None,
+    cache: ResponseCache | None = None,
+    base_url: str | None = None,
+    resilience: Resilience | None = None,
+) -> Iterator[FetchResult]:
+    """Fetch many companies concurrently and yield each result as it finishes.
+
+    All workers share one pooled session, one per-host rate limiter
+    (``rate_limit`` requests per second, unlimited when ``None``) and one
+    :class:`~changwon_credit.resilience.Resilience` (retries, circuit breaker,
+    adaptive request budget). A failing company is reported through
+    ``FetchResult.error`` instead of aborting the batch. With ``years=None``
+    only the raw tables are returned and tidying is left to the caller (e.g.
+    one :func:`normalize_statements` pass over the whole batch). Closing the
+    generator early cancels the downloads that have not started yet and
+    closes the session when it was created here.
+    """
+
+    workers = max(1, min(max_workers, len(company_codes) or 1))
+    sess = session or build_session(pool_size=workers)
+    limiter = HostRateLimiter(rate_limit)
+    guard = resilience or Resilience()
+
+    def _fetch_one(code: str) -> FetchResult:
+        started = time.perf_counter()
+        try:
+            raw_tables = fetch_raw_tables(
+                code,
+                session=sess,
+                rate_limiter=limiter,
+                cache=cache,
+                base_url=base_url,
+                resilience=guard,
+            )
+            statements = tidy_statements(raw_tables, years) if years is not None else None
+        except Exception as exc:  # noqa: BLE001 - isolate per-company failures
+            LOGGER.warning("Fetch failed for %s: %s", code, exc)
+            return FetchResult(code, error=exc, elapsed=time.perf_counter() - started)
+        return FetchResult(
+            code,
+            raw_tables=raw_tables,
+            statements=statements,
+            elapsed=time.perf_counter() - started,
+        )
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fnguide")
+    try:
+        futures = [pool.submit(_fetch_one, code) for code in company_codes]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # 소비자가 중간에 멈추면 아직 시작하지 않은 다운로드는 취소하고 실행 중인 것만 기다린다.
+        pool.shutdown(wait=True, cancel_futures=True)
+        if session is None:
+            sess.close()
 
 
 def _download_tables(
-    company_code: str, session: requests.Session | None = None
+    company_code: str,
+    session: requests.Session | None = None,
+    rate_limiter: HostRateLimiter | None = None,
+    cache: ResponseCache | None = None,
+    base_url: str | None = None,
+    quarterly: bool = False,
+    resilience: Resilience | None = None,
 ) -> Dict[str, pd.DataFrame]:
+    url = base_url or FNGUIDE_URL
     code = company_code
     if not code.startswith("A"):
         code = f"A{code}"
+    params = {"pGB": "1", "gicode": code, "CmpTp": "1"}
+
+    entry = None
+    if cache is not None:
+        key = cache.key(url, params)
+        entry = cache.get(key)
+        if entry is not None and (cache.offline or cache.is_fresh(entry)):
+            LOGGER.info("Serving %s from the FnGuide response cache", company_code)
+            return _tables_from_cache(entry, cache, company_code, quarterly)
+        if cache.offline:
+            raise CacheMissError(
+                f"No cached FnGuide response for {company_code} in cache-only mode."
+            )
 
     sess = session or requests.Session()
-    resp = sess.get(
-        FNGUIDE_URL,
-        params={"pGB": "1", "gicode": code, "CmpTp": "1"},
-        headers=HTTP_HEADERS,
-        timeout=30,
+    headers = dict(HTTP_HEADERS)
+    if cache is not None:
+        headers.update(cache.conditional_headers(entry))
+    resp = request_with_retries(
+        sess,
+        url,
+        params=params,
+        headers=headers,
+        resilience=resilience or Resilience(),
+        before_attempt=(lambda: rate_limiter.wait(url)) if rate_limiter is not None else None,
     )
+    if resp.status_code == 304 and entry is not None:
+        LOGGER.info("FnGuide page for %s not modified; reusing cache", company_code)
+        return _tables_from_cache(cache.mark_revalidated(entry), cache, company_code, quarterly)
     resp.raise_for_status()
-    dfs = pd.read_html(StringIO(resp.text))
+    if cache is None:
+        return _parse_tables(resp.text, company_code, quarterly)
+
+    entry = cache.put(
+        key,
+        resp.text,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+    )
+    return _tables_from_cache(entry, cache, company_code, quarterly)
+
+
+def _tables_from_cache(
+    entry: CachedResponse, cache: ResponseCache, company_code: str, quarterly: bool = False
+) -> Dict[str, pd.DataFrame]:
+    tables = cache.load_tables(entry)
+    # Tables cached by an annual-only run lack the quarterly tabs; parse again.
+    if tables is None or (quarterly and not QUARTERLY_TABLE_IDS.keys() <= tables.keys()):
+        tables = _parse_tables(entry.text, company_code, quarterly)
+        cache.store_tables(entry, tables)
+    if not quarterly:
+        tables = {name: df for name, df in tables.items() if name in ANNUAL_TABLE_IDS}
+    return tables
+
+
+def _parse_tables(html: str, company_code: str, quarterly: bool = False) -> Dict[str, pd.DataFrame]:
+    table_ids = {**ANNUAL_TABLE_IDS, **QUARTERLY_TABLE_IDS} if quarterly else ANNUAL_TABLE_IDS
+    tables = extract_statement_tables(html, table_ids)
+    if tables is not None:
+        LOGGER.info("Extracted %d statement tables from FnGuide for %s", len(tables), company_code)
+        return tables
+
+    LOGGER.debug("Annual table containers not found for %s; parsing every table", company_code)
+    dfs = pd.read_html(StringIO(html))
     if len(dfs) < 5:
         raise ValueError("FnGuide response is missing expected tables.")
 
     LOGGER.info("Fetched %d tables from FnGuide for %s", len(dfs), company_code)
-    return {"income": dfs[0], "balance": dfs[2], "cashflow": dfs[4]}
+    tables = {"income": dfs[0], "balance": dfs[2], "cashflow": dfs[4]}
+    if quarterly:
+        if len(dfs) < 6:
+            raise ValueError("FnGuide response is missing the quarterly tables.")
+        tables.update({"income_q": dfs[1], "balance_q": dfs[3], "cashflow_q": dfs[5]})
+    return tables
+
+
+def extract_statement_tables(
+    html: str,
+    table_ids: Dict[str, str] = ANNUAL_TABLE_IDS,
+    *,
+    rows: Iterable[str] | None = None,
+    column_pattern: str | None = None,
+) -> Dict[str, pd.DataFrame] | None:
+    """Stream the page and parse only the statement tables named in ``table_ids``.
+
+    The HTML is fed incrementally to a pull parser; elements outside the target
+    ``div`` containers are discarded as soon as they close, and parsing stops
+    once every requested table has been seen, so the quarterly tables and the
+    rest of the page are never materialized. ``rows`` (metric labels) and
+    ``column_pattern`` (header regex) narrow the output further. Returns
+    ``None`` when a container is missing so callers can fall back to
+    ``pd.read_html``.
+    """
+
+    wanted = {div_id: name for name, div_id in table_ids.items()}
+    row_filter = set(rows) if rows is not None else None
+    column_re = re.compile(column_pattern) if column_pattern else None
+    parser = etree.HTMLPullParser(events=("start", "end"), tag="div")
+    tables: Dict[str, pd.DataFrame] = {}
+    active: etree._Element | None = None
+
+    for offset in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[offset : offset + _FEED_CHUNK])
+        for event, elem in parser.read_events():
+            if event == "start":
+                if active is None and elem.get("id") in wanted:
+                    active = elem
+                continue
+            if elem is active:
+                name = wanted.pop(elem.get("id"))
+                tables[name] = _container_frame(elem, row_filter, column_re)
+                active = None
+            if active is None:
+                elem.clear()
+        if not wanted:
+            break
+    else:
+        parser.close()
+
+    if wanted:
+        return None
+    return tables
+
+
+def _container_frame(
+    container: etree._Element,
+    row_filter: set[str] | None,
+    column_re: re.Pattern[str] | None,
+) -> pd.DataFrame:
+    table = container.find(".//table")
+    if table is None:
+        raise ValueError(f"FnGuide container {container.get('id')} holds no table.")
+
+    header_row = table.find("thead/tr")
+    if header_row is None:
+        header_row = table.find(".//tr")
+    header = [_cell_text(cell) for cell in header_row if cell.tag in ("th", "td")]
+    keep = [
+        position
+        for position, label in enumerate(header)
+        if position == 0 or column_re is None or column_re.match(label)
+    ]
+
+    labels: List[str] = []
+    values: List[List[float]] = []
+    for tr in table.iter("tr"):
+        if tr is header_row or _is_hidden(tr):
+            continue
+        cells = [cell for cell in tr if cell.tag in ("th", "td")]
+        if len(cells) != len(header):
+            continue
+        label = _cell_text(cells[0])
+        if row_filter is not None and label not in row_filter:
+            continue
+        labels.append(label)
+        values.append([_to_number(_cell_text(cells[position])) for position in keep[1:]])
+
+    columns = [header[position] for position in keep[1:]]
+    frame = pd.DataFrame(
+        np.array(values, dtype=float).reshape(len(values), len(columns)), columns=columns
+    )
+    frame.insert(0, header[0], labels)
+    return frame
+
+
+def _cell_text(cell: etree._Element) -> str:
+    return _WHITESPACE_RE.sub(" ", "".join(cell.itertext())).strip()
+
+
+def _to_number(text: str) -> float:
+    try:
+        return float(text.replace(",", ""))
+    except ValueError:
+        return np.nan
+
+
+def _is_hidden(elem: etree._Element) -> bool:
+    return "display:none" in elem.get("style", "").replace(" ", "")
+
+
+def normalize_statements(
+    raw_by_company: Mapping[str, Mapping[str, pd.DataFrame]], years: int | None
+) -> pd.DataFrame:
+    """Normalize raw FnGuide tables of many companies in one vectorized pass.
+
+    Returns a long frame with ``company_code``, ``year``, ``metric`` and
+    ``value`` (KRW bn). Per table the only Python work is slicing out the
+    label column, the header and the value block; period parsing runs once
+    over the distinct header labels, metric mapping is a single merge and
+    numeric coercion a single ``pd.to_numeric``. Year selection follows
+    :func:`_select_annual_columns`: the latest ``years`` December columns per
+    company and statement (all of them when ``years`` is ``None``), or any
+    dated column when a table has none.
+    """
+
+    codes: List[np.ndarray] = []
+    statements: List[np.ndarray] = []
+    labels: List[np.ndarray] = []
+    periods: List[np.ndarray] = []
+    positions: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    for company_code, tables in raw_by_company.items():
+        for statement in STATEMENT_METRICS:
+            df = tables[statement]
+            if df.empty:
+                raise ValueError(f"Received empty {statement} table for {company_code}.")
+            array = df.to_numpy(dtype=object)
+            block = array[:, 1:]
+            n_rows, n_cols = block.shape
+            size = n_rows * n_cols
+            codes.append(np.full(size, company_code, dtype=object))
+            statements.append(np.full(size, statement, dtype=object))
+            labels.append(np.repeat(array[:, 0], n_cols))
+            periods.append(np.tile(np.asarray(df.columns[1:], dtype=object), n_rows))
+            positions.append(np.tile(np.arange(n_cols), n_rows))
+            values.append(block.ravel())
+
+    if not codes:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+
+    cells = pd.DataFrame(
+        {
+            "company_code": np.concatenate(codes),
+            "statement": np.concatenate(statements),
+            "label": pd.Series(np.concatenate(labels)).astype(str).str.strip(),
+            "period": pd.Categorical(np.concatenate(periods).astype(str)),
+            "position": np.concatenate(positions),
+            "value": np.concatenate(values),
+        }
+    )
+    metric_frame = pd.DataFrame(
+        [
+            (statement, label, metric)
+            for statement, metric_map in STATEMENT_METRICS.items()
+            for label, metric in metric_map.items()
+        ],
+        columns=["statement", "label", "metric"],
+    )
+    cells = cells.merge(metric_frame, on=["statement", "label"], how="inner")
+
+    # Parse each distinct header once instead of once per cell.
+    categories = pd.Series(cells["period"].cat.categories.str.strip())
+    parsed = categories.str.extract(r"^(\d{4})/(\d{2})")
+    codes_idx = cells["period"].cat.codes.to_numpy()
+    cells["year"] = pd.to_numeric(parsed[0], errors="coerce").to_numpy()[codes_idx]
+    cells["december"] = (parsed[1] == "12").to_numpy()[codes_idx]
+    cells = cells[cells["year"].notna()]
+
+    group_keys = ["company_code", "statement"]
+    has_annual = cells.groupby(group_keys)["december"].transform("any")
+    cells = cells[cells["december"] | ~has_annual]
+    column_order = cells.groupby(group_keys)["position"].rank(method="dense", ascending=False)
+    if years is not None:
+        cells = cells[column_order <= years]
+
+    numeric = pd.to_numeric(cells["value"], errors="coerce").fillna(0.0)
+    long = pd.DataFrame(
+        {
+            "company_code": cells["company_code"].to_numpy(),
+            "year": cells["year"].astype(int).to_numpy(),
+            "metric": cells["metric"].to_numpy(),
+            "value": numeric.to_numpy(dtype=float) * KRW_100M_TO_BN,
+        }
+    )
+    long = long.drop_duplicates(["company_code", "year", "metric"], keep="first")
+    return long.sort_values(["company_code", "metric", "year"], kind="stable").reset_index(drop=True)
 
 
 def _tidy_statement(
-    df: pd.DataFrame, metric_map: Dict[str, str], years: int
+    df: pd.DataFrame, metric_map: Dict[str, str], years: int, *, quarterly: bool = False
 ) -> pd.DataFrame:
-    """Select the latest `years` annual columns and rename metrics."""
+    """Select the latest `years` annual columns (or quarters) and rename metrics."""
 
     if df.empty:
         raise ValueError("Received empty DataFrame from FnGuide.")
@@ -102,18 +556,32 @@ def _tidy_statement(
     data["metric"] = data["metric"].astype(str).str.strip()
     subset = data[data["metric"].isin(metric_map.keys())].set_index("metric")
 
-    year_columns = _select_annual_columns(subset.columns, years)
+    if quarterly:
+        year_columns = _select_quarterly_columns(subset.columns, years)
+    else:
+        year_columns = _select_annual_columns(subset.columns, years)
     if not year_columns:
-        raise ValueError("Unable to locate annual financial columns.")
+        frequency = "quarterly" if quarterly else "annual"
+        raise ValueError(f"Unable to locate {frequency} financial columns.")
 
     numeric_subset = (
         subset[year_columns].apply(pd.to_numeric, errors="coerce").fillna(0.0)
     )
     numeric_subset = numeric_subset.T
-    numeric_subset.index = numeric_subset.index.map(
-        lambda label: int(re.match(r"(\d{4})", str(label)).group(1))
-    )
-    numeric_subset.index.name = "year"
+    if quarterly:
+        parsed = [_QUARTER_RE.match(str(label).strip()) for label in numeric_subset.index]
+        numeric_subset.index = pd.MultiIndex.from_arrays(
+            [
+                [int(match.group(1)) for match in parsed],
+                [int(match.group(2)) // 3 for match in parsed],
+            ],
+            names=["year", "quarter"],
+        )
+    else:
+        numeric_subset.index = numeric_subset.index.map(
+            lambda label: int(re.match(r"(\d{4})", str(label)).group(1))
+        )
+        numeric_subset.index.name = "year"
 
     ordered_columns = [metric_map[key] for key in metric_map if key in subset.index]
     renamed = numeric_subset.rename(columns=metric_map)
@@ -133,3 +601,10 @@ def _select_annual_columns(columns: Iterable[str], years: int) -> List[str]:
             col for col in columns if isinstance(col, str) and re.match(r"^\d{4}/", col)
         ]
     return annual[-years:]
+
+
+def _select_quarterly_columns(columns: Iterable[str], quarters: int) -> List[str]:
+    quarterly = [
+        col for col in columns if isinstance(col, str) and _QUARTER_RE.match(col.strip())
+    ]
+    return quarterly[-quarters:]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Mapping
+
+import pandas as pd
+
+_ANNUAL_RE = re.compile(r"^\d{4}/12$")
+_QUARTER_RE = re.compile(r"^\d{4}/(03|06|09|12)$")
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    periods: List[str]
+    hashes: Dict[str, str]
+    fetched_at: str
+
+    def same_content(self, other: "ManifestEntry") -> bool:
+        return self.periods == other.periods and self.hashes == other.hashes
+
+
+class FetchManifest:
+    """Per-company record of the last fetched annual periods and statement hashes.
+
+    Stored as JSON next to the processed tables. A company whose FnGuide page
+    shows the same ``YYYY/12`` columns with identical figures as last time is
+    unchanged, and the pipeline can skip tidy/merge/metrics/charts/reports.
+    """
+
+    def __init__(self, path: Path, entries: Dict[str, ManifestEntry] | None = None) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, ManifestEntry] = entries or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "FetchManifest":
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        entries = {code: ManifestEntry(**entry) for code, entry in raw.get("companies", {}).items()}
+        return cls(path, entries)
+
+    def get(self, company_code: str) -> ManifestEntry | None:
+        return self.entries.get(company_code)
+
+    def is_unchanged(self, company_code: str, entry: ManifestEntry) -> bool:
+        previous = self.get(company_code)
+        return previous is not None and previous.same_content(entry)
+
+    def record(self, company_code: str, entry: ManifestEntry) -> None:
+        with self._lock:
+            self.entries[company_code] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {
+                "companies": {code: asdict(entry) for code, entry in sorted(self.entries.items())}
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+
+def build_entry(raw_tables: Mapping[str, pd.DataFrame]) -> ManifestEntry:
+    """Summarize raw FnGuide tables into annual periods plus per-statement hashes.
+
+    Quarterly tables (``*_q``) contribute their quarter columns, tagged with a
+    ``Q:`` prefix, so a newly published quarter counts as a change too.
+    """
+
+    periods: set[str] = set()
+    hashes: Dict[str, str] = {}
+    for name, df in sorted(raw_tables.items()):
+        quarterly = name.endswith("_q")
+        pattern = _QUARTER_RE if quarterly else _ANNUAL_RE
+        annual = [col for col in df.columns[1:] if pattern.match(str(col).strip())]
+        prefix = "Q:" if quarterly else ""
+        periods.update(f"{prefix}{str(col).strip()}" for col in annual)
+        # Normalize dtypes so int/float or object/string parses of the same page hash alike.
+        canonical = df[annual].apply(pd.to_numeric, errors="coerce").astype(float)
+        canonical.insert(0, "label", df[df.columns[0]].astype(str).str.strip().to_numpy(dtype=object))
+        hashes[name] = frame_hash(canonical)
+    return ManifestEntry(
+        periods=sorted(periods),
+        hashes=hashes,
+        fetched_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Stable content hash of a frame's column labels and values."""
+
+    digest = hashlib.sha256()
+    digest.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
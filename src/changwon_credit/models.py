@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -28,6 +28,20 @@ class CreditConfig:
     typst_compile_pdf: bool = True
     typst_output_dir: Path | None = None
     typst_template: Path | None = None
+    cache_dir: Path | None = Path(".cache/fnguide")
+    cache_ttl_hours: float = 24.0
+    cache_max_mb: float = 256.0
+    cache_mode: str = "default"
+    fnguide_url: str | None = None
+    frequency: str = "annual"
+    quarters: int = 8
+    float32_ratios: bool = False
+    retry_attempts: int = 4
+    connect_timeout: float = 3.05
+    read_timeout: float = 20.0
+    breaker_failures: int = 5
+    breaker_reset_seconds: float = 30.0
+    request_budget_rps: float | None = None
 
 
 @dataclass(slots=True)
@@ -37,6 +51,28 @@ class FinancialStatements:
     cashflow: pd.DataFrame
 
 
+@dataclass(slots=True)
+class FetchResult:
+    """Outcome of one company download inside a batch fetch."""
+
+    company_code: str
+    raw_tables: Dict[str, pd.DataFrame] | None = None
+    statements: FinancialStatements | None = None
+    error: Exception | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class PipelineRun:
+    merged: pd.DataFrame
+    changed: bool
+    raw_tables: Dict[str, pd.DataFrame] | None = None
+
+
 @dataclass(slots=True)
 class CreditStory:
     highlights: List[str]
@@ -54,6 +90,8 @@ def load_config(path: str | Path) -> CreditConfig:
     data = raw_cfg.get("data", {})
     paths = raw_cfg.get("paths", {})
     report = raw_cfg.get("report", {})
+    cache = raw_cfg.get("cache", {})
+    http = raw_cfg.get("http", {})
 
     code_value = company.get("code", "")
     if isinstance(code_value, int):
@@ -64,6 +102,7 @@ def load_config(path: str | Path) -> CreditConfig:
     typst_cfg = report.get("typst", {})
     output_dir = typst_cfg.get("output_dir")
     template_path = typst_cfg.get("template")
+    cache_dir = cache.get("dir", ".cache/fnguide")
 
     return CreditConfig(
         company_name=company.get("name", "Unknown Company"),
@@ -82,4 +121,39 @@ def load_config(path: str | Path) -> CreditConfig:
         typst_compile_pdf=bool(typst_cfg.get("compile_pdf", True)),
         typst_output_dir=Path(output_dir) if output_dir else None,
         typst_template=Path(template_path) if template_path else None,
+        cache_dir=Path(cache_dir) if cache_dir else None,
+        cache_ttl_hours=float(cache.get("ttl_hours", 24.0)),
+        cache_max_mb=float(cache.get("max_mb", 256.0)),
+        cache_mode=str(cache.get("mode", "default")),
+        fnguide_url=data.get("base_url") or None,
+        frequency=str(data.get("frequency", "annual")),
+        quarters=int(data.get("quarters", 8)),
+        float32_ratios=bool(data.get("float32_ratios", False)),
+        retry_attempts=int(http.get("retries", 4)),
+        connect_timeout=float(http.get("connect_timeout", 3.05)),
+        read_timeout=float(http.get("read_timeout", 20.0)),
+        breaker_failures=int(http.get("breaker_failures", 5)),
+        breaker_reset_seconds=float(http.get("breaker_reset_seconds", 30.0)),
+        request_budget_rps=float(http["budget_rps"]) if http.get("budget_rps") else None,
+    )
+
+
+def config_for_company(
+    config: CreditConfig, company_code: str, company_name: str | None = None
+) -> CreditConfig:
+    """Derive a per-company config for batch runs.
+
+    Reports, figures and Typst output go to ``<report dir>/<code>/`` so
+    companies processed side by side never overwrite each other's artifacts.
+    """
+
+    if company_code == config.company_code:
+        return config
+    company_dir = config.report_path.parent / company_code
+    return replace(
+        config,
+        company_code=company_code,
+        company_name=company_name or company_code,
+        report_path=company_dir / f"{company_code}_credit.md",
+        typst_output_dir=company_dir,
     )
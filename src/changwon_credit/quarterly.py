@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .analytics import compute_credit_metrics
+from .loader import CASHFLOW_METRICS, INCOME_METRICS
+
+LOGGER = logging.getLogger(__name__)
+
+QUARTERS_PER_YEAR = 4
+PERIOD_KEYS = ["company_code", "year", "quarter"]
+# 손익·현금흐름은 기간 합계(flow), 재무상태표와 기말현금은 분기말 잔액(stock)이다.
+FLOW_METRICS = [
+    metric
+    for metric in [*INCOME_METRICS.values(), *CASHFLOW_METRICS.values()]
+    if metric != "ending_cash"
+]
+
+
+def build_ttm(quarterly: pd.DataFrame) -> pd.DataFrame:
+    """Roll discrete quarterly statements into trailing-twelve-month rows.
+
+    Flow metrics are summed over each company's last four quarters with one
+    strided window over the whole panel; balance-sheet positions stay
+    point-in-time. Rows without four consecutive quarters of the same company
+    behind them (history start, gaps) are dropped.
+    """
+
+    frame = quarterly.sort_values(PERIOD_KEYS, kind="stable").reset_index(drop=True)
+    if len(frame) < QUARTERS_PER_YEAR:
+        return frame.iloc[0:0].copy()
+
+    flows = [metric for metric in FLOW_METRICS if metric in frame.columns]
+    values = np.nan_to_num(frame[flows].to_numpy(dtype=float))
+    windows = np.lib.stride_tricks.sliding_window_view(values, QUARTERS_PER_YEAR, axis=0)
+    sums = windows.sum(axis=-1)
+
+    lag = QUARTERS_PER_YEAR - 1
+    codes = frame["company_code"].to_numpy()
+    period = _period_index(frame)
+    complete = (codes[lag:] == codes[:-lag]) & (period[lag:] - period[:-lag] == lag)
+
+    ttm = frame.iloc[lag:].copy()
+    ttm[flows] = sums
+    return ttm[complete].reset_index(drop=True)
+
+
+def compute_ttm_metrics(
+    quarterly: pd.DataFrame, previous: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """Compute TTM credit metrics, extending ``previous`` instead of recomputing it.
+
+    Returns the full metric history; see :func:`extend_ttm_metrics` for the
+    new rows alone.
+    """
+
+    if previous is None or previous.empty:
+        return compute_credit_metrics(build_ttm(quarterly), periods_per_year=QUARTERS_PER_YEAR)
+    fresh = extend_ttm_metrics(quarterly, previous)
+    if fresh.empty:
+        return previous
+    combined = pd.concat([previous, fresh], ignore_index=True)
+    return combined.sort_values(PERIOD_KEYS, kind="stable").reset_index(drop=True)
+
+
+def extend_ttm_metrics(quarterly: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+    """Compute only the TTM metric rows that come after ``previous``.
+
+    Each company's frontier is its latest period in ``previous``. The TTM
+    window covers the periods after it plus the four before it (enough for
+    the YoY lags), and cumulative earnings are carried in from ``previous``.
+    A new quarter therefore costs a handful of rows per company rather than
+    the full history. Companies missing from ``previous`` are computed from
+    scratch.
+    """
+
+    frontier = (
+        previous.assign(period=_period_index(previous)).groupby("company_code")["period"].max()
+    )
+    # TTM 4개 분기 lookback을 만들려면 frontier 이전 7개 분기의 원천 데이터가 필요하다.
+    last = quarterly["company_code"].map(frontier).to_numpy(dtype=float)
+    lookback = 2 * QUARTERS_PER_YEAR - 1
+    keep = np.isnan(last) | (_period_index(quarterly) > last - lookback)
+    ttm = build_ttm(quarterly[keep].assign(_frontier=last[keep]))
+
+    last = ttm["_frontier"].to_numpy()
+    period = _period_index(ttm)
+    window = ttm[np.isnan(last) | (period > last - QUARTERS_PER_YEAR)]
+    if not (np.isnan(last) | (period > last)).any():
+        return previous.iloc[0:0]
+
+    start = window.groupby("company_code").head(1)
+    carried = start[PERIOD_KEYS].merge(
+        previous[[*PERIOD_KEYS, "retained_earnings_proxy"]], on=PERIOD_KEYS, how="left"
+    )["retained_earnings_proxy"].to_numpy(dtype=float)
+    base = np.where(
+        np.isnan(carried), 0.0, carried - start["net_income"].to_numpy() / QUARTERS_PER_YEAR
+    )
+    computed = compute_credit_metrics(
+        window,
+        periods_per_year=QUARTERS_PER_YEAR,
+        retained_base=dict(zip(start["company_code"], base)),
+    )
+
+    computed_last = computed["_frontier"].to_numpy()
+    fresh = computed[np.isnan(computed_last) | (_period_index(computed) > computed_last)]
+    LOGGER.info("Computed %d new TTM periods over a %d-row window", len(fresh), len(window))
+    return fresh.drop(columns="_frontier").reset_index(drop=True)
+
+
+def _period_index(frame: pd.DataFrame) -> np.ndarray:
+    return frame["year"].to_numpy(dtype=np.int64) * QUARTERS_PER_YEAR + frame["quarter"].to_numpy(
+        dtype=np.int64
+    )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+import pandas as pd
+
+from .models import CreditConfig
+from .store import DATASETS, LOADED_AT, QUARTERLY_DATASETS, row_keys
+
+if TYPE_CHECKING:
+    import duckdb
+    import pyarrow as pa
+
+LOGGER = logging.getLogger(__name__)
+
+SQLITE_SCHEMA = "warehouse"
+
+
+def connect(config: CreditConfig, *, attach_sqlite: bool = False) -> "duckdb.DuckDBPyConnection":
+    """Open an in-process DuckDB session with one view per processed dataset.
+
+    Each view (``analytics_credit``, ``credit_profile``, ``fs_income``, ...)
+    scans the Hive-partitioned Parquet files directly and keeps the newest
+    load of every company-year (company-quarter for ``fs_quarterly`` and
+    ``credit_ttm``), so filters on ``company_code``/``year`` prune
+    partitions and only the selected columns are read. With
+    ``attach_sqlite`` the SQLite warehouse is attached read-only as
+    ``warehouse.<table>`` (needs DuckDB's ``sqlite`` extension).
+    """
+
+    duckdb = _require_duckdb()
+    conn = duckdb.connect()
+    for name in (*DATASETS, *QUARTERLY_DATASETS):
+        root = Path(config.processed_dir) / name
+        if not root.exists():
+            continue
+        pattern = (root.resolve() / "**" / "*.parquet").as_posix().replace("'", "''")
+        keys = ", ".join(row_keys(name))
+        conn.execute(
+            f"""
+            CREATE VIEW {name} AS
+            SELECT * EXCLUDE ({LOADED_AT}) FROM read_parquet(
+                '{pattern}',
+                hive_partitioning = true,
+                hive_types = {{'company_code': VARCHAR, 'year': BIGINT}},
+                union_by_name = true
+            )
+            QUALIFY {LOADED_AT} = max({LOADED_AT}) OVER (PARTITION BY {keys})
+            """
+        )
+    if attach_sqlite and Path(config.sqlite_path).exists():
+        sqlite_path = Path(config.sqlite_path).resolve().as_posix().replace("'", "''")
+        conn.execute(f"ATTACH '{sqlite_path}' AS {SQLITE_SCHEMA} (TYPE sqlite, READ_ONLY)")
+    return conn
+
+
+def query_arrow(
+    config: CreditConfig, sql: str, params: Sequence | None = None, *, attach_sqlite: bool = False
+) -> "pa.Table":
+    """Run ``sql`` over the processed store and return the result as an Arrow table."""
+
+    conn = connect(config, attach_sqlite=attach_sqlite)
+    try:
+        return conn.execute(sql, params or []).fetch_arrow_table()
+    finally:
+        conn.close()
+
+
+def query(
+    config: CreditConfig, sql: str, params: Sequence | None = None, *, attach_sqlite: bool = False
+) -> pd.DataFrame:
+    """Run ``sql`` over the processed store; only the result set reaches pandas."""
+
+    conn = connect(config, attach_sqlite=attach_sqlite)
+    try:
+        return conn.execute(sql, params or []).df()
+    finally:
+        conn.close()
+
+
+def export_query(
+    config: CreditConfig, sql: str, output: Path, *, attach_sqlite: bool = False
+) -> Path:
+    """Stream a query result to CSV or Parquet (by suffix) with DuckDB's ``COPY``."""
+
+    output = Path(output)
+    fmt = "PARQUET" if output.suffix.lower() == ".parquet" else "CSV, HEADER"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    target = output.resolve().as_posix().replace("'", "''")
+    conn = connect(config, attach_sqlite=attach_sqlite)
+    try:
+        conn.execute(f"COPY ({sql.rstrip().rstrip(';')}) TO '{target}' (FORMAT {fmt})")
+    finally:
+        conn.close()
+    return output
+
+
+def _require_duckdb():
+    try:
+        import duckdb
+    except ImportError as exc:  # pragma: no cover - depends on the optional extra
+        raise ImportError(
+            "The SQL layer needs DuckDB: pip install 'changwon-corp-credit[sql]'"
+        ) from exc
+    return duckdb
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .models import CreditConfig
+
+LOGGER = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without touching the network while a host's circuit is open."""
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    """Retry budget for one request: attempts, jittered backoff and timeouts.
+
+    Backoff uses "full jitter" – a uniform draw between zero and the capped
+    exponential step – so workers that failed together do not retry in
+    lockstep. A server ``Retry-After`` is honoured as the lower bound.
+    """
+
+    max_attempts: int = 4
+    max_throttled: int = 16
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    connect_timeout: float = 3.05
+    read_timeout: float = 20.0
+    retry_statuses: frozenset[int] = RETRY_STATUSES
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def delay(
+        self, attempt: int, retry_after: float | None = None, rng: random.Random | None = None
+    ) -> float:
+        """Seconds to wait before retry number ``attempt`` (1-based)."""
+
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        jittered = (rng or random).uniform(0.0, ceiling)
+        if retry_after is not None:
+            return min(max(retry_after, jittered), self.backoff_max)
+        return jittered
+
+
+class CircuitBreaker:
+    """Per-host breaker: closed → open after repeated failures → half-open probe.
+
+    While open, requests to the host fail fast with :class:`CircuitOpenError`.
+    After ``reset_timeout`` seconds one probe request is let through; success
+    closes the circuit, failure re-opens it for another ``reset_timeout``.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            return self._state(host)
+
+    def before(self, host: str) -> None:
+        with self._lock:
+            state = self._state(host)
+            if state == "closed":
+                return
+            if state == "half-open" and host not in self._probing:
+                self._probing.add(host)
+                return
+        raise CircuitOpenError(f"Circuit open for {host}; skipping request.")
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._probing.discard(host)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            probing = host in self._probing
+            self._probing.discard(host)
+            count = self._failures.get(host, 0) + 1
+            self._failures[host] = count
+            if probing or count >= self.failure_threshold:
+                if host not in self._opened_at or probing:
+                    LOGGER.warning("Opening circuit for %s after %d failures", host, count)
+                self._opened_at[host] = self._clock()
+
+    def _state(self, host: str) -> str:
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return "closed"
+        if self._clock() - opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+
+class RequestBudget:
+    """Global, adaptive request rate shared by every download worker.
+
+    Requests draw slots from a single pacing clock at ``rate`` per second.
+    Throttling answers (429) multiply the rate by ``decrease`` (0.7, a 30%
+    cut) at most once per second (or per pacing interval, if longer), so a
+    burst of 429s from requests already in flight counts once. Every success
+    adds ``increase / rate``, i.e. roughly ``increase`` requests per second
+    of clean traffic (AIMD). Retries are capped at ``retry_ratio`` of
+    first attempts (plus ``min_retries``) so a struggling server sees a
+    bounded amount of extra load instead of a retry storm.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        *,
+        min_rate: float = 0.5,
+        max_rate: float | None = None,
+        increase: float = 1.0,
+        decrease: float = 0.7,
+        retry_ratio: float = 0.2,
+        min_retries: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate * 4
+        self.increase = increase
+        self.decrease = decrease
+        self.retry_ratio = retry_ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot = clock()
+        self._last_cut = float("-inf")
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        delay = slot - now
+        if delay > 0:
+            self._sleep(delay)
+
+    def try_retry(self) -> bool:
+        with self._lock:
+            if self.retries >= self.min_retries + self.retry_ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+    def on_attempt(self, first: bool) -> None:
+        if first:
+            with self._lock:
+                self.requests += 1
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttled += 1
+            now = self._clock()
+            if now - self._last_cut < max(1.0, 1.0 / self.rate):
+                return
+            self._last_cut = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            LOGGER.info("Throttled by FnGuide; request budget lowered to %.2f req/s", self.rate)
+
+
+@dataclass(slots=True)
+class Resilience:
+    """Retry policy, circuit breaker and request budget shared by a fetch run."""
+
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    breaker: CircuitBreaker | None = field(default_factory=CircuitBreaker)
+    budget: RequestBudget | None = None
+
+    @classmethod
+    def from_config(cls, config: CreditConfig) -> "Resilience":
+        retry = RetryPolicy(
+            max_attempts=config.retry_attempts,
+            connect_timeout=config.connect_timeout,
+            read_timeout=config.read_timeout,
+        )
+        breaker = CircuitBreaker(config.breaker_failures, config.breaker_reset_seconds)
+        budget = RequestBudget(config.request_budget_rps) if config.request_budget_rps else None
+        return cls(retry=retry, breaker=breaker, budget=budget)
+
+
+def request_with_retries(
+    session: requests.Session,
+    url: str,
+    *,
+    params: Mapping[str, str],
+    headers: Mapping[str, str],
+    resilience: Resilience,
+    before_attempt: Callable[[], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> requests.Response:
+    """GET ``url`` with retries, circuit breaking and the shared request budget.
+
+    Returns the first non-retryable response (including 304 and 4xx other
+    than 429) and leaves status handling to the caller. Connection errors,
+    timeouts and retryable statuses are retried until the policy or the
+    budget's retry allowance runs out, after which the last error is raised.
+    With a budget, a 429 does not use up one of the request's attempts or
+    the retry allowance – the budget has already slowed everyone down, so
+    the retry is paced rather than extra load – and is capped separately by
+    ``max_throttled``.
+    """
+
+    host = urlsplit(url).netloc
+    policy, breaker, budget = resilience.retry, resilience.breaker, resilience.budget
+    attempt = failures = throttles = 0
+    while True:
+        attempt += 1
+        if breaker is not None:
+            breaker.before(host)
+        if budget is not None:
+            budget.on_attempt(first=attempt == 1)
+            budget.acquire()
+        if before_attempt is not None:
+            before_attempt()
+
+        status = retry_after = None
+        try:
+            resp = session.get(url, params=params, headers=headers, timeout=policy.timeout)
+        except RETRY_EXCEPTIONS as exc:
+            error: Exception = exc
+        except requests.RequestException:
+            if breaker is not None:
+                breaker.record_failure(host)
+            raise
+        else:
+            status = resp.status_code
+            if status not in policy.retry_statuses:
+                if breaker is not None:
+                    breaker.record_success(host)
+                if budget is not None:
+                    budget.on_success()
+                return resp
+            error = requests.HTTPError(f"{status} from {host}", response=resp)
+            retry_after = _retry_after_seconds(resp.headers.get("Retry-After"))
+
+        if status == 429:
+            # 스로틀은 서버가 살아 있다는 신호이므로 차단기 대신 예산(속도)을 줄인다.
+            if breaker is not None:
+                breaker.record_success(host)
+            if budget is not None:
+                budget.on_throttle()
+                throttles += 1
+            else:
+                failures += 1
+        else:
+            failures += 1
+            if breaker is not None:
+                breaker.record_failure(host)
+
+        paced = status == 429 and budget is not None
+        if failures >= policy.max_attempts or throttles >= policy.max_throttled:
+            raise error
+        if budget is not None and not paced and not budget.try_retry():
+            raise error
+        wait = policy.delay(max(failures, 1), retry_after)
+        LOGGER.info("Retrying %s in %.2fs after %s (attempt %d)", host, wait, error, attempt)
+        sleep(wait)
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .kernel import pd_from_altman, safe_div
+
+GRID_AXES = ("revenue_shock", "rate_shock", "capex_shock")
+GRID_MEASURES = (
+    "revenue",
+    "operating_income",
+    "ebitda",
+    "free_cash_flow",
+    "interest_coverage",
+    "dscr",
+    "fcf_margin",
+    "pd_estimate",
+)
+_BASE_COLUMNS = (
+    "revenue",
+    "operating_income",
+    "ebitda",
+    "free_cash_flow",
+    "operating_cash_flow",
+    "investment_outflows",
+    "interest_expense",
+    "debt_service",
+    "ead_proxy",
+    "altman_z_score",
+)
+
+
+@dataclass(slots=True)
+class ScenarioGrid:
+    """Scenario measures of every obligor over a revenue × rate × capex shock grid.
+
+    Each array in ``values`` broadcasts to :attr:`shape` (obligor, revenue,
+    rate, capex) but only spans the axes it depends on (DSCR ignores capex,
+    FCF ignores rates), so hundreds of points per axis stay small.
+    ``grid[name]`` is the full read-only broadcast view.
+    """
+
+    company_codes: np.ndarray
+    revenue_shocks: np.ndarray
+    rate_shocks: np.ndarray
+    capex_shocks: np.ndarray
+    values: Dict[str, np.ndarray]
+
+    @property
+    def shape(self) -> tuple[int, int, int, int]:
+        return (
+            len(self.company_codes),
+            len(self.revenue_shocks),
+            len(self.rate_shocks),
+            len(self.capex_shocks),
+        )
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return np.broadcast_to(self.values[name], self.shape)
+
+    def share_below(self, name: str, threshold: float) -> pd.Series:
+        """Share of each obligor's grid points where ``name`` is below ``threshold``."""
+
+        # 브로드캐스트 축은 값이 반복될 뿐이므로 저장된 축만으로 평균을 내도 같다.
+        share = (self.values[name] < threshold).mean(axis=(1, 2, 3))
+        return pd.Series(share, index=pd.Index(self.company_codes, name="company_code"), name=name)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table with one row per obligor and grid point (materializes the grid)."""
+
+        index = np.indices(self.shape).reshape(4, -1)
+        frame = pd.DataFrame(
+            {
+                "company_code": self.company_codes[index[0]],
+                "revenue_shock": self.revenue_shocks[index[1]],
+                "rate_shock": self.rate_shocks[index[2]],
+                "capex_shock": self.capex_shocks[index[3]],
+            }
+        )
+        for name in GRID_MEASURES:
+            frame[name] = self[name].ravel()
+        return frame
+
+
+def scenario_grid(
+    metrics: pd.DataFrame,
+    *,
+    revenue_shocks: Sequence[float] = (0.0,),
+    rate_shocks: Sequence[float] = (0.0,),
+    capex_shocks: Sequence[float] = (0.0,),
+) -> ScenarioGrid:
+    """Evaluate every obligor's latest year over the full shock grid in one pass.
+
+    ``revenue_shocks`` scale revenue, earnings, cash flows and the Altman Z
+    by ``1 + shock`` (as :func:`~changwon_credit.analytics.build_scenarios`
+    does). ``rate_shocks`` add that rate (0.01 = +100bp) on the EAD proxy to
+    interest expense and debt service. ``capex_shocks`` change capital
+    expenditure by ``1 + shock`` on top of the revenue scaling, which flows
+    into free cash flow.
+    """
+
+    latest = metrics.sort_values(["company_code", "year"], kind="stable").drop_duplicates(
+        "company_code", keep="last"
+    )
+    base = {
+        name: latest[name].to_numpy(dtype=np.float64, na_value=np.nan).reshape(-1, 1, 1, 1)
+        for name in _BASE_COLUMNS
+    }
+    revenue_shocks = np.asarray(revenue_shocks, dtype=np.float64)
+    rate_shocks = np.asarray(rate_shocks, dtype=np.float64)
+    capex_shocks = np.asarray(capex_shocks, dtype=np.float64)
+    factor = 1.0 + revenue_shocks.reshape(1, -1, 1, 1)
+    rate = rate_shocks.reshape(1, 1, -1, 1)
+    capex = capex_shocks.reshape(1, 1, 1, -1)
+
+    revenue = base["revenue"] * factor
+    ebitda = base["ebitda"] * factor
+    # 금리 충격은 EAD proxy(총부채)에 가산금리를 적용한 추가 이자로 본다. EAD가 없으면 추가 이자 0.
+    extra_interest = rate * np.where(np.isnan(base["ead_proxy"]), 0.0, base["ead_proxy"])
+    # CAPEX는 매출 규모에 비례한다고 보고, 충격분만큼 FCF에서 더 뺀다.
+    free_cash_flow = (base["free_cash_flow"] - capex * base["investment_outflows"]) * factor
+    values = {
+        "revenue": revenue,
+        "operating_income": base["operating_income"] * factor,
+        "ebitda": ebitda,
+        "free_cash_flow": free_cash_flow,
+        "interest_coverage": safe_div(ebitda, base["interest_expense"] + extra_interest),
+        "dscr": safe_div(base["operating_cash_flow"] * factor, base["debt_service"] + extra_interest),
+        "fcf_margin": safe_div(free_cash_flow, revenue),
+        "pd_estimate": pd_from_altman(base["altman_z_score"] * factor),
+    }
+    return ScenarioGrid(
+        company_codes=latest["company_code"].to_numpy(dtype=object),
+        revenue_shocks=revenue_shocks,
+        rate_shocks=rate_shocks,
+        capex_shocks=capex_shocks,
+        values=values,
+    )
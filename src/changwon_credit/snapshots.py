@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Mapping
+
+import pandas as pd
+
+from .manifest import frame_hash
+
+LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = "snapshots"
+INDEX_DIR = "index"
+INDEX_COLUMNS = ["company_code", "table", "fetched_at", "hash"]
+
+
+class SnapshotStore:
+    """Content-addressed store of every raw FnGuide table ever fetched.
+
+    Each table is written once as a zstd-compressed Parquet object named by
+    its content hash (``objects/ab/<hash>.parquet``); refetching identical
+    figures only appends a line to ``index/<company_code>.jsonl`` recording
+    company, table, fetch time and hash, so looking up one company never
+    reads the others' fetches. :meth:`read` replays the tables as they stood
+    at any point in time.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_raw_dir(cls, raw_dir: Path) -> "SnapshotStore":
+        return cls(Path(raw_dir) / SNAPSHOT_DIR)
+
+    def index_path(self, company_code: str) -> Path:
+        return self.root / INDEX_DIR / f"{company_code}.jsonl"
+
+    def write(
+        self,
+        company_code: str,
+        tables: Mapping[str, pd.DataFrame],
+        fetched_at: datetime | None = None,
+    ) -> Dict[str, str]:
+        """Store one fetch of ``company_code`` and return ``{table: hash}``."""
+
+        stamp = _utc(fetched_at or datetime.now(timezone.utc)).isoformat()
+        hashes: Dict[str, str] = {}
+        lines = []
+        for name, df in sorted(tables.items()):
+            frame = _storable(df)
+            digest = frame_hash(frame)
+            path = self._object_path(digest)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # 같은 객체를 여러 워커 프로세스가 동시에 쓸 수 있으므로 임시 파일 이름을 구분한다.
+                tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+                frame.to_parquet(tmp_path, index=False, compression="zstd")
+                os.replace(tmp_path, path)
+            hashes[name] = digest
+            lines.append(
+                json.dumps(
+                    {"company_code": company_code, "table": name, "fetched_at": stamp, "hash": digest}
+                )
+            )
+        with self._lock:
+            index_path = self.index_path(company_code)
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            with index_path.open("a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
+        return hashes
+
+    def history(self, company_code: str | None = None) -> pd.DataFrame:
+        """Index rows (company_code, table, fetched_at, hash), oldest first.
+
+        With ``company_code`` only that company's index file is read.
+        """
+
+        if company_code is not None:
+            paths = [self.index_path(company_code)]
+        else:
+            paths = sorted((self.root / INDEX_DIR).glob("*.jsonl"))
+        frames = [
+            pd.read_json(path, lines=True, dtype={"company_code": str, "hash": str})
+            for path in paths
+            if path.exists() and path.stat().st_size
+        ]
+        if not frames:
+            return pd.DataFrame(columns=INDEX_COLUMNS)
+        index = pd.concat(frames, ignore_index=True)
+        index["fetched_at"] = pd.to_datetime(index["fetched_at"], utc=True, format="ISO8601")
+        return index[INDEX_COLUMNS].sort_values("fetched_at", kind="stable").reset_index(drop=True)
+
+    def read(
+        self, company_code: str, as_of: datetime | str | None = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Tables of the newest fetch of ``company_code`` at or before ``as_of``."""
+
+        index = self.history(company_code)
+        if as_of is not None:
+            cutoff = pd.Timestamp(as_of)
+            cutoff = cutoff.tz_localize("UTC") if cutoff.tzinfo is None else cutoff.tz_convert("UTC")
+            index = index[index["fetched_at"] <= cutoff]
+        latest = index.drop_duplicates("table", keep="last")
+        return {
+            row.table: pd.read_parquet(self._object_path(row.hash))
+            for row in latest.itertuples(index=False)
+        }
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.parquet"
+
+
+def _storable(df: pd.DataFrame) -> pd.DataFrame:
+    # 원천 표는 라벨·숫자가 섞인 object 열이 있을 수 있어 Parquet에 맞게 문자열로 고정한다.
+    frame = df.reset_index(drop=True)
+    frame.columns = [str(column) for column in frame.columns]
+    mixed = [
+        column
+        for column in frame.columns
+        if frame[column].dtype == object
+        and frame[column].dropna().map(type).nunique() > 1
+    ]
+    if mixed:
+        frame[mixed] = frame[mixed].astype("string")
+    return frame
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass(slots=True)
+class Stage:
+    """One step of a :class:`StagedPipeline`.
+
+    ``workers`` threads pull from the stage's bounded input queue. With
+    ``processes=True`` each thread hands its item to a shared process pool
+    of the same size, which lets CPU-bound pandas work run outside the GIL
+    while I/O stages keep overlapping with it. ``func`` may return ``None``
+    to drop an item (e.g. an unchanged company).
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 8
+    processes: bool = False
+
+
+@dataclass(slots=True)
+class StageStats:
+    name: str
+    workers: int
+    queue_size: int
+    depth: int = 0
+    max_depth: int = 0
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+
+    @property
+    def throughput(self) -> float:
+        """Items completed per wall-clock second since the pipeline started."""
+
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of the stage's worker time spent inside ``func``."""
+
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        capacity = elapsed * self.workers
+        return self.busy_seconds / capacity if capacity > 0 else 0.0
+
+
+@dataclass(slots=True)
+class StageFailure:
+    stage: str
+    item: Any
+    error: BaseException
+
+
+class StagedPipeline:
+    """Run items through stages connected by bounded queues.
+
+    Every stage owns a ``queue.Queue(maxsize=queue_size)``; a full queue
+    blocks the upstream workers, so a slow stage throttles the ones before it
+    instead of letting work pile up in memory. Failures are isolated per item
+    and surface as :class:`StageFailure` results at the end of the pipeline.
+    """
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage.")
+        self.stages = list(stages)
+        self._queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        self._output: queue.Queue = queue.Queue()
+        self._stats = [
+            StageStats(name=stage.name, workers=stage.workers, queue_size=stage.queue_size)
+            for stage in self.stages
+        ]
+        self._remaining = [stage.workers for stage in self.stages]
+        self._lock = threading.Lock()
+
+    def stats(self) -> List[StageStats]:
+        """Snapshot per-stage counters, including the live queue depth."""
+
+        with self._lock:
+            for stats, stage_queue in zip(self._stats, self._queues):
+                stats.depth = stage_queue.qsize()
+            return list(self._stats)
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Feed ``items`` through every stage, yielding final results as they arrive."""
+
+        executors: List[Executor | None] = [
+            ProcessPoolExecutor(max_workers=stage.workers) if stage.processes else None
+            for stage in self.stages
+        ]
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(index, executors[index]),
+                name=f"stage-{stage.name}-{worker}",
+                daemon=True,
+            )
+            for index, stage in enumerate(self.stages)
+            for worker in range(stage.workers)
+        ]
+        feeder = threading.Thread(target=self._feed, args=(items,), name="stage-feeder", daemon=True)
+        for thread in threads:
+            thread.start()
+        feeder.start()
+        try:
+            while True:
+                result = self._output.get()
+                if result is _DONE:
+                    break
+                yield result
+        finally:
+            feeder.join()
+            for thread in threads:
+                thread.join()
+            for executor in executors:
+                if executor is not None:
+                    executor.shutdown()
+
+    def _feed(self, items: Iterable[Any]) -> None:
+        first = self._queues[0]
+        try:
+            for item in items:
+                first.put(item)
+                self._note_depth(0)
+        finally:
+            for _ in range(self.stages[0].workers):
+                first.put(_DONE)
+
+    def _work(self, index: int, executor: Executor | None) -> None:
+        stage = self.stages[index]
+        stats = self._stats[index]
+        inbox = self._queues[index]
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if isinstance(item, StageFailure):
+                self._emit(index, item)
+                continue
+            started = time.perf_counter()
+            try:
+                if executor is not None:
+                    result = executor.submit(stage.func, item).result()
+                else:
+                    result = stage.func(item)
+            except Exception as exc:  # noqa: BLE001 - isolate per-item failures
+                LOGGER.warning("Stage %s failed: %s", stage.name, exc)
+                result = StageFailure(stage=stage.name, item=item, error=exc)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats.busy_seconds += elapsed
+                if isinstance(result, StageFailure):
+                    stats.failed += 1
+                elif result is None:
+                    stats.dropped += 1
+                else:
+                    stats.processed += 1
+            if result is not None:
+                self._emit(index, result)
+        self._finish(index)
+
+    def _emit(self, index: int, result: Any) -> None:
+        if index + 1 < len(self.stages):
+            self._queues[index + 1].put(result)
+            self._note_depth(index + 1)
+        else:
+            self._output.put(result)
+
+    def _note_depth(self, index: int) -> None:
+        depth = self._queues[index].qsize()
+        with self._lock:
+            stats = self._stats[index]
+            stats.max_depth = max(stats.max_depth, depth)
+
+    def _finish(self, index: int) -> None:
+        with self._lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+            if last:
+                self._stats[index].finished_at = time.perf_counter()
+        if not last:
+            return
+        if index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].workers):
+                self._queues[index + 1].put(_DONE)
+        else:
+            self._output.put(_DONE)
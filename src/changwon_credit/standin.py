@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable
+from urllib.parse import parse_qs, urlsplit
+
+from .fixtures import load_recorded_tables, render_finance_page, synthesize_tables
+
+FINANCE_PATH = "/SVO2/ASP/SVD_Finance.asp"
+
+
+@dataclass(slots=True)
+class StandInSettings:
+    """Behaviour knobs for the local FnGuide stand-in."""
+
+    pages_dir: Path | None = None
+    template_raw_dir: Path = Path("data_raw")
+    template_code: str = "034020"
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rps: float | None = None
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class StandInStats:
+    requests: int = 0
+    served: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    throttled: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def bump(self, name: str) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class FnGuideStandIn:
+    """Serve recorded or synthesized ``SVD_Finance`` pages over local HTTP.
+
+    Pages come from ``<pages_dir>/<code>.html`` when present; otherwise they
+    are synthesized from the template company's raw CSVs, scaled per company
+    code so every ticker gets distinct but well-formed statements. Latency,
+    random 503s and a requests-per-second throttle (answered with 429) let
+    load tests exercise the fetch path without touching FnGuide.
+    """
+
+    def __init__(self, settings: StandInSettings | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.settings = settings or StandInSettings()
+        self.stats = StandInStats()
+        self._pages: Dict[str, str] = {}
+        self._pages_lock = threading.Lock()
+        self._template = None
+        self._rng = random.Random(self.settings.seed)
+        self._rng_lock = threading.Lock()
+        self._throttle_lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{FINANCE_PATH}"
+
+    def start(self) -> "FnGuideStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FnGuideStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def page_for(self, company_code: str) -> str:
+        page = self._pages.get(company_code)
+        if page is not None:
+            return page
+        recorded = (
+            self.settings.pages_dir / f"{company_code}.html" if self.settings.pages_dir else None
+        )
+        if recorded is not None and recorded.exists():
+            page = recorded.read_text(encoding="utf-8")
+        else:
+            with self._pages_lock:
+                if self._template is None:
+                    self._template = load_recorded_tables(
+                        self.settings.template_raw_dir, self.settings.template_code
+                    )
+            seed = int(company_code) if company_code.isdigit() else len(self._pages)
+            page = render_finance_page(synthesize_tables(self._template, seed))
+        with self._pages_lock:
+            return self._pages.setdefault(company_code, page)
+
+    def prewarm(self, company_codes: Iterable[str]) -> None:
+        """Render pages ahead of time so load tests time the client, not the stand-in."""
+
+        for company_code in company_codes:
+            self.page_for(company_code)
+
+    def _throttled(self) -> bool:
+        limit = self.settings.throttle_rps
+        if not limit:
+            return False
+        with self._throttle_lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > limit
+
+    def _draw(self) -> tuple[float, float]:
+        with self._rng_lock:
+            return self._rng.random(), self._rng.uniform(-1.0, 1.0)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                standin.stats.bump("requests")
+                parts = urlsplit(self.path)
+                if parts.path != FINANCE_PATH:
+                    self._reply(404, b"not found")
+                    return
+                settings = standin.settings
+                error_draw, jitter_draw = standin._draw()
+                delay_ms = max(0.0, settings.latency_ms + settings.jitter_ms * jitter_draw)
+                if delay_ms:
+                    time.sleep(delay_ms / 1000)
+                if standin._throttled():
+                    standin.stats.bump("throttled")
+                    self._reply(429, b"too many requests", {"Retry-After": "1"})
+                    return
+                if error_draw < settings.error_rate:
+                    standin.stats.bump("errors")
+                    self._reply(503, b"service unavailable")
+                    return
+
+                gicode = parse_qs(parts.query).get("gicode", [""])[0]
+                company_code = gicode[1:] if gicode.startswith("A") else gicode
+                body = standin.page_for(company_code).encode("utf-8")
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    standin.stats.bump("not_modified")
+                    self._reply(304, b"", {"ETag": etag})
+                    return
+                standin.stats.bump("served")
+                self._reply(200, body, {"ETag": etag, "Content-Type": "text/html; charset=utf-8"})
+
+            def _reply(self, status: int, body: bytes, headers: Dict[str, str] | None = None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return
+
+        return Handler
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a local FnGuide SVD_Finance stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages-dir", type=Path, help="Directory of recorded <code>.html pages.")
+    parser.add_argument("--template-raw-dir", type=Path, default=Path("data_raw"))
+    parser.add_argument("--template-code", default="034020")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rps", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    settings = StandInSettings(
+        pages_dir=args.pages_dir,
+        template_raw_dir=args.template_raw_dir,
+        template_code=args.template_code,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rps=args.throttle_rps,
+        seed=args.seed,
+    )
+    standin = FnGuideStandIn(settings, host=args.host, port=args.port)
+    print(f"FnGuide stand-in listening on {standin.url}")
+    standin.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
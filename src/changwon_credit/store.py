@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+LOGGER = logging.getLogger(__name__)
+
+DATASETS = ("fs_income", "fs_balance", "fs_cashflow", "credit_profile", "analytics_credit")
+# 분기 데이터셋은 company_code/year 파티션 안에 분기별 행을 두고, 최신 적재를 분기 단위로 고른다.
+QUARTERLY_DATASETS = ("fs_quarterly", "credit_ttm")
+PARTITION_KEYS = ["company_code", "year"]
+QUARTER_KEYS = [*PARTITION_KEYS, "quarter"]
+# 압축과 겹친 읽기는 파일 목록을 다시 만들어 재시도한다.
+READ_ATTEMPTS = 3
+LOADED_AT = "_loaded_at"
+# 종목코드는 "034020"처럼 0으로 시작하므로 파티션 값을 문자열로 고정한다.
+PARTITIONING = ds.partitioning(
+    pa.schema([("company_code", pa.string()), ("year", pa.int64())]), flavor="hive"
+)
+
+
+def append_partitions(processed_dir: Path, name: str, frame: pd.DataFrame) -> int:
+    """Append ``frame`` to ``<processed_dir>/<name>/company_code=…/year=…/``.
+
+    Existing files are never rewritten: each call adds one part per touched
+    partition, stamped with its load time, and readers keep the newest load
+    of every partition (of every quarter for :data:`QUARTERLY_DATASETS`, so
+    a load may carry only some quarters of a year). :func:`compact` later
+    folds the parts together.
+    """
+
+    if frame.empty:
+        return 0
+    loaded_at = time.time_ns()
+    # 파티션 키는 경로에 문자열/정수로 기록되므로 category·int16 열을 파티션 스키마 타입으로 맞춘다.
+    frame = frame.astype({"company_code": str, "year": "int64"}).assign(**{LOADED_AT: loaded_at})
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    ds.write_dataset(
+        table,
+        Path(processed_dir) / name,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"part-{loaded_at}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return len(frame)
+
+
+def read_processed(
+    processed_dir: Path,
+    name: str,
+    *,
+    company_codes: Sequence[str] | None = None,
+    years: Iterable[int] | None = None,
+    columns: Sequence[str] | None = None,
+    memory_map: bool = False,
+) -> pd.DataFrame:
+    """Read the newest rows of a partitioned dataset, pruning by company and year.
+
+    Company and year filters are applied to the partition directories, so
+    only the matching files are opened. ``memory_map`` maps the files
+    instead of reading them into Arrow buffers. If :func:`compact` removes a
+    listed part mid-read, the files are listed again and the read retried.
+    """
+
+    keys = row_keys(name)
+    root = Path(processed_dir) / name
+    if not root.exists():
+        return pd.DataFrame(columns=list(columns or keys))
+    expression = None
+    if company_codes is not None:
+        expression = ds.field("company_code").isin([str(code) for code in company_codes])
+    if years is not None:
+        in_years = ds.field("year").isin([int(year) for year in years])
+        expression = in_years if expression is None else expression & in_years
+    wanted = None
+    if columns is not None:
+        wanted = list(dict.fromkeys([*keys, *columns, LOADED_AT]))
+    for attempt in range(READ_ATTEMPTS):
+        try:
+            dataset = ds.dataset(
+                str(root.resolve()),
+                format="parquet",
+                partitioning=PARTITIONING,
+                filesystem=pafs.LocalFileSystem(use_mmap=memory_map),
+            )
+            table = dataset.to_table(columns=wanted, filter=expression)
+            break
+        except FileNotFoundError:
+            # 압축본은 옛 파트를 지우기 전에 쓰이므로 다시 나열하면 같은 결과를 읽는다.
+            if attempt == READ_ATTEMPTS - 1:
+                raise
+            LOGGER.debug("Parts of %s were compacted during the read; listing again", name)
+    return _latest(table.to_pandas(), columns, keys)
+
+
+def row_keys(name: str) -> List[str]:
+    """Columns that identify one stored row of dataset ``name``."""
+
+    return list(QUARTER_KEYS if name in QUARTERLY_DATASETS else PARTITION_KEYS)
+
+
+def compact(processed_dir: Path, names: Sequence[str] = (*DATASETS, *QUARTERLY_DATASETS)) -> int:
+    """Rewrite every partition holding several parts as a single file.
+
+    Only the newest load of each row key survives. The compacted file is
+    written before the old parts are removed, so both sets resolve to the
+    same rows; a :func:`read_processed` that listed a part removed here
+    lists the files again. Returns the partitions compacted.
+    """
+
+    compacted = 0
+    for name in names:
+        root = Path(processed_dir) / name
+        keys = [key for key in row_keys(name) if key not in PARTITION_KEYS]
+        for partition, parts in _partition_parts(root).items():
+            if len(parts) < 2:
+                continue
+            table = pa.concat_tables(
+                [pq.read_table(part) for part in parts], promote_options="default"
+            )
+            newest = pc.max(table[LOADED_AT]).as_py()
+            if keys:
+                latest = table.group_by(keys).aggregate([(LOADED_AT, "max")])
+                table = table.join(
+                    latest.rename_columns([*keys, LOADED_AT]), [*keys, LOADED_AT], join_type="inner"
+                )
+            else:
+                table = table.filter(pc.equal(table[LOADED_AT], newest))
+            target = partition / f"part-{newest}-compacted.parquet"
+            tmp_path = partition / f".{target.name}.tmp"
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, target)
+            for part in parts:
+                if part != target:
+                    part.unlink()
+            compacted += 1
+    if compacted:
+        LOGGER.info("Compacted %d partitions under %s", compacted, processed_dir)
+    return compacted
+
+
+def _latest(
+    frame: pd.DataFrame, columns: Sequence[str] | None, keys: Sequence[str] = PARTITION_KEYS
+) -> pd.DataFrame:
+    keys = list(keys)
+    newest = frame.groupby(keys, sort=False)[LOADED_AT].transform("max")
+    frame = frame[frame[LOADED_AT] == newest].drop(columns=LOADED_AT)
+    frame = frame.astype({"company_code": str, "year": "int64"})
+    frame = frame.sort_values(keys, kind="stable").reset_index(drop=True)
+    ordered = list(columns) if columns is not None else [
+        *keys,
+        *(column for column in frame.columns if column not in keys),
+    ]
+    return frame[ordered]
+
+
+def _partition_parts(root: Path) -> Dict[Path, List[Path]]:
+    partitions: Dict[Path, List[Path]] = {}
+    for part in sorted(root.glob("company_code=*/year=*/part-*.parquet")):
+        partitions.setdefault(part.parent, []).append(part)
+    return partitions
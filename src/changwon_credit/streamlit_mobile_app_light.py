@@ -6,8 +6,8 @@ from typing import Literal
 import pandas as pd
 import streamlit as st
 
-from changwon_credit.analytics import build_scenarios, compute_credit_metrics
-from changwon_credit.etl import run_pipeline
+from changwon_credit import warehouse
+from changwon_credit.analytics import build_scenarios
 from changwon_credit.glossary import GLOSSARY
 from changwon_credit.models import CreditConfig, load_config
 from changwon_credit.visuals import (
@@ -40,12 +40,11 @@ def _apply_light_theme() -> None:
 
 
 @st.cache_data(show_spinner=False)
-def load_metrics(config_path: str) -> tuple[pd.DataFrame, CreditConfig]:
-    """Run the ETL/analytics pipeline once and cache the result for reruns."""
+def load_metrics(config_path: str, refresh: bool = False) -> tuple[pd.DataFrame, CreditConfig]:
+    """Load metrics from the local warehouse (or rerun the ETL on refresh) and cache them."""
 
     cfg = load_config(Path(config_path))
-    merged = run_pipeline(cfg)
-    metrics = compute_credit_metrics(merged)
+    metrics = warehouse.load_metrics(cfg, refresh=refresh)
     return metrics, cfg
 
 
@@ -177,13 +176,21 @@ def main() -> None:
         options=list(MENU_KEYS),
         format_func=lambda key: MENU_LABELS[key],
     )
+    refresh = st.sidebar.button("Refresh from FnGuide")
     st.sidebar.markdown("---")
     st.sidebar.caption("Need external access? Add `--server.address 0.0.0.0`.")
 
     _apply_light_theme()
 
-    with st.spinner("Fetching FnGuide snapshots and calculating metrics..."):
-        metrics, cfg = load_metrics(config_path)
+    if refresh:
+        load_metrics.clear()
+    spinner = "Fetching FnGuide snapshots..." if refresh else "Loading the local warehouse..."
+    with st.spinner(spinner):
+        try:
+            metrics, cfg = load_metrics(config_path, refresh)
+        except LookupError as exc:
+            st.error(str(exc))
+            st.stop()
 
     if selected_menu == "overview":
         render_summary(metrics, cfg)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import pandas as pd
+
+from .etl import MANIFEST_NAME, refresh_company, refresh_quarterly
+from .manifest import FetchManifest, ManifestEntry
+from .models import CreditConfig, config_for_company
+
+LOGGER = logging.getLogger(__name__)
+
+STATE_NAME = "universe_state.json"
+
+
+@dataclass(slots=True)
+class UniverseState:
+    """Checkpoint of a universe run: finished companies and per-company failures."""
+
+    done: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "UniverseState":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(asdict(self), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+@dataclass(slots=True)
+class UniverseSummary:
+    companies: int
+    refreshed: int
+    unchanged: int
+    skipped: int
+    failed: int
+    elapsed: float
+
+
+@dataclass(slots=True)
+class _Outcome:
+    company_code: str
+    entry: ManifestEntry | None
+    changed: bool
+    raw_tables: Dict[str, pd.DataFrame] | None = None
+
+
+def run_universe(
+    config: CreditConfig,
+    company_codes: Sequence[str],
+    *,
+    workers: int | None = None,
+    restart: bool = False,
+    force: bool = False,
+) -> UniverseSummary:
+    """Refresh many companies in a process pool, checkpointing each one.
+
+    Every company runs the single-company ETL (:func:`refresh_company`, whose
+    :func:`~changwon_credit.etl.update_metrics` computes only newly appended
+    years) in its own worker process and commits its rows to the
+    Parquet store and SQLite before reporting back. The parent alone owns the
+    fetch manifest, the quarterly store and ``universe_state.json``, and
+    saves them after every finished company, so an interrupted run resumes
+    with the companies not yet done. A failing company is recorded in the
+    state and retried on the next run without affecting the others. The
+    state is cleared once every company has finished; ``restart`` discards
+    it up front.
+    """
+
+    started = time.perf_counter()
+    state_path = config.processed_dir / STATE_NAME
+    state = UniverseState() if restart else UniverseState.load(state_path)
+    done = set(state.done)
+    codes = list(dict.fromkeys(company_codes))
+    pending = [code for code in codes if code not in done]
+    manifest = FetchManifest.load(config.processed_dir / MANIFEST_NAME)
+    refreshed = unchanged = 0
+
+    # 작업 프로세스는 자기 회사 행만 저장하고, 공유 JSON/분기 파일은 부모가 순서대로 갱신한다.
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {
+                pool.submit(_refresh_one, config, code, manifest.get(code), force): code
+                for code in pending
+            }
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    outcome = future.result()
+                    if outcome.raw_tables is not None:
+                        refresh_quarterly(
+                            outcome.raw_tables, config_for_company(config, code), force=force
+                        )
+                except Exception as exc:  # noqa: BLE001 - one company must not stop the universe
+                    LOGGER.warning("Universe refresh of %s failed: %s", code, exc)
+                    state.failed[code] = str(exc)
+                else:
+                    if outcome.entry is not None:
+                        manifest.record(code, outcome.entry)
+                    state.failed.pop(code, None)
+                    state.done.append(code)
+                    refreshed += outcome.changed
+                    unchanged += not outcome.changed
+                _checkpoint(state, state_path, manifest)
+                LOGGER.info(
+                    "Universe %d/%d companies (%d failed)",
+                    len(state.done),
+                    len(codes),
+                    len(state.failed),
+                )
+    finally:
+        _checkpoint(state, state_path, manifest)
+
+    if set(codes) <= set(state.done):
+        state_path.unlink(missing_ok=True)
+    return UniverseSummary(
+        companies=len(codes),
+        refreshed=refreshed,
+        unchanged=unchanged,
+        skipped=len(codes) - len(pending),
+        failed=len(state.failed),
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def _refresh_one(
+    config: CreditConfig, company_code: str, previous: ManifestEntry | None, force: bool
+) -> _Outcome:
+    cfg = config_for_company(config, company_code)
+    manifest = FetchManifest(
+        cfg.processed_dir / MANIFEST_NAME, {company_code: previous} if previous else None
+    )
+    run = refresh_company(cfg, force=force, manifest=manifest, update_quarterly=False)
+    quarterly = cfg.frequency == "quarterly" and run.changed
+    return _Outcome(
+        company_code=company_code,
+        entry=manifest.get(company_code) if run.changed else None,
+        changed=run.changed,
+        raw_tables=run.raw_tables if quarterly else None,
+    )
+
+
+def _checkpoint(state: UniverseState, state_path: Path, manifest: FetchManifest) -> None:
+    state.save(state_path)
+    manifest.save()
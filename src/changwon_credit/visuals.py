@@ -10,6 +10,20 @@ import plotly.graph_objects as go
 from .models import CreditConfig
 
 
+FIGURES = (
+    ("01_performance.png", "실적·현금흐름 추세"),
+    ("02_coverage.png", "DSCR & Interest Coverage"),
+    ("03_altman_pd.png", "Altman Z vs PD"),
+    ("04_scenario.png", "Stress Scenario DSCR/PD"),
+)
+
+
+def figure_list() -> List[dict]:
+    """Titles and report-relative paths of the charts :func:`build_charts` writes."""
+
+    return [{"title": title, "path": str(Path("figures") / name)} for name, title in FIGURES]
+
+
 def build_charts(
     metrics: pd.DataFrame,
     scenarios: pd.DataFrame,
@@ -20,36 +34,15 @@ def build_charts(
     output_dir = config.report_path.parent / "figures"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    artifacts = []
-    artifacts.append(
-        _save_figure(
-            _performance_chart(metrics, config),
-            output_dir / "01_performance.png",
-            "실적·현금흐름 추세",
-        )
-    )
-    artifacts.append(
-        _save_figure(
-            _coverage_chart(metrics),
-            output_dir / "02_coverage.png",
-            "DSCR & Interest Coverage",
-        )
-    )
-    artifacts.append(
-        _save_figure(
-            _risk_chart(metrics),
-            output_dir / "03_altman_pd.png",
-            "Altman Z vs PD",
-        )
-    )
-    artifacts.append(
-        _save_figure(
-            _scenario_chart(scenarios),
-            output_dir / "04_scenario.png",
-            "Stress Scenario DSCR/PD",
-        )
-    )
-    return artifacts
+    charts = [
+        _performance_chart(metrics, config),
+        _coverage_chart(metrics),
+        _risk_chart(metrics),
+        _scenario_chart(scenarios),
+    ]
+    return [
+        _save_figure(fig, output_dir / name, title) for fig, (name, title) in zip(charts, FIGURES)
+    ]
 
 
 def _performance_chart(metrics: pd.DataFrame, config: CreditConfig) -> go.Figure:
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import logging
+
+import pandas as pd
+
+from .analytics import compute_credit_metrics
+from .db import enforce_dtypes, load_schema, shared_read_pool
+from .etl import run_pipeline
+from .models import CreditConfig
+from .store import read_processed
+
+LOGGER = logging.getLogger(__name__)
+
+# 분할 저장소 이전 릴리스가 남긴 단일 파일. 저장소가 비어 있으면 이 파일과 financials_* 표를 읽는다.
+LEGACY_PROFILE_NAME = "credit_profile.parquet"
+_SQLITE_QUERIES = (
+    "SELECT * FROM credit_profile WHERE company_code = ? ORDER BY year",
+    "SELECT * FROM financials_income JOIN financials_balance USING (company_code, year) "
+    "JOIN financials_cashflow USING (company_code, year) WHERE company_code = ? ORDER BY year",
+)
+
+
+def load_merged(config: CreditConfig, *, memory_map: bool = False) -> pd.DataFrame:
+    """Merged statements of ``config.company_code`` from the processed store, no network.
+
+    Reads the partitioned ``credit_profile`` dataset (optionally through
+    memory-mapped files). Stores written by older releases are read as they
+    are: the single-file ``credit_profile.parquet``, then the SQLite
+    ``credit_profile`` table, then the ``financials_*`` tables joined per
+    year. Only the latest ``config.years`` years are returned, as
+    :func:`~changwon_credit.etl.run_pipeline` would.
+    """
+
+    code = config.company_code
+    merged = read_processed(
+        config.processed_dir, "credit_profile", company_codes=[code], memory_map=memory_map
+    )
+    legacy_path = config.processed_dir / LEGACY_PROFILE_NAME
+    if merged.empty and legacy_path.exists():
+        LOGGER.info("No partitioned store for %s; reading %s", code, legacy_path)
+        merged = pd.read_parquet(legacy_path, memory_map=memory_map)
+        merged = merged[merged["company_code"].astype(str) == code]
+    for sql in _SQLITE_QUERIES:
+        if not merged.empty or not config.sqlite_path.exists():
+            break
+        LOGGER.info("No Parquet store for %s; reading %s", code, config.sqlite_path)
+        try:
+            merged = shared_read_pool(config.sqlite_path).read_frame(sql, [code])
+        except pd.errors.DatabaseError:
+            merged = pd.DataFrame()
+    if merged.empty:
+        raise LookupError(
+            f"No processed statements for {code} under {config.processed_dir}; "
+            "run `changwon-credit` first or refresh from FnGuide."
+        )
+    latest = sorted(merged["year"].unique())[-config.years :]
+    merged = merged[merged["year"].isin(latest)].reset_index(drop=True)
+    return enforce_dtypes(merged, load_schema()["credit_profile"])
+
+
+def load_metrics(
+    config: CreditConfig, *, refresh: bool = False, memory_map: bool = False
+) -> pd.DataFrame:
+    """Credit metrics for the dashboards: warehouse by default, live ETL on ``refresh``."""
+
+    if refresh:
+        merged = run_pipeline(config)
+    else:
+        merged = load_merged(config, memory_map=memory_map)
+    return enforce_dtypes(
+        compute_credit_metrics(merged),
+        load_schema()["analytics_credit"],
+        float32_ratios=config.float32_ratios,
+    )
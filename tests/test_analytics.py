@@ -1,9 +1,12 @@
+import numpy as np
 import pandas as pd
 
 from changwon_credit.analytics import (
     build_credit_story,
     build_scenarios,
     compute_credit_metrics,
+    extend_credit_metrics,
+    metric_state,
 )
 
 
@@ -68,3 +71,42 @@ def test_build_scenarios_outputs_three_cases():
     assert "interest_coverage" in scenarios.columns
     assert "pd_estimate" in scenarios.columns
     assert "dscr" in scenarios.columns
+
+
+def test_compute_credit_metrics_keeps_lags_within_each_company():
+    first = _sample_frame()
+    second = _sample_frame().assign(
+        company_code="012450", revenue=[1000.0, 900.0, 990.0], total_liabilities=[500.0, 400.0, 450.0]
+    )
+    # 연도별로 회사가 섞인 입력이어도 성장률·상환액은 회사 안에서만 계산한다.
+    panel = pd.concat([second, first]).sort_values("year", kind="stable")
+    metrics = compute_credit_metrics(panel)
+
+    assert list(metrics["company_code"]) == ["012450"] * 3 + ["034020"] * 3
+    by_code = {code: group.reset_index(drop=True) for code, group in metrics.groupby("company_code")}
+    assert by_code["012450"]["revenue_growth"].isna().iloc[0]
+    assert by_code["012450"]["revenue_growth"].iloc[1:].round(3).tolist() == [-0.1, 0.1]
+    assert by_code["012450"]["debt_service"].tolist() == [2.0, 102.5, 2.0]
+    single = compute_credit_metrics(first)
+    pd.testing.assert_frame_equal(by_code["034020"], single, check_dtype=False)
+
+
+def test_extend_credit_metrics_matches_a_full_recompute():
+    history = pd.concat(
+        [
+            _sample_frame(),
+            _sample_frame().assign(year=[2024, 2025, 2026], revenue=[160.0, 0.0, 180.0]),
+            _sample_frame().assign(company_code="012450", net_income=[5.0, np.nan, 4.0]),
+        ],
+        ignore_index=True,
+    )
+    full = compute_credit_metrics(history)
+    # 2023년까지 계산한 상태에서 FnGuide 최근 3개년 창만 받아 새 연도를 이어 붙인다.
+    state = metric_state(compute_credit_metrics(history[history["year"] <= 2023]))
+    window = history[history["year"] >= 2024 - 1]
+    fresh = extend_credit_metrics(window.iloc[::-1], state)
+
+    expected = full[full["year"] > 2023].reset_index(drop=True)
+    pd.testing.assert_frame_equal(fresh, expected, check_exact=False, rtol=1e-12)
+    assert state.set_index("company_code").loc["012450", "retained_earnings_proxy"] == 9.0
+    assert extend_credit_metrics(window[window["year"] <= 2023], state).empty
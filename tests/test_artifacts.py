@@ -0,0 +1,42 @@
+import pandas as pd
+
+from changwon_credit.artifacts import ArtifactManifest, hash_inputs
+from changwon_credit.dag import Node, StageGraph
+
+
+def test_stages_rerun_only_when_inputs_or_outputs_change(tmp_path):
+    output = tmp_path / "report.md"
+    template = tmp_path / "template.typ"
+    template.write_text("v1", encoding="utf-8")
+    calls = []
+
+    def report(frame):
+        calls.append(1)
+        output.write_text(f"dscr {frame['dscr'].iloc[0]}", encoding="utf-8")
+        return {"pages": 1}
+
+    graph = StageGraph(
+        [
+            Node("report", report, inputs=("frame",), output=dict, sources=(template,),
+                 writes=lambda _: [output]),
+        ]
+    )
+
+    def run(frame):
+        manifest = ArtifactManifest.load(tmp_path / "artifact_manifest.json")
+        result = graph.run({"frame": frame}, manifest=manifest, cache_dir=tmp_path / ".stages")
+        manifest.save()
+        return result.values["report"], result.rebuilt == ["report"]
+
+    frame = pd.DataFrame({"year": [2023], "dscr": [1.4]})
+    assert run(frame) == ({"pages": 1}, True)
+    assert run(frame.copy()) == ({"pages": 1}, False)
+    record = ArtifactManifest.load(tmp_path / "artifact_manifest.json").entries["report"]
+    assert record.digest == hash_inputs({"pages": 1}, output)
+
+    template.write_text("v2", encoding="utf-8")
+    assert run(frame)[1] is True
+    output.unlink()
+    assert run(frame)[1] is True
+    assert run(frame.assign(dscr=1.5))[1] is True
+    assert len(calls) == 4
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from changwon_credit import backfill
+from changwon_credit.models import CreditConfig
+from changwon_credit.standin import FnGuideStandIn, StandInSettings
+
+RAW_DIR = Path(__file__).resolve().parents[1] / "data_raw"
+
+
+def _config(tmp_path, url) -> CreditConfig:
+    return CreditConfig(
+        company_name="TestCo",
+        company_code="000000",
+        industry="Test",
+        years=2,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "db.sqlite",
+        report_path=tmp_path / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+        cache_dir=None,
+        fnguide_url=url,
+    )
+
+
+def test_backfill_resumes_after_interruption(tmp_path, monkeypatch):
+    import sqlite3
+
+    codes = [f"{100000 + index:06d}" for index in range(5)]
+    with FnGuideStandIn(StandInSettings(template_raw_dir=RAW_DIR)) as standin:
+        cfg = _config(tmp_path, standin.url)
+        original = backfill._write_history_sql
+        calls = {"count": 0}
+
+        def crash_on_second_chunk(*args, **kwargs):
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise KeyboardInterrupt
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(backfill, "_write_history_sql", crash_on_second_chunk)
+        with pytest.raises(KeyboardInterrupt):
+            backfill.run_backfill(cfg, codes, chunk_size=2, max_workers=2)
+        assert backfill.BackfillState.load(
+            cfg.processed_dir / backfill.HISTORY_DIR / backfill.STATE_NAME
+        ).done == codes[:2]
+
+        monkeypatch.setattr(backfill, "_write_history_sql", original)
+        summary = backfill.run_backfill(cfg, codes, chunk_size=2, max_workers=2)
+        assert (summary.loaded, summary.skipped, summary.failed) == (3, 2, 0)
+        served = standin.stats.served
+
+        again = backfill.run_backfill(cfg, codes, chunk_size=2)
+        assert again.loaded == 0 and standin.stats.served == served
+
+    history = backfill.read_history(cfg)
+    years = sorted(history["year"].unique())
+    assert sorted(history["company_code"].unique()) == codes
+    assert len(history) == len(codes) * len(years)
+    assert list(history.columns[2:]) == backfill.METRIC_COLUMNS
+    assert len(list((cfg.processed_dir / backfill.HISTORY_DIR).glob("chunk-*.parquet"))) == 3
+    with sqlite3.connect(cfg.sqlite_path) as conn:
+        (count,) = conn.execute(f"SELECT COUNT(*) FROM {backfill.HISTORY_TABLE}").fetchone()
+    assert count == len(history)
+
+    csv_path = cfg.raw_dir / f"{codes[0]}_fs_income_{years[0]}_{years[-1]}.csv"
+    assert csv_path.read_text(encoding="utf-8").splitlines()[0] == (
+        "fiscal_year,fiscal_type,account_code,account_name_kr,account_name_en,value_mil_krw"
+    )
+    subset = backfill.read_history(cfg, company_codes=codes[:1])
+    assert subset["company_code"].unique().tolist() == codes[:1]
+
+
+def test_backfill_feeds_credit_profile_and_metrics(tmp_path, monkeypatch):
+    from changwon_credit.query import query
+    from changwon_credit.store import read_processed
+
+    codes = ["100000", "100001"]
+    writes = []
+    original = backfill.persist_metrics
+
+    def recording_persist(metrics, config):
+        writes.append(metrics)
+        return original(metrics, config)
+
+    monkeypatch.setattr(backfill, "persist_metrics", recording_persist)
+    with FnGuideStandIn(StandInSettings(template_raw_dir=RAW_DIR)) as standin:
+        cfg = _config(tmp_path, standin.url)
+        backfill.run_backfill(cfg, codes, chunk_size=2)
+    # 청크 하나의 지표는 회사 수와 무관하게 한 번에 저장된다.
+    assert len(writes) == 1 and sorted(writes[0]["company_code"].unique()) == codes
+
+    years = sorted(backfill.read_history(cfg)["year"].unique())
+    # 백필한 과거 연도는 credit_profile·analytics_credit과 DuckDB 뷰에서 그대로 보인다.
+    profile = read_processed(cfg.processed_dir, "credit_profile", company_codes=codes[:1])
+    assert profile["year"].tolist() == years
+    metrics = read_processed(cfg.processed_dir, "analytics_credit", company_codes=codes[:1])
+    assert metrics["year"].tolist() == years
+    assert metrics["altman_z_score"].notna().all()
+    seen = query(
+        cfg,
+        "SELECT company_code, COUNT(DISTINCT year) AS n FROM analytics_credit "
+        "GROUP BY company_code ORDER BY company_code",
+    )
+    assert seen["company_code"].tolist() == codes
+    assert (seen["n"] == len(years)).all()
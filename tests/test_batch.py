@@ -0,0 +1,134 @@
+from pathlib import Path
+
+from changwon_credit.batch import build_batch_pipeline, company_jobs
+from changwon_credit.models import CreditConfig
+from changwon_credit.standin import FnGuideStandIn
+
+
+def test_batch_pipeline_refreshes_each_company(tmp_path):
+    with FnGuideStandIn() as standin:
+        cfg = CreditConfig(
+            company_name="TestCo",
+            company_code="000000",
+            industry="Test",
+            years=3,
+            data_source="Test",
+            raw_dir=tmp_path / "raw",
+            processed_dir=tmp_path / "processed",
+            sqlite_path=tmp_path / "processed" / "db.sqlite",
+            report_path=tmp_path / "reports" / "report.md",
+            analyst="QA",
+            currency="KRW bn",
+            bank_view="Test View",
+            typst_enabled=False,
+            cache_dir=None,
+            fnguide_url=standin.url,
+        )
+        pipeline, manifest = build_batch_pipeline(cfg, fetch_workers=2, render_workers=2)
+        jobs = list(pipeline.run(company_jobs(cfg, ["100001", "100002"])))
+        manifest.save()
+
+        assert sorted(job.config.company_code for job in jobs) == ["100001", "100002"]
+        for job in jobs:
+            assert job.config.report_path.exists()
+            assert (job.config.report_path.parent / "figures" / "01_performance.png").exists()
+        stats = {entry.name: entry for entry in pipeline.stats()}
+        assert stats["render"].processed == 2
+
+        rerun, _ = build_batch_pipeline(cfg, fetch_workers=2)
+        assert list(rerun.run(company_jobs(cfg, ["100001", "100002"]))) == []
+        assert Path(cfg.processed_dir / "fetch_manifest.json").exists()
+
+
+def test_template_change_reruns_only_the_typst_stage(tmp_path):
+    from importlib import resources
+
+    from changwon_credit.batch import report_targets, run_company_graph
+    from changwon_credit.etl import run_pipeline
+
+    template = tmp_path / "credit_report.typ"
+    template.write_text(
+        resources.files("changwon_credit").joinpath("templates/credit_report.typ").read_text(
+            encoding="utf-8"
+        ),
+        encoding="utf-8",
+    )
+    with FnGuideStandIn() as standin:
+        cfg = CreditConfig(
+            company_name="TestCo",
+            company_code="100001",
+            industry="Test",
+            years=3,
+            data_source="Test",
+            raw_dir=tmp_path / "raw",
+            processed_dir=tmp_path / "processed",
+            sqlite_path=tmp_path / "processed" / "db.sqlite",
+            report_path=tmp_path / "reports" / "report.md",
+            analyst="QA",
+            currency="KRW bn",
+            bank_view="Test View",
+            typst_compile_pdf=False,
+            typst_output_dir=tmp_path / "reports",
+            typst_template=template,
+            cache_dir=None,
+            fnguide_url=standin.url,
+        )
+        merged = run_pipeline(cfg)
+
+    first = run_company_graph(cfg, {"merged": merged})
+    assert set(first.rebuilt) == {
+        "metrics", "story", "scenarios", "warehouse", "figures", "charts", "report", "typst"
+    }
+    assert run_company_graph(cfg, {"merged": merged}).rebuilt == []
+
+    template.write_text(template.read_text(encoding="utf-8") + "\n// v2\n", encoding="utf-8")
+    assert run_company_graph(cfg, {"merged": merged}).rebuilt == ["typst"]
+
+    # 기본 명령은 refresh_company가 지표를 이미 저장했으므로 warehouse 단계를 빼고 돌린다.
+    rendered = run_company_graph(cfg, {"merged": merged}, targets=report_targets(cfg), force=True)
+    assert "warehouse" not in rendered.rebuilt and "typst" in rendered.rebuilt
+
+
+def test_graph_warehouse_extends_metrics_like_update_metrics(tmp_path):
+    import numpy as np
+    import pandas as pd
+
+    from changwon_credit.analytics import compute_credit_metrics
+    from changwon_credit.batch import run_company_graph
+    from changwon_credit.db import load_schema
+    from changwon_credit.etl import update_metrics
+    from changwon_credit.store import append_partitions, read_processed
+
+    cfg = CreditConfig(
+        company_name="TestCo",
+        company_code="000000",
+        industry="Test",
+        years=3,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "db.sqlite",
+        report_path=tmp_path / "reports" / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+        typst_enabled=False,
+        cache_dir=None,
+    )
+    columns = load_schema()["credit_profile"].column_names[2:]
+    rng = np.random.default_rng(3)
+    history = pd.DataFrame({"company_code": "000000", "year": range(2019, 2024)})
+    for column in columns:
+        history[column] = rng.uniform(10.0, 100.0, len(history))
+    older = history[history["year"] <= 2022]
+    append_partitions(cfg.processed_dir, "credit_profile", older)
+    update_metrics(older, cfg)
+
+    # 기본 CLI 경로처럼 최근 3개년 창만 그래프에 넘겨도 누적이익은 전체 이력 기준이어야 한다.
+    window = history[history["year"] >= 2021].reset_index(drop=True)
+    append_partitions(cfg.processed_dir, "credit_profile", window)
+    run_company_graph(cfg, {"merged": window}, targets=["warehouse"])
+
+    stored = read_processed(cfg.processed_dir, "analytics_credit", company_codes=["000000"])
+    expected = compute_credit_metrics(history)["retained_earnings_proxy"].to_numpy()
+    np.testing.assert_allclose(stored["retained_earnings_proxy"].to_numpy(), expected, rtol=1e-12)
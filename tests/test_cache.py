@@ -0,0 +1,97 @@
+import pytest
+
+from changwon_credit.cache import CacheMissError, ResponseCache
+from changwon_credit.loader import _download_tables
+
+TABLE = "<table><tr><th>IFRS(연결)</th><th>2023/12</th></tr><tr><td>매출액</td><td>1000</td></tr></table>"
+PAGE = "<html><body>" + TABLE * 6 + "</body></html>"
+
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(headers)
+        return self.responses.pop(0)
+
+
+def test_fresh_entry_skips_network(tmp_path):
+    cache = ResponseCache(tmp_path)
+    session = _Session([_Response(200, PAGE, {"ETag": '"v1"'})])
+    first = _download_tables("034020", session=session, cache=cache)
+    second = _download_tables("034020", session=session, cache=cache)
+    assert len(session.calls) == 1
+    assert second["income"].equals(first["income"])
+
+
+def test_entries_are_scoped_to_the_endpoint(tmp_path):
+    cache = ResponseCache(tmp_path)
+    session = _Session([_Response(200, PAGE), _Response(200, PAGE)])
+    standin = "http://127.0.0.1:8765/SVO2/ASP/SVD_Finance.asp"
+    _download_tables("034020", session=session, cache=cache, base_url=standin)
+    _download_tables("034020", session=session, cache=cache)
+    # stand-in 응답이 캐시에 있어도 실제 FnGuide 조회는 네트워크로 나가야 한다.
+    assert len(session.calls) == 2
+    assert ResponseCache.key("HTTP://Example.com/a", {"x": "1"}) == ResponseCache.key(
+        "http://example.com/a", {"x": "1"}
+    )
+
+
+def test_stale_entry_revalidates_with_etag(tmp_path):
+    cache = ResponseCache(tmp_path, ttl_seconds=0)
+    session = _Session([_Response(200, PAGE, {"ETag": '"v1"'}), _Response(304)])
+    _download_tables("034020", session=session, cache=cache)
+    tables = _download_tables("034020", session=session, cache=cache)
+    assert session.calls[1]["If-None-Match"] == '"v1"'
+    assert "income" in tables
+
+
+def test_cache_only_mode_raises_on_miss(tmp_path):
+    cache = ResponseCache(tmp_path, mode="only")
+    with pytest.raises(CacheMissError):
+        _download_tables("034020", session=_Session([]), cache=cache)
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=1)
+    cache.put("a" * 32, PAGE)
+    cache.put("b" * 32, PAGE)
+    assert cache.get("a" * 32) is None
+
+
+def test_eviction_scans_the_cache_only_when_the_cap_is_exceeded(tmp_path, monkeypatch):
+    import shutil
+
+    cache = ResponseCache(tmp_path, max_bytes=10_000_000)
+    scans = {"count": 0}
+    original = ResponseCache._scan
+
+    def counting_scan(self):
+        scans["count"] += 1
+        return original(self)
+
+    monkeypatch.setattr(ResponseCache, "_scan", counting_scan)
+    for index in range(5):
+        cache.put(f"{index:032d}", PAGE)
+    assert scans["count"] == 1
+
+    # 다른 프로세스가 지운 항목이 있어도 한도를 넘기면 디스크 기준으로 다시 세어 비운다.
+    shutil.rmtree(tmp_path / f"{0:032d}")
+    cache.max_bytes = 1
+    cache.put("f" * 32, PAGE)
+    assert scans["count"] == 2
+    assert not any(tmp_path.iterdir())
+    assert not list(tmp_path.rglob("*.tmp"))
@@ -0,0 +1,95 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from changwon_credit.artifacts import ArtifactManifest
+from changwon_credit.dag import Node, StageGraph
+
+
+def _graph(tmp_path, calls, barrier=None):
+    style = tmp_path / "style.txt"
+    template = tmp_path / "template.txt"
+
+    def track(name, func):
+        def wrapped(**kwargs):
+            calls.append(name)
+            if barrier is not None and name in ("left", "right"):
+                barrier.wait(timeout=5)
+            return func(**kwargs)
+
+        return wrapped
+
+    def chart(frame):
+        path = tmp_path / "chart.txt"
+        path.write_text(f"{style.read_text()}:{frame['x'].sum()}", encoding="utf-8")
+        return str(path)
+
+    nodes = [
+        Node("frame", track("frame", lambda seed: pd.DataFrame({"x": [seed, seed + 1]})),
+             inputs=("seed",), output=pd.DataFrame),
+        Node("left", track("left", lambda frame: int(frame["x"].sum())), inputs=("frame",), output=int),
+        Node("right", track("right", lambda frame: int(frame["x"].max())), inputs=("frame",), output=int),
+        Node("chart", track("chart", chart), inputs=("frame",), output=str, sources=(style,),
+             writes=lambda path: [tmp_path / "chart.txt"]),
+        Node("report", track("report", lambda left, right, chart: f"{left}/{right}/{chart}"),
+             inputs=("left", "right", "chart"), output=str, sources=(template,)),
+    ]
+    return StageGraph(nodes), style, template
+
+
+def _run(graph, tmp_path, seed, **kwargs):
+    manifest = ArtifactManifest.load(tmp_path / "artifact_manifest.json")
+    run = graph.run({"seed": seed}, manifest=manifest, cache_dir=tmp_path / ".stages", **kwargs)
+    manifest.save()
+    return run
+
+
+def test_graph_reruns_only_downstream_of_a_change(tmp_path):
+    calls = []
+    graph, style, template = _graph(tmp_path, calls)
+    style.write_text("blue", encoding="utf-8")
+    template.write_text("v1", encoding="utf-8")
+
+    first = _run(graph, tmp_path, 1)
+    assert sorted(first.rebuilt) == ["chart", "frame", "left", "report", "right"]
+    assert first.values["report"].startswith("3/2/")
+    assert _run(graph, tmp_path, 1).rebuilt == []
+
+    template.write_text("v2", encoding="utf-8")
+    calls.clear()
+    assert _run(graph, tmp_path, 1).rebuilt == ["report"]
+    assert calls == ["report"]
+
+    style.write_text("red", encoding="utf-8")
+    assert _run(graph, tmp_path, 1).rebuilt == ["chart", "report"]
+
+    # 상류가 다시 돌아도 결과가 같으면 하류는 건너뛴다.
+    (tmp_path / "chart.txt").unlink()
+    assert _run(graph, tmp_path, 1).rebuilt == ["chart"]
+
+    assert sorted(_run(graph, tmp_path, 1, force=True).rebuilt) == sorted(first.rebuilt)
+    assert sorted(_run(graph, tmp_path, 2).rebuilt) == sorted(first.rebuilt)
+
+
+def test_graph_runs_independent_branches_in_parallel(tmp_path):
+    calls = []
+    barrier = threading.Barrier(2)
+    graph, style, template = _graph(tmp_path, calls, barrier)
+    style.write_text("blue", encoding="utf-8")
+    template.write_text("v1", encoding="utf-8")
+
+    # left와 right가 동시에 실행되지 않으면 barrier가 시간 초과로 깨진다.
+    run = _run(graph, tmp_path, 1, targets=["left", "right"])
+    assert run.values == {"left": 3, "right": 2}
+    assert "chart" not in calls
+
+
+def test_graph_checks_declared_types_and_inputs(tmp_path):
+    graph = StageGraph([Node("bad", lambda seed: "text", inputs=("seed",), output=int)])
+    with pytest.raises(TypeError, match="expected int"):
+        _run(graph, tmp_path, 1)
+    with pytest.raises(ValueError, match="Missing graph inputs: seed"):
+        graph.run({}, manifest=ArtifactManifest(tmp_path / "m.json"), cache_dir=tmp_path)
+    with pytest.raises(ValueError, match="cycle"):
+        StageGraph([Node("a", int, inputs=("b",)), Node("b", int, inputs=("a",))])
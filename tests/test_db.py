@@ -0,0 +1,100 @@
+import sqlite3
+
+import pandas as pd
+
+from changwon_credit.db import load_schema, write_tables
+
+
+def _statements(code, revenue):
+    return pd.DataFrame({"company_code": code, "year": [2022, 2023], "revenue": revenue})
+
+
+def test_upserts_keep_other_companies(tmp_path):
+    db_path = tmp_path / "credit.db"
+    write_tables(db_path, {"financials_income": _statements("000001", [1.0, 2.0])})
+    write_tables(db_path, {"financials_income": _statements("000002", [3.0, 4.0])})
+    write_tables(db_path, {"financials_income": _statements("000001", [1.5, float("nan")])})
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT company_code, year, revenue FROM financials_income ORDER BY company_code, year"
+        ).fetchall()
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list('financials_income')")}
+    assert rows == [
+        ("000001", 2022, 1.5),
+        ("000001", 2023, None),
+        ("000002", 2022, 3.0),
+        ("000002", 2023, 4.0),
+    ]
+    assert "idx_financials_income_company_code_year" not in indexes  # primary key covers it
+
+
+def test_legacy_replace_table_is_migrated(tmp_path):
+    db_path = tmp_path / "credit.db"
+    with sqlite3.connect(db_path) as conn:
+        pd.DataFrame(
+            {"year": [2022, 2022], "revenue": [1.0, 2.0], "company_code": "000001"}
+        ).to_sql("financials_income", conn, index=False)
+
+    write_tables(db_path, {"financials_income": _statements("000002", [3.0, 4.0])})
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT company_code, year, revenue FROM financials_income").fetchall()
+        columns = [row[1] for row in conn.execute("PRAGMA table_info('financials_income')")]
+    assert ("000001", 2022, 2.0) in rows and len(rows) == 3
+    assert columns == load_schema()["financials_income"].column_names
+
+
+def test_readers_do_not_wait_for_an_open_write(tmp_path):
+    from changwon_credit.db import ReadPool, connect_writer, upsert_frame
+
+    db_path = tmp_path / "credit.db"
+    write_tables(db_path, {"financials_income": _statements("000001", [1.0, 2.0])})
+    pool = ReadPool(db_path, size=2)
+    writer = connect_writer(db_path)
+    try:
+        assert writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        writer.execute("BEGIN IMMEDIATE")
+        upsert_frame(writer, load_schema()["financials_income"], _statements("000001", [9.0, 9.0]))
+        snapshot = pool.read_frame("SELECT revenue FROM financials_income ORDER BY year")
+        assert snapshot["revenue"].tolist() == [1.0, 2.0]
+        writer.commit()
+        latest = pool.read_frame(
+            "SELECT revenue FROM financials_income WHERE company_code = ?", ["000001"]
+        )
+        assert latest["revenue"].tolist() == [9.0, 9.0]
+    finally:
+        writer.close()
+        pool.close()
+
+
+def test_enforce_and_validate_schema_dtypes():
+    import pytest
+
+    from changwon_credit.db import enforce_dtypes, validate_dtypes
+
+    schema = load_schema()
+    metrics = pd.DataFrame(
+        {"company_code": ["000001"] * 2, "year": [2022, 2023], "dscr": [1.2, 1.4], "ebitda": [5.0, 6.0]}
+    )
+    compact = enforce_dtypes(metrics, schema["analytics_credit"], float32_ratios=True)
+    assert compact.dtypes.astype(str).to_dict() == {
+        "company_code": "category",
+        "year": "int16",
+        "dscr": "float32",
+        "ebitda": "float64",
+    }
+    validate_dtypes(compact, schema["analytics_credit"])
+
+    with pytest.raises(ValueError, match="company_code"):
+        validate_dtypes(metrics.assign(company_code=1), schema["analytics_credit"])
+    with pytest.raises(ValueError, match="dscr"):
+        validate_dtypes(metrics.assign(dscr="n/a"), schema["analytics_credit"])
+
+
+def test_schema_loads_from_the_package_outside_the_source_tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_tables(tmp_path / "credit.db", {"financials_income": _statements("000001", [1.0, 2.0])})
+
+    assert "credit_profile" in load_schema()
+    assert load_schema() is load_schema()
@@ -13,3 +13,205 @@ def test_merge_statements_aligns_years():
     merged = merge_statements(statements, "000000")
     assert list(merged["company_code"].unique()) == ["000000"]
     assert "revenue" in merged.columns and "total_assets" in merged.columns
+
+
+def test_refresh_company_skips_unchanged_fetch(tmp_path, monkeypatch):
+    from pathlib import Path
+
+    from changwon_credit import etl
+    from changwon_credit.models import CreditConfig
+    from changwon_credit.store import append_partitions, read_processed
+
+    cfg = CreditConfig(
+        company_name="TestCo",
+        company_code="000000",
+        industry="Test",
+        years=2,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "db.sqlite",
+        report_path=tmp_path / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+        cache_dir=None,
+    )
+    revenue = {"value": 1000}
+
+    def fake_fetch(company_code, **_):
+        return {
+            "income": pd.DataFrame(
+                {"IFRS(연결)": ["매출액"], "2022/12": [900], "2023/12": [revenue["value"]]}
+            ),
+            "balance": pd.DataFrame({"IFRS(연결)": ["자산"], "2022/12": [5000], "2023/12": [5100]}),
+            "cashflow": pd.DataFrame(
+                {"IFRS(연결)": ["영업활동으로인한현금흐름"], "2022/12": [10], "2023/12": [20]}
+            ),
+        }
+
+    monkeypatch.setattr(etl, "fetch_raw_tables", fake_fetch)
+    first = etl.refresh_company(cfg)
+    second = etl.refresh_company(cfg)
+    assert first.changed and not second.changed
+    assert second.merged["revenue"].tolist() == first.merged["revenue"].tolist()
+
+    revenue["value"] = 1200
+    third = etl.refresh_company(cfg)
+    assert third.changed
+    assert third.merged["revenue"].iloc[-1] == 120.0
+    assert Path(cfg.processed_dir / etl.MANIFEST_NAME).exists()
+
+
+def test_refresh_quarterly_accumulates_history(tmp_path, monkeypatch):
+    import shutil
+    import sqlite3
+
+    from changwon_credit import etl
+    from changwon_credit.loader import STATEMENT_METRICS
+    from changwon_credit.models import CreditConfig
+    from changwon_credit.store import append_partitions, read_processed
+
+    cfg = CreditConfig(
+        company_name="TestCo",
+        company_code="000000",
+        industry="Test",
+        years=2,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "db.sqlite",
+        report_path=tmp_path / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+        cache_dir=None,
+        frequency="quarterly",
+        quarters=5,
+    )
+    labels = ["2023/03", "2023/06", "2023/09", "2023/12", "2024/03", "2024/06"]
+
+    def table(name, values):
+        rows = list(STATEMENT_METRICS[name])
+        columns = {col: [value] * len(rows) for col, value in values.items()}
+        return pd.DataFrame({"IFRS(연결)": rows, **columns})
+
+    def raw(columns):
+        annual = {"2022/12": 800, "2023/12": 1000}
+        quarters = {col: 100 + 10 * labels.index(col) for col in columns}
+        tables = {name: table(name, annual) for name in STATEMENT_METRICS}
+        tables.update({f"{name}_q": table(name, quarters) for name in STATEMENT_METRICS})
+        return tables
+
+    shown = {"columns": labels[:5]}
+    monkeypatch.setattr(etl, "fetch_raw_tables", lambda code, **_: raw(shown["columns"]))
+
+    etl.refresh_company(cfg)
+    first = read_processed(cfg.processed_dir, etl.TTM_METRICS_NAME)
+    assert list(zip(first["year"], first["quarter"])) == [(2023, 4), (2024, 1)]
+    assert first["revenue"].iloc[0] == 10.0 + 11.0 + 12.0 + 13.0
+
+    # FnGuide drops the oldest quarter once a new one is published.
+    shown["columns"] = labels[1:]
+    etl.refresh_company(cfg)
+    history = read_processed(cfg.processed_dir, etl.QUARTERLY_NAME)
+    second = read_processed(cfg.processed_dir, etl.TTM_METRICS_NAME)
+    assert len(history) == 6
+    assert list(zip(second["year"], second["quarter"])) == [(2023, 4), (2024, 1), (2024, 2)]
+    assert second["revenue"].iloc[-1] == 12.0 + 13.0 + 14.0 + 15.0
+    with sqlite3.connect(cfg.sqlite_path) as conn:
+        stored = conn.execute(
+            "SELECT year, quarter, revenue FROM analytics_credit_ttm ORDER BY year, quarter"
+        ).fetchall()
+    assert stored == list(zip(second["year"], second["quarter"], second["revenue"]))
+
+    # 저장본에 없는 계정이 새로 보여도(스키마 확장) 공통 열만 비교하고 이력을 이어 간다.
+    history = read_processed(cfg.processed_dir, etl.QUARTERLY_NAME)
+    shutil.rmtree(cfg.processed_dir / etl.QUARTERLY_NAME)
+    append_partitions(cfg.processed_dir, etl.QUARTERLY_NAME, history.drop(columns="ending_cash"))
+    ttm = etl.refresh_quarterly(raw(shown["columns"]), cfg)
+    assert list(zip(ttm["year"], ttm["quarter"])) == [(2023, 4), (2024, 1), (2024, 2)]
+    assert len(read_processed(cfg.processed_dir, etl.TTM_METRICS_NAME)) == 3
+
+
+def test_refresh_company_reuses_store_after_a_year_rollover(tmp_path, monkeypatch):
+    from changwon_credit import etl
+
+    cfg = _config(tmp_path, years=2)
+    years = {"value": ["2022/12", "2023/12"]}
+
+    def fake_fetch(company_code, **_):
+        def table(label, base):
+            return pd.DataFrame({"IFRS(연결)": [label], **{y: [base + int(y[:4])] for y in years["value"]}})
+
+        return {
+            "income": table("매출액", 0),
+            "balance": table("자산", 5000),
+            "cashflow": table("영업활동으로인한현금흐름", 10),
+        }
+
+    monkeypatch.setattr(etl, "fetch_raw_tables", fake_fetch)
+    assert etl.refresh_company(cfg).changed
+    years["value"] = ["2023/12", "2024/12"]
+    assert etl.refresh_company(cfg).changed
+    # 2022년 파티션이 남아 있어도 변경 없는 재실행은 저장된 최근 2개년을 그대로 쓴다.
+    for _ in range(2):
+        rerun = etl.refresh_company(cfg)
+        assert not rerun.changed
+        assert rerun.merged["year"].tolist() == [2023, 2024]
+
+
+def _config(tmp_path, years=3):
+    from changwon_credit.models import CreditConfig
+
+    return CreditConfig(
+        company_name="TestCo",
+        company_code="000000",
+        industry="Test",
+        years=years,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "db.sqlite",
+        report_path=tmp_path / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+        cache_dir=None,
+    )
+
+
+def test_update_metrics_writes_only_appended_years(tmp_path):
+    from changwon_credit import etl
+    from changwon_credit.analytics import compute_credit_metrics
+    from changwon_credit.db import load_schema
+    from changwon_credit.store import append_partitions, read_processed
+
+    cfg = _config(tmp_path)
+    years = list(range(2019, 2025))
+    columns = load_schema()["credit_profile"].column_names[2:]
+    history = pd.DataFrame(
+        {
+            "company_code": "000000",
+            "year": years,
+            **{column: [10.0 + index + len(column) for index in range(len(years))] for column in columns},
+        }
+    )
+
+    def refresh(window):
+        # refresh_company처럼 저장 전 이력을 읽고 새 재무제표를 적재한 뒤 지표를 갱신한다.
+        before = read_processed(cfg.processed_dir, "credit_profile", company_codes=["000000"])
+        append_partitions(cfg.processed_dir, "credit_profile", window)
+        return etl.update_metrics(window, cfg, history=before)
+
+    assert refresh(history[history["year"].between(2019, 2022)])["year"].tolist() == years[:4]
+    assert refresh(history[history["year"].between(2021, 2023)])["year"].tolist() == [2023]
+    assert refresh(history[history["year"].between(2022, 2024)])["year"].tolist() == [2024]
+
+    stored = read_processed(cfg.processed_dir, "analytics_credit", company_codes=["000000"])
+    full = compute_credit_metrics(history)[stored.columns]
+    pd.testing.assert_frame_equal(stored, full, check_dtype=False, check_exact=False, rtol=1e-12)
+    assert len(list((cfg.processed_dir / "analytics_credit").glob("*/year=2019/*.parquet"))) == 1
+
+    restated = history[history["year"].between(2022, 2024)].assign(revenue=[1.0, 2.0, 3.0])
+    assert refresh(restated)["year"].tolist() == years
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from changwon_credit import kernel
+from changwon_credit.analytics import compute_credit_metrics, metric_inputs
+
+
+def _panel(companies: int, years: int = 4) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame(
+        {
+            "company_code": np.repeat([f"{index:06d}" for index in range(companies)], years),
+            "year": np.tile(np.arange(2020, 2020 + years), companies),
+        }
+    )
+    for name in kernel.INPUT_COLUMNS:
+        frame[name] = rng.uniform(1.0, 100.0, len(frame))
+    frame.loc[::5, "revenue"] = 0.0
+    frame.loc[::7, "net_income"] = np.nan
+    frame.loc[::3, "ending_cash"] = np.nan
+    return frame
+
+
+def test_kernel_matches_the_pandas_wrapper_and_stays_float():
+    panel = _panel(3)
+    metrics = compute_credit_metrics(panel)
+    groups = pd.factorize(panel["company_code"])[0]
+    values = kernel.metric_kernel(metric_inputs(panel), groups)
+
+    assert values.shape == (len(panel), len(kernel.OUTPUT_COLUMNS))
+    np.testing.assert_array_equal(values, metrics[list(kernel.OUTPUT_COLUMNS)].to_numpy())
+    assert (metrics[list(kernel.OUTPUT_COLUMNS)].dtypes == np.float64).all()
+    # 매출 0인 행의 마진은 NaN이고, 각 회사 첫 해 성장률은 앞 회사와 섞이지 않는다.
+    assert metrics.loc[panel["revenue"] == 0, "op_margin"].isna().all()
+    assert metrics.groupby("company_code")["revenue_growth"].head(1).isna().all()
+
+
+def test_kernel_blocks_never_split_a_company(monkeypatch):
+    monkeypatch.setattr(kernel, "CHUNK_ROWS", 5)
+    panel = _panel(6)
+    groups = pd.factorize(panel["company_code"])[0]
+    blocked = kernel.metric_kernel(metric_inputs(panel), groups)
+    monkeypatch.setattr(kernel, "CHUNK_ROWS", 10_000)
+    # 누적합 순서만 달라지므로 반올림 오차 수준에서 같아야 한다.
+    np.testing.assert_allclose(blocked, kernel.metric_kernel(metric_inputs(panel), groups), rtol=1e-12)
+
+
+def test_group_helpers_respect_company_boundaries():
+    groups = np.array([0, 0, 0, 1, 1])
+    values = np.array([1.0, np.nan, 3.0, 10.0, 20.0])
+    np.testing.assert_array_equal(kernel.group_cumsum(values, groups), [1.0, np.nan, 4.0, 10.0, 30.0])
+    np.testing.assert_array_equal(
+        kernel.group_lag(values, groups), [np.nan, 1.0, np.nan, np.nan, 10.0]
+    )
+    np.testing.assert_array_equal(kernel.safe_div(np.array([1.0, 2.0]), 0.0), [np.nan, np.nan])
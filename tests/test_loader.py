@@ -27,3 +27,156 @@ def test_tidy_statement_converts_units():
     # 1000 억 -> 100 KRW bn
     assert tidy.loc[tidy["year"] == 2022, "revenue"].iloc[0] == 120.0
     assert "net_income" in tidy.columns
+
+
+def test_fetch_many_isolates_failures(monkeypatch):
+    from changwon_credit import loader
+
+    def fake_download(code, **_):
+        if code == "000002":
+            raise ValueError("boom")
+        return {
+            "income": pd.DataFrame({"IFRS(연결)": ["매출액"], "2023/12": [1000]}),
+            "balance": pd.DataFrame({"IFRS(연결)": ["자산"], "2023/12": [2000]}),
+            "cashflow": pd.DataFrame(
+                {"IFRS(연결)": ["영업활동으로인한현금흐름"], "2023/12": [300]}
+            ),
+        }
+
+    monkeypatch.setattr(loader, "_download_tables", fake_download)
+    results = {
+        res.company_code: res
+        for res in loader.fetch_many(["000001", "000002", "000003"], years=1, max_workers=2)
+    }
+    assert set(results) == {"000001", "000002", "000003"}
+    assert not results["000002"].ok
+    assert results["000001"].statements.income["revenue"].iloc[0] == 100.0
+
+
+def test_fetch_many_cancels_pending_downloads_when_closed_early(monkeypatch):
+    import threading
+
+    from changwon_credit import loader
+
+    started = []
+    release = threading.Event()
+    closed = []
+
+    def slow_download(code, **_):
+        started.append(code)
+        if code != "000000":
+            release.wait(timeout=5)
+        raise ValueError("offline")
+
+    class _Session:
+        def close(self):
+            closed.append(True)
+
+    monkeypatch.setattr(loader, "_download_tables", slow_download)
+    monkeypatch.setattr(loader, "build_session", lambda pool_size: _Session())
+    codes = [f"{index:06d}" for index in range(20)]
+    results = loader.fetch_many(codes, years=1, max_workers=2)
+    assert next(results).company_code == "000000"
+    threading.Timer(0.2, release.set).start()
+    results.close()
+    # 실행 중이던 작업만 끝까지 기다리고 대기 작업은 시작되지 않으며, 직접 만든 세션은 닫힌다.
+    assert len(started) <= 3
+    assert closed == [True]
+
+
+def test_host_rate_limiter_spaces_requests():
+    import time
+
+    from changwon_credit.loader import HostRateLimiter
+
+    limiter = HostRateLimiter(rate=50)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.wait("https://comp.fnguide.com/x")
+    assert time.monotonic() - started >= 0.035
+
+
+def test_extract_statement_tables_matches_read_html():
+    from io import StringIO
+
+    from changwon_credit.fixtures import render_finance_page
+    from changwon_credit.loader import extract_statement_tables
+
+    income = pd.DataFrame(
+        {
+            "IFRS(연결)": ["매출액", "금융원가계산에 참여한 계정 펼치기", "당기순이익"],
+            "2022/12": [1000.0, 20.0, None],
+            "2023/12": [1200.0, 25.0, 60.0],
+            "전년동기": [0.0, 0.0, 0.0],
+        }
+    )
+    balance = pd.DataFrame({"IFRS(연결)": ["자산", "부채"], "2023/12": [5000.0, 3000.0]})
+    cashflow = pd.DataFrame({"IFRS(연결)": ["영업활동으로인한현금흐름"], "2023/12": [1234567.0]})
+    html = render_finance_page({"income": income, "balance": balance, "cashflow": cashflow})
+
+    tables = extract_statement_tables(html)
+    legacy = pd.read_html(StringIO(html))
+    for name, index in (("income", 0), ("balance", 2), ("cashflow", 4)):
+        pd.testing.assert_frame_equal(tables[name], legacy[index], check_dtype=False)
+
+    narrowed = extract_statement_tables(
+        html, rows=INCOME_METRICS, column_pattern=r"^\d{4}/12$"
+    )["income"]
+    assert list(narrowed.columns) == ["IFRS(연결)", "2022/12", "2023/12"]
+    assert extract_statement_tables("<html><body></body></html>") is None
+
+
+def test_normalize_statements_matches_per_company_tidy():
+    from changwon_credit.etl import merge_statements, pivot_statements
+    from changwon_credit.loader import STATEMENT_METRICS, normalize_statements
+    from changwon_credit.models import FinancialStatements
+
+    def tables(scale):
+        return {
+            "income": pd.DataFrame(
+                {
+                    "IFRS(연결)": ["매출액", " 영업이익 ", "당기순이익", "기타"],
+                    "2021/12": [1000 * scale, 100, 50, 1],
+                    "2022/12": [1200 * scale, 140, "60", 1],
+                    "2023/12": [1400 * scale, 160, None, 1],
+                    "2024/06": [700, 80, 40, 1],
+                }
+            ),
+            "balance": pd.DataFrame(
+                {"IFRS(연결)": ["자산", "부채"], "2022/12": [5000, 3000], "2023/12": [5200, 3100]}
+            ),
+            "cashflow": pd.DataFrame(
+                {"IFRS(연결)": ["영업활동으로인한현금흐름"], "2022/12": [300], "2023/12": [320]}
+            ),
+        }
+
+    raw = {"000001": tables(1), "000002": tables(2)}
+    long = normalize_statements(raw, years=2)
+    assert list(long.columns) == ["company_code", "year", "metric", "value"]
+
+    wide = pivot_statements(long)
+    for code, company_tables in raw.items():
+        tidy = [
+            _tidy_statement(company_tables[name], metric_map, 2)
+            for name, metric_map in STATEMENT_METRICS.items()
+        ]
+        expected = merge_statements(FinancialStatements(*tidy), code)
+        got = wide[wide["company_code"] == code].reset_index(drop=True)
+        pd.testing.assert_frame_equal(
+            got, expected, check_dtype=False, check_names=False, check_categorical=False
+        )
+
+
+def test_tidy_statement_quarterly_keys_year_and_quarter():
+    df = pd.DataFrame(
+        {
+            "IFRS(연결)": ["매출액", "당기순이익"],
+            "2024/09": [300, 30],
+            "2024/12": [400, 40],
+            "2025/03": [350, 35],
+            "전년동기": [0, 0],
+        }
+    )
+    tidy = _tidy_statement(df, INCOME_METRICS, 2, quarterly=True)
+    assert list(zip(tidy["year"], tidy["quarter"])) == [(2024, 4), (2025, 1)]
+    assert tidy["revenue"].tolist() == [40.0, 35.0]
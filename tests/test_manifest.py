@@ -0,0 +1,33 @@
+import pandas as pd
+
+from changwon_credit.manifest import FetchManifest, build_entry
+
+
+def _raw(revenue=1000):
+    return {
+        "income": pd.DataFrame(
+            {"IFRS(연결)": ["매출액"], "2022/12": [900], "2023/12": [revenue], "2024/06": [1]}
+        )
+    }
+
+
+def test_entry_ignores_interim_columns_and_dtype_noise():
+    base = build_entry(_raw())
+    interim_changed = _raw()
+    interim_changed["income"]["2024/06"] = [999]
+    interim_changed["income"]["2022/12"] = [900.0]
+    assert base.periods == ["2022/12", "2023/12"]
+    assert base.same_content(build_entry(interim_changed))
+    assert not base.same_content(build_entry(_raw(revenue=1001)))
+
+
+def test_manifest_round_trip(tmp_path):
+    path = tmp_path / "fetch_manifest.json"
+    manifest = FetchManifest.load(path)
+    entry = build_entry(_raw())
+    manifest.record("000001", entry)
+    manifest.save()
+
+    reloaded = FetchManifest.load(path)
+    assert reloaded.is_unchanged("000001", build_entry(_raw()))
+    assert not reloaded.is_unchanged("000002", entry)
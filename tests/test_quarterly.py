@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from changwon_credit.quarterly import build_ttm, compute_ttm_metrics, extend_ttm_metrics
+
+
+def _panel(codes=("000001", "000002"), quarters=12, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    metrics = [
+        "revenue",
+        "operating_income",
+        "net_income",
+        "interest_expense",
+        "total_assets",
+        "total_liabilities",
+        "equity",
+        "current_assets",
+        "current_liabilities",
+        "operating_cash_flow",
+        "investment_outflows",
+        "non_cash_expense",
+        "non_cash_income",
+        "ending_cash",
+    ]
+    rows = []
+    for code in codes:
+        for index in range(quarters):
+            values = dict(zip(metrics, rng.uniform(10.0, 100.0, len(metrics))))
+            period = {"year": 2020 + index // 4, "quarter": index % 4 + 1}
+            rows.append({"company_code": code, **period, **values})
+    return pd.DataFrame(rows)
+
+
+def test_build_ttm_sums_flows_and_keeps_balances():
+    panel = _panel(codes=("000001",), quarters=5)
+    ttm = build_ttm(panel)
+    assert list(zip(ttm["year"], ttm["quarter"])) == [(2020, 4), (2021, 1)]
+    assert ttm["revenue"].iloc[0] == pytest.approx(panel["revenue"].iloc[:4].sum())
+    assert ttm["revenue"].iloc[1] == pytest.approx(panel["revenue"].iloc[1:5].sum())
+    assert ttm["total_assets"].iloc[1] == panel["total_assets"].iloc[4]
+    assert ttm["ending_cash"].iloc[1] == panel["ending_cash"].iloc[4]
+
+
+def test_build_ttm_drops_windows_across_gaps():
+    panel = _panel(codes=("000001",), quarters=8).drop(index=5)
+    ttm = build_ttm(panel)
+    # 2021Q2가 비면 2021Q2~2021Q4 TTM은 네 분기가 연속되지 않는다.
+    assert list(zip(ttm["year"], ttm["quarter"])) == [(2020, 4), (2021, 1)]
+
+
+def test_incremental_ttm_metrics_match_full_recompute():
+    panel = _panel(quarters=14)
+    period = panel["year"] * 4 + panel["quarter"]
+    previous = compute_ttm_metrics(panel[period <= period.max() - 3])
+    newcomer = _panel(codes=("000003",), quarters=6, seed=1)
+    universe = pd.concat([panel, newcomer], ignore_index=True)
+
+    full = compute_ttm_metrics(universe)
+    incremental = compute_ttm_metrics(universe, previous)
+    pd.testing.assert_frame_equal(incremental[full.columns], full, check_dtype=False)
+
+    fresh = extend_ttm_metrics(universe, previous)
+    assert len(fresh) == 2 * 3 + 3
+    assert full["revenue_growth"].notna().sum() > 0
+    assert extend_ttm_metrics(universe, incremental).empty
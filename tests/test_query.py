@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from changwon_credit.models import CreditConfig
+from changwon_credit.store import append_partitions
+
+pytest.importorskip("duckdb")
+
+from changwon_credit.query import export_query, query  # noqa: E402
+
+
+def _config(tmp_path):
+    return CreditConfig(
+        company_name="TestCo",
+        company_code="000001",
+        industry="Test",
+        years=3,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "credit.db",
+        report_path=tmp_path / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+    )
+
+
+def test_screen_across_universe_uses_newest_load(tmp_path):
+    cfg = _config(tmp_path)
+    metrics = pd.DataFrame(
+        {
+            "company_code": ["000001", "000002", "000003", "000001"],
+            "year": [2023, 2023, 2023, 2022],
+            "dscr": [1.0, 1.1, 2.0, 0.5],
+            "net_debt_to_ebitda": [6.0, 4.0, 7.0, 8.0],
+        }
+    )
+    append_partitions(cfg.processed_dir, "analytics_credit", metrics)
+    append_partitions(
+        cfg.processed_dir,
+        "analytics_credit",
+        pd.DataFrame({"company_code": ["000002"], "year": [2023], "dscr": [0.9], "net_debt_to_ebitda": [5.5]}),
+    )
+
+    sql = (
+        "SELECT company_code FROM analytics_credit "
+        "WHERE year = 2023 AND dscr < 1.2 AND net_debt_to_ebitda > 5 ORDER BY company_code"
+    )
+    assert query(cfg, sql)["company_code"].tolist() == ["000001", "000002"]
+
+    path = export_query(cfg, sql, tmp_path / "screen.csv")
+    assert pd.read_csv(path, dtype=str)["company_code"].tolist() == ["000001", "000002"]
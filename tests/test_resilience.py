@@ -0,0 +1,132 @@
+import random
+
+import pytest
+import requests
+
+from changwon_credit.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RequestBudget,
+    Resilience,
+    RetryPolicy,
+    request_with_retries,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: dict | None = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _Session:
+    def __init__(self, outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _Response(*outcome) if isinstance(outcome, tuple) else _Response(outcome)
+
+
+def test_retry_delay_is_jittered_and_honours_retry_after():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=8.0)
+    rng = random.Random(0)
+    delays = [policy.delay(4, rng=rng) for _ in range(200)]
+    assert 0.0 <= min(delays) and max(delays) <= 8.0
+    assert len(set(delays)) > 100
+    assert policy.delay(1, retry_after=5.0, rng=rng) == 5.0
+    assert policy.delay(1, retry_after=60.0, rng=rng) == 8.0
+
+
+def test_request_with_retries_recovers_and_uses_split_timeouts():
+    session = _Session([requests.ConnectTimeout("slow"), 503, (429, {"Retry-After": "0"}), 200])
+    slept = []
+    guard = Resilience(retry=RetryPolicy(max_attempts=4, connect_timeout=2.0, read_timeout=9.0))
+    resp = request_with_retries(
+        session, "http://fnguide.test/x", params={}, headers={}, resilience=guard, sleep=slept.append
+    )
+    assert resp.status_code == 200
+    assert len(slept) == 3
+    assert session.timeouts == [(2.0, 9.0)] * 4
+
+
+def test_request_with_retries_raises_after_last_attempt():
+    session = _Session([502, 502])
+    guard = Resilience(retry=RetryPolicy(max_attempts=2))
+    with pytest.raises(requests.HTTPError):
+        request_with_retries(
+            session, "http://fnguide.test/x", params={}, headers={}, resilience=guard, sleep=lambda _: None
+        )
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock)
+    breaker.record_failure("h")
+    breaker.before("h")
+    breaker.record_failure("h")
+    with pytest.raises(CircuitOpenError):
+        breaker.before("h")
+
+    clock.now = 10.0
+    breaker.before("h")  # single half-open probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before("h")
+    breaker.record_failure("h")
+    assert breaker.state("h") == "open"
+
+    clock.now = 20.0
+    breaker.before("h")
+    breaker.record_success("h")
+    assert breaker.state("h") == "closed"
+
+
+def test_request_budget_backs_off_and_recovers():
+    clock = _Clock()
+    budget = RequestBudget(
+        8.0, max_rate=8.0, increase=1.0, decrease=0.5, clock=clock, sleep=clock.sleep
+    )
+    for _ in range(8):
+        budget.acquire()
+    assert clock.now == pytest.approx(7 / 8)
+
+    budget.on_throttle()
+    budget.on_throttle()  # same window: counted, not compounded
+    assert budget.rate == 4.0 and budget.throttled == 2
+    for _ in range(40):
+        budget.on_success()
+    assert budget.rate == 8.0
+
+
+def test_request_budget_caps_retries():
+    budget = RequestBudget(retry_ratio=0.5, min_retries=1)
+    for _ in range(4):
+        budget.on_attempt(first=True)
+    assert [budget.try_retry() for _ in range(4)] == [True, True, True, False]
+
+
+def test_throttled_retries_are_paced_by_the_budget():
+    clock = _Clock()
+    budget = RequestBudget(10.0, clock=clock, sleep=clock.sleep)
+    session = _Session([429, 429, 429, 200])
+    guard = Resilience(retry=RetryPolicy(max_attempts=2), budget=budget)
+    resp = request_with_retries(
+        session, "http://fnguide.test/x", params={}, headers={}, resilience=guard, sleep=clock.sleep
+    )
+    assert resp.status_code == 200
+    assert budget.rate < 10.0 and budget.throttled == 3
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from changwon_credit.analytics import build_scenarios, compute_credit_metrics
+from changwon_credit.scenarios import scenario_grid
+
+
+def _metrics() -> pd.DataFrame:
+    base = {
+        "revenue": [100.0, 120.0],
+        "operating_income": [10.0, 12.0],
+        "net_income": [6.0, 7.0],
+        "interest_expense": [2.0, 2.0],
+        "total_assets": [200.0, 220.0],
+        "total_liabilities": [100.0, 100.0],
+        "equity": [100.0, 120.0],
+        "current_assets": [80.0, 90.0],
+        "current_liabilities": [40.0, 45.0],
+        "operating_cash_flow": [14.0, 16.0],
+        "investment_outflows": [4.0, 6.0],
+    }
+    first = pd.DataFrame({"company_code": "034020", "year": [2022, 2023], **base})
+    second = first.assign(company_code="012450", interest_expense=[0.0, 0.0])
+    return compute_credit_metrics(pd.concat([first, second], ignore_index=True))
+
+
+def test_scenario_grid_broadcasts_each_measure_over_its_own_axes():
+    grid = scenario_grid(
+        _metrics(),
+        revenue_shocks=np.linspace(-0.3, 0.3, 7),
+        rate_shocks=[0.0, 0.01, 0.02],
+        capex_shocks=[0.0, 0.5],
+    )
+    assert list(grid.company_codes) == ["012450", "034020"]
+    assert grid.shape == (2, 7, 3, 2)
+    assert grid.values["dscr"].shape == (2, 7, 3, 1)
+    assert grid.values["free_cash_flow"].shape == (2, 7, 1, 2)
+    assert grid["pd_estimate"].shape == grid.shape
+
+    # 034020 기준점: EBITDA 12, 이자 2 + 100bp × EAD 100 = 3, CAPEX 50% 증가 → FCF 16 - 6 - 3.
+    index = (1, 3, 1, 1)
+    assert grid["interest_coverage"][index] == pytest.approx(12.0 / 3.0)
+    assert grid["free_cash_flow"][index] == pytest.approx(7.0)
+    # 이자 0인 회사는 금리 충격 전 커버리지가 NaN이고, 충격 후에는 계산된다.
+    assert np.isnan(grid["interest_coverage"][0, 3, 0, 0])
+    assert grid["interest_coverage"][0, 3, 1, 0] == pytest.approx(12.0)
+
+    frame = grid.to_frame()
+    assert len(frame) == 2 * 7 * 3 * 2
+    np.testing.assert_array_equal(frame["dscr"], grid["dscr"].ravel())
+    shares = grid.share_below("dscr", 1.5)
+    expected = frame.groupby("company_code")["dscr"].apply(lambda dscr: (dscr < 1.5).mean())
+    pd.testing.assert_series_equal(shares, expected, check_names=False)
+
+
+def test_build_scenarios_is_the_revenue_slice_of_the_grid():
+    metrics = _metrics()
+    latest = metrics[metrics["company_code"] == "034020"]
+    cases = build_scenarios(latest, shock=0.2)
+    grid = scenario_grid(latest, revenue_shocks=[-0.2, 0.0, 0.2]).to_frame()
+    pd.testing.assert_frame_equal(cases.drop(columns="scenario"), grid[cases.columns[1:]])
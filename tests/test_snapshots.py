@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from changwon_credit.fixtures import load_recorded_tables
+from changwon_credit.snapshots import SnapshotStore
+
+RAW_DIR = Path(__file__).resolve().parents[1] / "data_raw"
+
+
+def test_snapshots_dedupe_and_replay_point_in_time(tmp_path):
+    tables = load_recorded_tables(RAW_DIR, "034020")
+    store = SnapshotStore.for_raw_dir(tmp_path)
+    first = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    store.write("034020", tables, fetched_at=first)
+    store.write("034020", tables, fetched_at=datetime(2025, 4, 1, tzinfo=timezone.utc))
+    restated = {**tables, "income": tables["income"].assign(**{tables["income"].columns[1]: 1.0})}
+    store.write("034020", restated, fetched_at=datetime(2025, 5, 1, tzinfo=timezone.utc))
+
+    assert len(list((store.root / "objects").rglob("*.parquet"))) == len(tables) + 1
+    assert len(store.history("034020")) == 3 * len(tables)
+
+    replay = store.read("034020", as_of="2025-04-15")
+    assert replay["income"].equals(store.read("034020", as_of=first)["income"])
+    assert (store.read("034020")["income"].iloc[:, 1] == 1.0).all()
+    assert store.read("034020", as_of="2025-01-01") == {}
+    assert load_recorded_tables(tmp_path, "034020")["income"].iloc[:, 1].eq(1.0).all()
+
+
+def test_history_reads_only_the_company_index(tmp_path):
+    tables = load_recorded_tables(RAW_DIR, "034020")
+    store = SnapshotStore.for_raw_dir(tmp_path)
+    store.write("034020", tables, fetched_at=datetime(2025, 3, 1, tzinfo=timezone.utc))
+    store.write("005930", tables, fetched_at=datetime(2025, 3, 2, tzinfo=timezone.utc))
+
+    assert sorted(path.name for path in (store.root / "index").iterdir()) == [
+        "005930.jsonl",
+        "034020.jsonl",
+    ]
+    assert len(store.history()) == 2 * len(tables)
+    # 다른 회사 인덱스가 깨져 있어도 한 회사 조회는 자기 파일만 읽으므로 영향이 없다.
+    (store.root / "index" / "005930.jsonl").write_text("not json\n")
+    assert len(store.history("034020")) == len(tables)
+    assert not list(store.root.rglob("*.tmp"))
@@ -0,0 +1,58 @@
+import operator
+import threading
+import time
+
+from changwon_credit.staged import Stage, StageFailure, StagedPipeline
+
+
+def test_pipeline_isolates_failures_and_drops_none():
+    def parse(value):
+        if value == 3:
+            raise ValueError("bad item")
+        return value
+
+    pipeline = StagedPipeline(
+        [
+            Stage("parse", parse, workers=2, queue_size=2),
+            Stage("filter", lambda value: None if value % 2 else value, workers=1),
+            Stage("square", lambda value: value * value, workers=2),
+        ]
+    )
+    results = list(pipeline.run(range(8)))
+    failures = [result for result in results if isinstance(result, StageFailure)]
+    assert sorted(result for result in results if not isinstance(result, StageFailure)) == [0, 4, 16, 36]
+    assert [failure.stage for failure in failures] == ["parse"]
+
+    stats = {entry.name: entry for entry in pipeline.stats()}
+    assert stats["parse"].failed == 1
+    assert stats["filter"].dropped == 3
+    assert stats["square"].processed == 4
+
+
+def test_bounded_queue_applies_backpressure():
+    release = threading.Event()
+    fed = []
+
+    def slow(value):
+        release.wait()
+        return value
+
+    def items():
+        for value in range(20):
+            fed.append(value)
+            yield value
+
+    pipeline = StagedPipeline([Stage("slow", slow, workers=1, queue_size=2)])
+    consumer = threading.Thread(target=lambda: list(pipeline.run(items())))
+    consumer.start()
+    time.sleep(0.2)
+    # One item in the worker, two in the queue, one blocked in put().
+    assert len(fed) <= 4
+    release.set()
+    consumer.join()
+    assert len(fed) == 20
+
+
+def test_process_stage_runs_in_pool():
+    pipeline = StagedPipeline([Stage("negate", operator.neg, workers=2, processes=True)])
+    assert sorted(pipeline.run([1, 2, 3])) == [-3, -2, -1]
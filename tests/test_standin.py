@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+import requests
+
+from changwon_credit.fixtures import render_finance_page
+from changwon_credit.loader import fetch_statements
+from changwon_credit.resilience import Resilience, RetryPolicy
+from changwon_credit.standin import FnGuideStandIn, StandInSettings
+
+
+def _write_page(pages_dir, code):
+    tables = {
+        "income": pd.DataFrame(
+            {"IFRS(연결)": ["매출액", "영업이익"], "2022/12": [1000.0, 90.0], "2023/12": [1100.0, 100.0]}
+        ),
+        "balance": pd.DataFrame({"IFRS(연결)": ["자산"], "2022/12": [5000.0], "2023/12": [5200.0]}),
+        "cashflow": pd.DataFrame(
+            {"IFRS(연결)": ["영업활동으로인한현금흐름"], "2022/12": [300.0], "2023/12": [320.0]}
+        ),
+    }
+    (pages_dir / f"{code}.html").write_text(render_finance_page(tables), encoding="utf-8")
+
+
+def test_fetch_statements_against_standin(tmp_path):
+    _write_page(tmp_path, "123456")
+    with FnGuideStandIn(StandInSettings(pages_dir=tmp_path)) as standin:
+        _, statements = fetch_statements("123456", years=2, base_url=standin.url)
+        assert standin.stats.served == 1
+    assert list(statements.income["year"]) == [2022, 2023]
+    assert statements.income["revenue"].iloc[-1] == 110.0
+
+
+def test_standin_injects_errors(tmp_path):
+    _write_page(tmp_path, "123456")
+    guard = Resilience(retry=RetryPolicy(max_attempts=2, backoff_base=0.01))
+    with FnGuideStandIn(StandInSettings(pages_dir=tmp_path, error_rate=1.0)) as standin:
+        with pytest.raises(requests.HTTPError):
+            fetch_statements("123456", years=2, base_url=standin.url, resilience=guard)
+        assert standin.stats.errors == 2
+
+
+def test_retries_recover_from_transient_errors(tmp_path):
+    _write_page(tmp_path, "123456")
+    guard = Resilience(retry=RetryPolicy(max_attempts=10, backoff_base=0.001), breaker=None)
+    settings = StandInSettings(pages_dir=tmp_path, error_rate=0.5, seed=3)
+    with FnGuideStandIn(settings) as standin:
+        for _ in range(5):
+            _, statements = fetch_statements("123456", years=2, base_url=standin.url, resilience=guard)
+            assert statements.income["revenue"].iloc[-1] == 110.0
+        assert standin.stats.served == 5
+        assert standin.stats.errors > 0
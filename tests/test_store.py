@@ -0,0 +1,68 @@
+import pandas as pd
+
+from changwon_credit.store import append_partitions, compact, read_processed
+
+
+def _rows(code, years, revenue):
+    return pd.DataFrame({"company_code": code, "year": years, "revenue": revenue})
+
+
+def test_appends_keep_newest_load_and_prune_by_partition(tmp_path):
+    append_partitions(tmp_path, "credit_profile", _rows("034020", [2022, 2023], [1.0, 2.0]))
+    append_partitions(tmp_path, "credit_profile", _rows("005930", [2023], [5.0]))
+    append_partitions(tmp_path, "credit_profile", _rows("034020", [2023, 2024], [2.5, 3.0]))
+
+    full = read_processed(tmp_path, "credit_profile")
+    assert list(zip(full["company_code"], full["year"], full["revenue"])) == [
+        ("005930", 2023, 5.0),
+        ("034020", 2022, 1.0),
+        ("034020", 2023, 2.5),
+        ("034020", 2024, 3.0),
+    ]
+    sliced = read_processed(tmp_path, "credit_profile", company_codes=["034020"], years=[2023])
+    assert sliced["revenue"].tolist() == [2.5]
+
+    assert compact(tmp_path) == 1
+    assert len(list((tmp_path / "credit_profile").rglob("*.parquet"))) == 4
+    pd.testing.assert_frame_equal(read_processed(tmp_path, "credit_profile"), full)
+
+
+def test_quarterly_datasets_keep_the_newest_load_of_each_quarter(tmp_path):
+    def quarters(pairs, revenue):
+        years, numbers = zip(*pairs)
+        return _rows("034020", list(years), revenue).assign(quarter=list(numbers))
+
+    append_partitions(tmp_path, "fs_quarterly", quarters([(2023, 3), (2023, 4)], [1.0, 2.0]))
+    # 새 적재가 2023년의 일부 분기만 담아도 나머지 분기는 그대로 남는다.
+    append_partitions(tmp_path, "fs_quarterly", quarters([(2023, 4), (2024, 1)], [2.5, 3.0]))
+
+    full = read_processed(tmp_path, "fs_quarterly")
+    assert list(full.columns[:3]) == ["company_code", "year", "quarter"]
+    assert list(zip(full["year"], full["quarter"], full["revenue"])) == [
+        (2023, 3, 1.0),
+        (2023, 4, 2.5),
+        (2024, 1, 3.0),
+    ]
+
+    assert compact(tmp_path, ["fs_quarterly"]) == 1
+    pd.testing.assert_frame_equal(read_processed(tmp_path, "fs_quarterly"), full)
+
+
+def test_reads_retry_when_compaction_removes_listed_parts(tmp_path, monkeypatch):
+    from changwon_credit import store
+
+    append_partitions(tmp_path, "credit_profile", _rows("034020", [2023], [1.0]))
+    append_partitions(tmp_path, "credit_profile", _rows("034020", [2023], [2.0]))
+    listed = store.ds.dataset
+    calls = []
+
+    def compact_after_listing(*args, **kwargs):
+        dataset = listed(*args, **kwargs)
+        calls.append(dataset)
+        if len(calls) == 1:
+            compact(tmp_path)
+        return dataset
+
+    monkeypatch.setattr(store.ds, "dataset", compact_after_listing)
+    assert read_processed(tmp_path, "credit_profile")["revenue"].tolist() == [2.0]
+    assert len(calls) == 2
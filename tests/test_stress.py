@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from changwon_credit import stress
+from changwon_credit.analytics import compute_credit_metrics
+from changwon_credit.kernel import INPUT_COLUMNS
+
+
+def _metrics(companies: int = 3, years: int = 6) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    frame = pd.DataFrame(
+        {
+            "company_code": np.repeat([f"{index:06d}" for index in range(companies)], years),
+            "year": np.tile(np.arange(2019, 2019 + years), companies),
+        }
+    )
+    for name in INPUT_COLUMNS:
+        frame[name] = rng.uniform(50.0, 100.0, len(frame))
+    return compute_credit_metrics(frame)
+
+
+def test_simulation_is_seeded_and_independent_of_chunks_and_workers(monkeypatch):
+    metrics = _metrics()
+    first = stress.simulate_stress(metrics, paths=5_000, seed=7)
+    monkeypatch.setattr(stress, "CHUNK_PATHS", 700)
+    chunked = stress.simulate_stress(metrics, paths=5_000, seed=7, workers=2)
+
+    pd.testing.assert_frame_equal(first.percentiles, chunked.percentiles)
+    pd.testing.assert_series_equal(first.breach_probability, chunked.breach_probability)
+    other = stress.simulate_stress(metrics, paths=5_000, seed=8)
+    assert not first.percentiles.equals(other.percentiles)
+
+    assert list(first.percentiles.columns) == [
+        "company_code", "measure", "p1", "p5", "p25", "p50", "p75", "p95", "p99"
+    ]
+    assert len(first.percentiles) == 3 * len(stress.STRESS_MEASURES)
+    values = first.percentiles[[f"p{q}" for q in stress.PERCENTILES]].to_numpy()
+    assert (np.diff(values, axis=1) >= 0).all()
+    assert first.breach_probability.between(0.0, 1.0).all()
+    np.testing.assert_allclose(np.diag(first.correlation), 1.0)
+
+
+def test_breach_probability_matches_the_dscr_percentiles():
+    metrics = _metrics(companies=1)
+    result = stress.simulate_stress(metrics, paths=20_000, seed=1, percentiles=(50,))
+    median = result.percentiles.set_index("measure").loc["dscr", "p50"]
+    # 중앙값이 임계치와 같으면 위반 확률은 50%여야 한다.
+    centred = stress.simulate_stress(metrics, paths=20_000, seed=1, threshold=float(median))
+    assert centred.breach_probability.iloc[0] == pytest.approx(0.5, abs=0.01)
+
+
+def test_breach_probability_counts_only_defined_dscr_paths():
+    from changwon_credit.cli import _format_pct
+
+    metrics = _metrics(companies=2)
+    latest = metrics["company_code"].eq("000001") & metrics["year"].eq(metrics["year"].max())
+    metrics.loc[latest, "operating_cash_flow"] = np.nan
+    result = stress.simulate_stress(metrics, paths=2_000, seed=3, threshold=np.inf)
+
+    # 정의된 경로는 모두 임계치 미만이고, DSCR이 전부 결측인 차주는 확률을 알 수 없다.
+    assert result.breach_probability.loc["000000"] == 1.0
+    assert np.isnan(result.breach_probability.loc["000001"])
+    assert _format_pct(result.breach_probability.loc["000001"]) == "n/a"
+    assert _format_pct(0.25) == "25.0%"
+
+
+def test_shock_covariance_needs_history():
+    with pytest.raises(ValueError, match="year-over-year"):
+        stress.shock_covariance(_metrics(companies=1, years=2))
@@ -0,0 +1,62 @@
+import sqlite3
+from pathlib import Path
+
+from changwon_credit import universe
+from changwon_credit.models import CreditConfig
+from changwon_credit.standin import FnGuideStandIn, StandInSettings
+from changwon_credit.store import read_processed
+
+
+def _config(tmp_path, url) -> CreditConfig:
+    return CreditConfig(
+        company_name="TestCo",
+        company_code="000000",
+        industry="Test",
+        years=3,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "db.sqlite",
+        report_path=tmp_path / "reports" / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+        typst_enabled=False,
+        cache_dir=None,
+        fnguide_url=url,
+        retry_attempts=1,
+    )
+
+
+def test_universe_isolates_failures_and_resumes(tmp_path):
+    codes = [f"{200000 + index:06d}" for index in range(4)]
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    broken = pages / f"{codes[1]}.html"
+    broken.write_text("<html><body>maintenance</body></html>", encoding="utf-8")
+
+    with FnGuideStandIn(StandInSettings(pages_dir=pages)) as standin:
+        cfg = _config(tmp_path, standin.url)
+        state_path = cfg.processed_dir / universe.STATE_NAME
+
+        first = universe.run_universe(cfg, codes[:3], workers=2)
+        assert (first.refreshed, first.failed) == (2, 1)
+        state = universe.UniverseState.load(state_path)
+        assert sorted(state.done) == [codes[0], codes[2]]
+        assert list(state.failed) == [codes[1]]
+
+        broken.unlink()
+        standin._pages.pop(codes[1], None)
+        resumed = universe.run_universe(cfg, codes, workers=2)
+        assert (resumed.refreshed, resumed.skipped, resumed.failed) == (2, 2, 0)
+        assert not state_path.exists()
+
+        again = universe.run_universe(cfg, codes, workers=2)
+        assert (again.refreshed, again.unchanged, again.skipped) == (0, 4, 0)
+
+    metrics = read_processed(cfg.processed_dir, "analytics_credit")
+    assert sorted(metrics["company_code"].unique()) == codes
+    with sqlite3.connect(cfg.sqlite_path) as conn:
+        stored = {row[0] for row in conn.execute("SELECT DISTINCT company_code FROM credit_profile")}
+    assert stored == set(codes)
+    assert Path(cfg.processed_dir / "fetch_manifest.json").exists()
@@ -0,0 +1,67 @@
+import shutil
+from dataclasses import replace
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from changwon_credit.etl import merge_statements, persist_processed
+from changwon_credit.models import CreditConfig, FinancialStatements
+from changwon_credit.warehouse import LEGACY_PROFILE_NAME, load_merged, load_metrics
+
+SHIPPED_DIR = Path(__file__).resolve().parents[1] / "data_processed"
+
+
+def _config(tmp_path, years=2):
+    return CreditConfig(
+        company_name="TestCo",
+        company_code="000001",
+        industry="Test",
+        years=years,
+        data_source="Test",
+        raw_dir=tmp_path / "raw",
+        processed_dir=tmp_path / "processed",
+        sqlite_path=tmp_path / "processed" / "credit.db",
+        report_path=tmp_path / "report.md",
+        analyst="QA",
+        currency="KRW bn",
+        bank_view="Test View",
+    )
+
+
+def test_load_merged_reads_parquet_then_sqlite_without_network(tmp_path):
+    cfg = _config(tmp_path)
+    with pytest.raises(LookupError):
+        load_merged(cfg)
+
+    years = [2021, 2022, 2023]
+    statements = FinancialStatements(
+        income=pd.DataFrame({"year": years, "revenue": [100.0, 110.0, 120.0]}),
+        balance=pd.DataFrame({"year": years, "total_assets": [200.0, 210.0, 220.0]}),
+        cashflow=pd.DataFrame({"year": years, "operating_cash_flow": [10.0, 12.0, 14.0]}),
+    )
+    persist_processed(statements, merge_statements(statements, cfg.company_code), cfg)
+
+    merged = load_merged(cfg, memory_map=True)
+    assert merged["year"].tolist() == [2022, 2023]
+    assert merged["revenue"].tolist() == [110.0, 120.0]
+
+    shutil.rmtree(cfg.processed_dir / "credit_profile")
+    from_sqlite = load_merged(_config(tmp_path, years=3))
+    assert from_sqlite["total_assets"].tolist() == [200.0, 210.0, 220.0]
+
+
+def test_load_metrics_reads_the_shipped_legacy_layout(tmp_path):
+    processed = tmp_path / "processed"
+    shutil.copytree(SHIPPED_DIR, processed)
+    cfg = replace(_config(tmp_path, years=3), company_code="034020")
+
+    metrics = load_metrics(cfg)
+    assert metrics["year"].tolist() == [2022, 2023, 2024]
+    assert metrics["dscr"].notna().all()
+
+    # 단일 Parquet 파일도 없으면 credit.db의 financials_* 표를 연도별로 합쳐 읽는다.
+    expected = load_merged(cfg)
+    (processed / LEGACY_PROFILE_NAME).unlink()
+    from_tables = load_merged(cfg)
+    pd.testing.assert_frame_equal(from_tables[expected.columns], expected, check_like=True)